@@ -0,0 +1 @@
+# Benchmarks for Fix-It CLI
@@ -0,0 +1,257 @@
+"""Benchmark cases: what each profile measures and how one case is run.
+
+Every case runs in its own interpreter (see :mod:`benchmarks.run`) so the peak
+RSS it reports belongs to that case alone.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.datagen import NEEDLE, format_size, generate_log, parse_size
+
+# Log sizes per profile; each size is measured plain and gzipped.
+PROFILES: Dict[str, List[str]] = {
+    "quick": ["1MB", "16MB"],
+    "full": ["1MB", "64MB", "512MB"],
+    "huge": ["1MB", "256MB", "2GB", "4GB"],
+}
+SPARSE, TYPICAL, DENSE = 0.001, 0.01, 0.2
+
+# log-dump modes: (match density of the input, log_dump keyword arguments)
+LOG_MODES: Dict[str, Any] = {
+    "head": (TYPICAL, {"lines": 50}),
+    "tail": (TYPICAL, {"lines": 50, "tail": True}),
+    "grep-sparse": (SPARSE, {"lines": 1000, "grep": NEEDLE}),
+    "grep-dense": (DENSE, {"lines": 1000, "grep": NEEDLE}),
+    "output": (TYPICAL, {"lines": 100_000, "output": True}),
+}
+
+FAKE_PING = """#!/bin/sh
+sleep "${FIXIT_FAKE_PING_DELAY:-0}"
+echo "PING $5 ($5) 56(84) bytes of data."
+echo "64 bytes from $5: icmp_seq=1 ttl=64 time=0.05 ms"
+echo ""
+echo "--- $5 ping statistics ---"
+echo "$2 packets transmitted, $2 received, 0% packet loss, time 0ms"
+"""
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmark measurement."""
+
+    name: str
+    kind: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def build_cases(profile: str) -> List[Case]:
+    """Return every case in a profile, in a stable order."""
+    cases: List[Case] = []
+    for size_text in PROFILES[profile]:
+        size = parse_size(size_text)
+        for compressed in (False, True):
+            for mode, (density, options) in LOG_MODES.items():
+                label = f"log_dump/{'gzip' if compressed else 'plain'}/{format_size(size)}/{mode}"
+                cases.append(
+                    Case(
+                        label,
+                        "log_dump",
+                        {
+                            "size": size,
+                            "density": density,
+                            "compressed": compressed,
+                            "options": options,
+                        },
+                    )
+                )
+    hosts = 64 if profile == "quick" else 256
+    for workers in (1, 16):
+        cases.append(
+            Case(
+                f"ping_sweep/{hosts}hosts/workers{workers}",
+                "ping_sweep",
+                {
+                    "hosts": hosts,
+                    "workers": workers,
+                    "delay": 0.02,
+                },
+            )
+        )
+    count = 100_000 if profile == "quick" else 1_000_000
+    cases.append(Case(f"passwords/{count}", "passwords", {"count": count, "length": 16}))
+    # Reference: one secrets.choice call per character, as reset-user used to do.
+    cases.append(
+        Case(
+            f"passwords/{count}/secrets-choice",
+            "passwords",
+            {"count": count, "length": 16, "method": "secrets-choice"},
+        )
+    )
+    users = 20_000 if profile == "quick" else 100_000
+    for backend in ("simulated", "sqlite"):
+        cases.append(
+            Case(f"resets/{backend}/{users}", "resets", {"users": users, "backend": backend})
+        )
+    return cases
+
+
+def prepare(case: Case, data_dir: str) -> None:
+    """Create the case's input files up front so generation is never timed."""
+    if case.kind == "log_dump":
+        p = case.params
+        generate_log(data_dir, p["size"], p["density"], p["compressed"])
+
+
+def _timed(run: Callable[[], Any], repeat: int) -> List[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _bench_log_dump(params: Dict[str, Any], data_dir: str, repeat: int) -> Dict[str, float]:
+    from commands.log_dump import log_dump
+    from commands.output import RecordCollector
+
+    path = generate_log(data_dir, params["size"], params["density"], params["compressed"])
+    options = dict(params["options"])
+    scanned = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if options.pop("output", False):
+            options["output"] = os.path.join(tmp, "out.log")
+
+        def run() -> None:
+            collector = RecordCollector()
+            log_dump(path, emitter=collector, **options)
+            scanned.append(collector.records[-1]["scanned_lines"])
+
+        times = _timed(run, repeat)
+    median = statistics.median(times)
+    return {
+        "seconds": median,
+        "seconds_min": min(times),
+        "mb_per_s": params["size"] / 1e6 / median,
+        "lines_per_s": scanned[-1] / median,
+    }
+
+
+def _bench_ping_sweep(params: Dict[str, Any], data_dir: str, repeat: int) -> Dict[str, float]:
+    from commands.jobs import JobSpec, run_jobs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ping = os.path.join(tmp, "ping")
+        with open(ping, "w") as f:
+            f.write(FAKE_PING)
+        os.chmod(ping, 0o755)
+        os.environ["PATH"] = tmp + os.pathsep + os.environ.get("PATH", "")
+        os.environ["FIXIT_FAKE_PING_DELAY"] = str(params["delay"])
+        jobs = [
+            JobSpec(i, f"host{i}", "ping-test", {"host": f"10.0.{i // 256}.{i % 256}", "count": 1})
+            for i in range(params["hosts"])
+        ]
+
+        def run() -> None:
+            summary = run_jobs(jobs, io_workers=params["workers"])
+            if summary.ok != summary.total:
+                raise RuntimeError(f"{summary.failed} fake pings failed")
+
+        times = _timed(run, repeat)
+    median = statistics.median(times)
+    return {"seconds": median, "seconds_min": min(times), "hosts_per_s": params["hosts"] / median}
+
+
+def _bench_passwords(params: Dict[str, Any], data_dir: str, repeat: int) -> Dict[str, float]:
+    from commands.passwords import DEFAULT_SYMBOLS, generate_passwords
+    from commands.reset_user import RESET_POLICY
+
+    count, length = params["count"], params["length"]
+    if params.get("method") == "secrets-choice":
+        import secrets
+        import string
+
+        alphabet = string.ascii_letters + string.digits + DEFAULT_SYMBOLS
+
+        def run() -> None:
+            for _ in range(count):
+                "".join(secrets.choice(alphabet) for _ in range(length))
+
+    else:
+
+        def run() -> None:
+            for _ in generate_passwords(count, length, RESET_POLICY):
+                pass
+
+    times = _timed(run, repeat)
+    median = statistics.median(times)
+    return {
+        "seconds": median,
+        "seconds_min": min(times),
+        "passwords_per_s": params["count"] / median,
+    }
+
+
+def _bench_resets(params: Dict[str, Any], data_dir: str, repeat: int) -> Dict[str, float]:
+    from commands.directory import SQLiteDirectory
+    from commands.output import RecordEmitter
+    from commands.reset_user import ResetRequest, reset_users
+
+    usernames = [f"user{i}" for i in range(params["users"])]
+    requests = [ResetRequest(name) for name in usernames]
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for attempt in range(repeat):
+            directory = None
+            if params["backend"] == "sqlite":
+                directory = SQLiteDirectory(os.path.join(tmp, f"accounts{attempt}.db"))
+                directory.add_accounts(usernames)
+            start = time.perf_counter()
+            reset_users(
+                requests,
+                os.path.join(tmp, f"results{attempt}.csv"),
+                force=True,
+                directory=directory,
+                emitter=RecordEmitter(stream=io.StringIO()),
+            )
+            times.append(time.perf_counter() - start)
+            if directory is not None:
+                directory.close()
+    median = statistics.median(times)
+    return {"seconds": median, "seconds_min": min(times), "users_per_s": params["users"] / median}
+
+
+_RUNNERS = {
+    "log_dump": _bench_log_dump,
+    "ping_sweep": _bench_ping_sweep,
+    "passwords": _bench_passwords,
+    "resets": _bench_resets,
+}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB (None on Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 1e6 if os.uname().sysname == "Darwin" else peak / 1e3
+
+
+def run_case(case: Case, data_dir: str, repeat: int = 3) -> Dict[str, float]:
+    """Run one case in this process and return its metrics."""
+    metrics = _RUNNERS[case.kind](case.params, data_dir, repeat)
+    rss = peak_rss_mb()
+    if rss is not None:
+        metrics["peak_rss_mb"] = rss
+    return {key: round(value, 6) for key, value in metrics.items()}
@@ -0,0 +1,94 @@
+"""Offline regression check of benchmark results against a stored baseline.
+
+Metrics ending in ``_per_s`` are better when higher; ``seconds*`` and
+``peak_rss_mb`` are better when lower. A metric regresses when it is worse than
+the baseline by more than the threshold (a fraction, 0.25 = 25%).
+
+Usage:
+    python -m benchmarks.compare results.json benchmarks/baselines/quick.json --threshold 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A metric that got worse than the baseline allows."""
+
+    case: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.case} {self.metric}: {self.baseline:.4g} -> {self.current:.4g}"
+            f" ({self.change:+.1%})"
+        )
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_s")
+
+
+def _by_name(results: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    return {entry["name"]: entry["metrics"] for entry in results["results"]}
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.25
+) -> List[Regression]:
+    """Return every metric in ``current`` that regressed past ``threshold``.
+
+    Cases or metrics missing from either side are ignored.
+    """
+    regressions = []
+    old = _by_name(baseline)
+    for case, metrics in _by_name(current).items():
+        for metric, value in metrics.items():
+            reference = old.get(case, {}).get(metric)
+            if not reference:
+                continue
+            change = (value - reference) / reference
+            worse = -change if higher_is_better(metric) else change
+            if worse > threshold:
+                regressions.append(Regression(case, metric, reference, value, change))
+    return regressions
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def report(regressions: List[Regression], threshold: float) -> int:
+    """Print a verdict and return the process exit code."""
+    if not regressions:
+        print(f"No regressions beyond {threshold:.0%}.")
+        return 0
+    print(f"{len(regressions)} regression(s) beyond {threshold:.0%}:")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("results", help="results JSON from benchmarks.run")
+    parser.add_argument("baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown fraction")
+    args = parser.parse_args()
+    sys.exit(
+        report(compare(load(args.results), load(args.baseline), args.threshold), args.threshold)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Deterministic synthetic logs for the benchmark suite.
+
+Logs are built from a 1 MiB block of realistic-looking lines in which an exact
+fraction contain :data:`NEEDLE`; the block is repeated until the requested
+size is reached, so multi-gigabyte files take seconds to write and the same
+parameters always produce the same bytes. Generated files are cached by name.
+
+Usage:
+    python -m benchmarks.datagen --size 256MB --density 0.01 --gzip
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import random
+from typing import List
+
+NEEDLE = "INC-4242"
+BLOCK_SIZE = 1 << 20
+
+_LEVELS = ["INFO"] * 14 + ["DEBUG"] * 4 + ["WARN"] + ["ERROR"]
+_SERVICES = ["auth", "billing", "gateway", "ldap-sync", "mailer", "scheduler", "web"]
+_MESSAGES = [
+    "request completed status=200 bytes={n} duration_ms={d}",
+    "cache miss key=user:{n} backend=redis latency_ms={d}",
+    "session refreshed uid={n} ttl=3600",
+    "queue depth={n} consumers={d}",
+    "slow query took {d}ms rows={n}",
+    "retrying upstream call attempt={d} id={n}",
+    "password policy check passed uid={n}",
+]
+
+_UNITS = {"": 1, "B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes such as ``512KB``, ``64MB`` or ``2GB`` (binary units)."""
+    text = text.strip().upper()
+    for unit in ("GB", "MB", "KB", "B"):
+        if text.endswith(unit):
+            return int(float(text[: -len(unit)]) * _UNITS[unit])
+    return int(text)
+
+
+def format_size(size: int) -> str:
+    """Inverse of :func:`parse_size` for whole units."""
+    for unit in ("GB", "MB", "KB"):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def _block(density: float, seed: int) -> bytes:
+    """One block of log lines, ``density`` of which contain the needle."""
+    rng = random.Random(seed)
+    lines: List[str] = []
+    size = 0
+    while size < BLOCK_SIZE:
+        second = len(lines) % 86400
+        message = rng.choice(_MESSAGES).format(n=rng.randrange(1, 10**6), d=rng.randrange(1, 5000))
+        line = (
+            f"2026-10-19T{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}Z "
+            f"{rng.choice(_LEVELS):<5} {rng.choice(_SERVICES)}[{rng.randrange(100, 9999)}]: "
+            f"{message}\n"
+        )
+        lines.append(line)
+        size += len(line)
+    # Place the needle in an exact share of the lines, spread evenly.
+    matches = round(len(lines) * density)
+    for index in rng.sample(range(len(lines)), matches):
+        lines[index] = lines[index][:-1] + f" ticket={NEEDLE}\n"
+    return "".join(lines).encode("ascii")
+
+
+def log_name(size: int, density: float, compressed: bool) -> str:
+    suffix = ".log.gz" if compressed else ".log"
+    return f"synthetic-{format_size(size)}-d{density:g}{suffix}"
+
+
+def generate_log(
+    directory: str, size: int, density: float = 0.01, compressed: bool = False, seed: int = 0
+) -> str:
+    """Write (or reuse) a synthetic log of about ``size`` uncompressed bytes.
+
+    Returns:
+        Path of the generated file
+    """
+    if not 0.0 <= density <= 1.0:
+        raise ValueError("density must be between 0 and 1")
+    path = os.path.join(directory, log_name(size, density, compressed))
+    if os.path.exists(path):
+        return path
+    block = _block(density, seed)
+    partial = path + ".partial"
+    opener = gzip.open if compressed else open
+    with opener(partial, "wb") as f:  # type: ignore[operator]
+        written = 0
+        while written < size:
+            chunk = (
+                block
+                if size - written >= len(block)
+                else block[: block.rfind(b"\n", 0, size - written) + 1]
+            )
+            if not chunk:
+                break
+            f.write(chunk)
+            written += len(chunk)
+    os.replace(partial, path)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="64MB", help="uncompressed size, e.g. 1MB or 2GB")
+    parser.add_argument(
+        "--density", type=float, default=0.01, help="share of lines with the needle"
+    )
+    parser.add_argument("--gzip", action="store_true", help="write a gzip-compressed log")
+    parser.add_argument("--dir", default=".", help="output directory")
+    args = parser.parse_args()
+    print(generate_log(args.dir, parse_size(args.size), args.density, args.gzip))
+
+
+if __name__ == "__main__":
+    main()
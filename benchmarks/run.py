@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Run the benchmark suite and write the results as JSON.
+
+Each case runs in a fresh interpreter so its peak RSS is its own. Synthetic
+logs are generated once into the data directory and reused by later runs.
+With ``--baseline`` the results are checked for regressions afterwards.
+
+Usage:
+    python -m benchmarks.run --profile quick --output results.json
+    python -m benchmarks.run --profile quick --baseline benchmarks/baselines/quick.json
+    python -m benchmarks.run --profile quick --filter log_dump/gzip --output -
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.cases import PROFILES, Case, build_cases, prepare, run_case
+from benchmarks.compare import compare, load, report
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_VERSION = 1
+
+
+def default_data_dir() -> str:
+    return os.environ.get("FIXIT_BENCH_DATA") or os.path.join(
+        tempfile.gettempdir(), "fixit-bench-data"
+    )
+
+
+def _run_isolated(case: Case, data_dir: str, repeat: int) -> Dict[str, float]:
+    """Run a case in a child interpreter and return the metrics it prints."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.run",
+            "--worker",
+            json.dumps(asdict(case)),
+            "--data-dir",
+            data_dir,
+            "--repeat",
+            str(repeat),
+        ],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{case.name} failed:\n{result.stderr}")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def run_suite(
+    profile: str, data_dir: str, repeat: int = 3, name_filter: str = ""
+) -> Dict[str, Any]:
+    """Run every case of a profile whose name contains ``name_filter``."""
+    os.makedirs(data_dir, exist_ok=True)
+    cases = [case for case in build_cases(profile) if name_filter in case.name]
+    results: List[Dict[str, Any]] = []
+    for case in cases:
+        prepare(case, data_dir)
+        metrics = _run_isolated(case, data_dir, repeat)
+        results.append({"name": case.name, "params": case.params, "metrics": metrics})
+        summary = ", ".join(f"{key}={value:.4g}" for key, value in metrics.items())
+        print(f"{case.name:<40} {summary}", file=sys.stderr)
+    return {
+        "schema": SCHEMA_VERSION,
+        "profile": profile,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "system": platform.system(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (median kept)")
+    parser.add_argument("--data-dir", default=default_data_dir(), help="cache for synthetic logs")
+    parser.add_argument("--output", default="-", help="results file ('-' for stdout)")
+    parser.add_argument("--baseline", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown fraction")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        case = Case(**json.loads(args.worker))
+        print(json.dumps(run_case(case, args.data_dir, args.repeat)))
+        return
+
+    results = run_suite(args.profile, args.data_dir, args.repeat, args.filter)
+    text = json.dumps(results, indent=2) + "\n"
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        Path(args.output).write_text(text, encoding="utf-8")
+    if args.baseline:
+        sys.exit(report(compare(results, load(args.baseline), args.threshold), args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Read checkpoints for ``fixit log-dump --since-last-run``.
+
+A checkpoint records, per (log file, grep query), the file's inode and device,
+the byte offset just past the last line read, that line's number, and a hash
+of the bytes before the offset. The next run seeks straight to the offset, so
+its cost depends on how much was appended rather than on the file size.
+
+Before resuming, the checkpoint is checked against the file on disk:
+
+* A different inode means the log was rotated by renaming. The renamed file
+  is looked up among its siblings by inode and read to its end from the old
+  offset, then the new file is read from the start.
+* The same inode with a shorter file, or different bytes before the offset,
+  means the log was truncated in place (``copytruncate``); it is read again
+  from the start.
+
+Line numbers are always positions in the file a line was read from. A
+trailing line without a newline is left for the next run, since the writer
+may still be appending to it, except in a rotated file, which no longer grows.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
+
+from commands.exceptions import LogFileError
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BYTES = 256
+STORE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Where the previous run stopped reading a log."""
+
+    inode: int
+    device: int
+    offset: int
+    line: int
+    fingerprint: str
+
+
+@dataclass
+class Segment:
+    """A byte range of one file to read, advanced as lines are consumed."""
+
+    path: Path
+    offset: int
+    line: int
+    to_eof: bool = False
+
+
+def default_checkpoint_file() -> str:
+    """Return the checkpoint store path, following the XDG base directory spec."""
+    base = os.environ.get("XDG_STATE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "state"
+    )
+    return os.path.join(base, "fixit", "checkpoints.json")
+
+
+def _fingerprint(path: Path, offset: int) -> str:
+    with open(path, "rb") as f:
+        f.seek(max(offset - FINGERPRINT_BYTES, 0))
+        return hashlib.sha256(f.read(min(offset, FINGERPRINT_BYTES))).hexdigest()
+
+
+def _resumable(path: Path, checkpoint: Checkpoint) -> bool:
+    """Return True if ``path`` still holds the bytes the checkpoint was taken after."""
+    try:
+        if path.stat().st_size < checkpoint.offset:
+            return False
+        return _fingerprint(path, checkpoint.offset) == checkpoint.fingerprint
+    except OSError:
+        return False
+
+
+def _find_rotated(path: Path, checkpoint: Checkpoint) -> Optional[Path]:
+    """Find the file ``path`` was renamed to, by its old inode."""
+    try:
+        with os.scandir(path.parent) as entries:
+            for entry in entries:
+                if not entry.name.startswith(path.name) or entry.name == path.name:
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_ino == checkpoint.inode and stat.st_dev == checkpoint.device:
+                    return Path(entry.path)
+    except OSError as e:
+        logger.warning(f"Could not look for rotated copies of {path}: {e}")
+    return None
+
+
+def plan_segments(path: Path, checkpoint: Optional[Checkpoint]) -> Tuple[List[Segment], str]:
+    """Decide what to read from ``path`` given the previous run's checkpoint.
+
+    Args:
+        path: The log file as configured (its current incarnation)
+        checkpoint: Where the previous run stopped, if any
+
+    Returns:
+        Tuple of (segments to read in order, how the run resumes: ``new``,
+        ``resumed``, ``rotated`` or ``truncated``)
+    """
+    if checkpoint is None:
+        return [Segment(path, 0, 0)], "new"
+    stat = path.stat()
+    if (stat.st_ino, stat.st_dev) == (checkpoint.inode, checkpoint.device):
+        if _resumable(path, checkpoint):
+            return [Segment(path, checkpoint.offset, checkpoint.line)], "resumed"
+        logger.warning(f"{path} was truncated since the last run; reading it from the start")
+        return [Segment(path, 0, 0)], "truncated"
+
+    rotated = _find_rotated(path, checkpoint)
+    if rotated is not None and _resumable(rotated, checkpoint):
+        logger.info(f"{path} was rotated to {rotated}; finishing it first")
+        return [
+            Segment(rotated, checkpoint.offset, checkpoint.line, to_eof=True),
+            Segment(path, 0, 0),
+        ], "rotated"
+    logger.warning(f"{path} was rotated and the previous file was not found; lines may be missed")
+    return [Segment(path, 0, 0)], "rotated"
+
+
+def read_segment(segment: Segment) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, text) pairs from a segment, advancing it per line.
+
+    The segment's offset and line always point just past the last line
+    yielded, so a caller that stops early can checkpoint exactly there.
+    """
+    with open(segment.path, "rb") as f:
+        f.seek(segment.offset)
+        for raw in f:
+            if not raw.endswith(b"\n") and not segment.to_eof:
+                return
+            segment.offset += len(raw)
+            segment.line += 1
+            yield segment.line, raw.decode("utf-8", errors="ignore")
+
+
+def checkpoint_for(segment: Segment) -> Checkpoint:
+    """Take a checkpoint at a segment's current position."""
+    stat = segment.path.stat()
+    return Checkpoint(
+        inode=stat.st_ino,
+        device=stat.st_dev,
+        offset=segment.offset,
+        line=segment.line,
+        fingerprint=_fingerprint(segment.path, segment.offset),
+    )
+
+
+@contextmanager
+def _locked(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on ``path``'s lock file, where the platform has one."""
+    try:
+        import fcntl
+    except ImportError:  # Windows: concurrent runs may lose an update
+        yield
+        return
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class CheckpointStore:
+    """JSON file of checkpoints keyed by log path and query.
+
+    Args:
+        path: Store location; parent directories are created on first save
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or default_checkpoint_file()
+
+    @staticmethod
+    def _key(log_path: Path, query: Optional[str]) -> Tuple[str, str]:
+        return os.path.realpath(log_path), query or ""
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint file {self.path}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != STORE_VERSION:
+            logger.warning(f"Ignoring checkpoint file {self.path} with an unknown layout")
+            return {}
+        checkpoints = data.get("checkpoints", {})
+        if not isinstance(checkpoints, dict):
+            logger.warning(f"Ignoring checkpoint file {self.path} with an unknown layout")
+            return {}
+        return cast(Dict[str, Dict[str, Any]], checkpoints)
+
+    def get(self, log_path: Path, query: Optional[str]) -> Optional[Checkpoint]:
+        """Return the saved checkpoint for a log and query, if any."""
+        path, query = self._key(log_path, query)
+        entry = self._load().get(path, {}).get(query)
+        if entry is None:
+            return None
+        try:
+            return Checkpoint(**entry)
+        except TypeError:
+            logger.warning(f"Ignoring malformed checkpoint for {path}")
+            return None
+
+    def update(self, log_path: Path, query: Optional[str], checkpoint: Checkpoint) -> None:
+        """Save a checkpoint, keeping entries written concurrently by other runs.
+
+        Raises:
+            LogFileError: If the store cannot be written
+        """
+        path, query = self._key(log_path, query)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with _locked(self.path):
+                checkpoints = self._load()
+                checkpoints.setdefault(path, {})[query] = asdict(checkpoint)
+                partial = f"{self.path}.{os.getpid()}.tmp"
+                with open(partial, "w", encoding="utf-8") as f:
+                    json.dump({"version": STORE_VERSION, "checkpoints": checkpoints}, f, indent=2)
+                os.replace(partial, self.path)
+        except OSError as e:
+            raise LogFileError(f"Failed to save checkpoint to {self.path}: {e}") from e
@@ -0,0 +1,178 @@
+"""Thin client for a running ``fixit serve`` process.
+
+Forwards argv, the working directory and ``FIXIT_*`` environment variables to
+the server over a Unix socket and streams its output back, so scripted callers
+skip loading click and the command modules. If no server is listening, the
+command runs in-process instead.
+
+This module is on the client's hot path: keep its imports to the bare minimum.
+
+Usage:
+    fixit-client log-dump /var/log/app.log --grep ERROR
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import sys
+from typing import BinaryIO, List, Optional, Sequence
+
+# Every frame is a one-byte kind and a four-byte big-endian payload length.
+FRAME_HEADER = struct.Struct(">cI")
+REQUEST = b"r"
+STDOUT = b"o"
+STDERR = b"e"
+EXIT = b"x"
+
+ENV_PREFIX = "FIXIT_"
+
+# struct ucred returned by SO_PEERCRED: pid, uid, gid.
+PEER_CREDENTIALS = struct.Struct("3i")
+
+
+def default_socket_path() -> str:
+    """Return ``$FIXIT_SOCKET``, or a per-user socket in the runtime directory.
+
+    Without ``$XDG_RUNTIME_DIR`` (as under cron) the socket lives in a private
+    ``fixit-<uid>`` directory in the temp directory rather than directly in a
+    shared, world-writable one.
+    """
+    configured = os.environ.get("FIXIT_SOCKET")
+    if configured:
+        return configured
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, f"fixit-{uid}.sock")
+    base = os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(base, f"fixit-{uid}", "fixit.sock")
+
+
+def check_socket_owner(path: str) -> None:
+    """Refuse a socket that belongs to another user.
+
+    Raises:
+        FileNotFoundError: If there is no socket at ``path``
+        PermissionError: If ``path`` is owned by someone else
+    """
+    owner = os.lstat(path).st_uid
+    if owner != os.getuid():
+        raise PermissionError(f"{path} belongs to uid {owner}, not to you; refusing to use it")
+
+
+def _check_peer(sock: socket.socket, path: str) -> None:
+    """Confirm the process listening on ``sock`` runs as this user (Linux only)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return
+    credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, PEER_CREDENTIALS.size)
+    _, uid, _ = PEER_CREDENTIALS.unpack(credentials)
+    if uid != os.getuid():
+        raise PermissionError(f"Server on {path} runs as uid {uid}, not as you; refusing to use it")
+
+
+def encode_request(argv: Sequence[str], cwd: str, environ: Sequence[str], color: bool) -> bytes:
+    """Pack a request: color flag, cwd, env count, ``KEY=VALUE`` entries, then argv."""
+    fields = ["1" if color else "0", cwd, str(len(environ)), *environ, *argv]
+    return b"\0".join(field.encode("utf-8", "surrogateescape") for field in fields)
+
+
+def decode_request(payload: bytes) -> "tuple[List[str], str, List[str], bool]":
+    """Inverse of :func:`encode_request`: return (argv, cwd, environ, color)."""
+    fields = [field.decode("utf-8", "surrogateescape") for field in payload.split(b"\0")]
+    color, cwd, count = fields[0] == "1", fields[1], int(fields[2])
+    return fields[3 + count :], cwd, fields[3 : 3 + count], color
+
+
+def send_frame(sock: socket.socket, kind: bytes, payload: bytes = b"") -> None:
+    sock.sendall(FRAME_HEADER.pack(kind, len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> "tuple[bytes, bytes]":
+    """Read one frame; returns (b"", b"") when the peer has closed the socket."""
+    header = _recv_exact(sock, FRAME_HEADER.size)
+    if not header:
+        return b"", b""
+    kind, length = FRAME_HEADER.unpack(header)
+    return kind, _recv_exact(sock, length)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 16))
+        if not chunk:
+            return b""
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def run_remote(
+    argv: Sequence[str],
+    socket_path: Optional[str] = None,
+    stdout: Optional[BinaryIO] = None,
+    stderr: Optional[BinaryIO] = None,
+    color: Optional[bool] = None,
+) -> int:
+    """Run ``fixit <argv>`` on the server and stream its output.
+
+    Returns:
+        The command's exit code
+
+    Nothing is sent until the socket and the server behind it are confirmed
+    to belong to the current user, since requests carry ``FIXIT_*`` secrets.
+
+    Raises:
+        PermissionError: If the socket or the server belongs to another user
+        OSError: If no server is listening on the socket
+    """
+    stdout = stdout or sys.stdout.buffer
+    stderr = stderr or sys.stderr.buffer
+    if color is None:
+        color = sys.stdout.isatty()
+    environ = [f"{key}={value}" for key, value in os.environ.items() if key.startswith(ENV_PREFIX)]
+
+    path = socket_path or default_socket_path()
+    check_socket_owner(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        _check_peer(sock, path)
+        send_frame(sock, REQUEST, encode_request(argv, os.getcwd(), environ, color))
+        while True:
+            kind, payload = recv_frame(sock)
+            if kind == STDOUT:
+                stdout.write(payload)
+                stdout.flush()
+            elif kind == STDERR:
+                stderr.write(payload)
+                stderr.flush()
+            elif kind == EXIT:
+                return int(payload)
+            else:
+                stderr.write(b"fixit: server closed the connection\n")
+                return 1
+    finally:
+        sock.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``fixit-client``."""
+    argv = sys.argv[1:] if argv is None else argv
+    if hasattr(socket, "AF_UNIX"):
+        try:
+            return run_remote(argv)
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass
+        except PermissionError as e:
+            sys.stderr.write(f"fixit-client: {e}; running the command locally\n")
+
+    from fixit import cli
+
+    return cli.main(args=argv, prog_name="fixit")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
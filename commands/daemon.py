@@ -0,0 +1,240 @@
+"""Warm ``fixit serve`` process.
+
+The server imports click and every command module once, then runs each
+request from :mod:`commands.client` in-process: the client's argv goes through
+the same :func:`fixit.cli` group, with stdout and stderr streamed back over the
+socket as they are written. Requests run one at a time because they share the
+process-wide ``sys.stdout``, working directory and environment.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import socket
+import socketserver
+import stat
+import sys
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, cast
+
+from commands.client import (
+    ENV_PREFIX,
+    EXIT,
+    REQUEST,
+    STDERR,
+    STDOUT,
+    check_socket_owner,
+    decode_request,
+    recv_frame,
+    send_frame,
+)
+from commands.exceptions import UserInputError
+
+if TYPE_CHECKING:
+    import click
+
+logger = logging.getLogger(__name__)
+
+# Loaded when the server starts so no request pays for them.
+WARM_MODULES = ("commands.log_dump", "commands.ping_test", "commands.reset_user")
+
+
+class _FrameWriter(io.RawIOBase):
+    """Raw stream that forwards every write to the client as one frame."""
+
+    def __init__(self, sock: socket.socket, kind: bytes) -> None:
+        self._sock = sock
+        self._kind = kind
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        send_frame(self._sock, self._kind, bytes(data))
+        return len(data)
+
+
+def _text_stream(sock: socket.socket, kind: bytes) -> io.TextIOWrapper:
+    return io.TextIOWrapper(
+        io.BufferedWriter(_FrameWriter(sock, kind)),
+        encoding="utf-8",
+        errors="replace",
+        write_through=True,
+    )
+
+
+@contextmanager
+def _client_environment(cwd: str, environ: List[str]) -> Iterator[None]:
+    """Run the block in the client's working directory with its ``FIXIT_*`` variables."""
+    saved_cwd = os.getcwd()
+    saved_env: Dict[str, str] = {k: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)}
+    for key in saved_env:
+        del os.environ[key]
+    for entry in environ:
+        key, _, value = entry.partition("=")
+        os.environ[key] = value
+    try:
+        os.chdir(cwd)
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        for key in [k for k in os.environ if k.startswith(ENV_PREFIX)]:
+            del os.environ[key]
+        os.environ.update(saved_env)
+
+
+@contextmanager
+def _redirected(sock: socket.socket) -> Iterator[None]:
+    """Point the standard streams at the client for the duration of a request."""
+    saved = sys.stdin, sys.stdout, sys.stderr
+    stdout, stderr = _text_stream(sock, STDOUT), _text_stream(sock, STDERR)
+    # Prompts see end-of-file, so commands that would ask for confirmation abort.
+    sys.stdin, sys.stdout, sys.stderr = io.StringIO(), stdout, stderr
+    try:
+        yield
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved
+        # The command configured logging against the client's stderr; hand the
+        # handlers back to the server's own stream.
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler) and handler.stream in (stdout, stderr):
+                handler.setStream(sys.stderr)
+        for stream in (stdout, stderr):
+            try:
+                stream.flush()
+            except OSError:
+                pass
+
+
+def run_command(command: "click.Command", args: List[str], color: Optional[bool] = None) -> int:
+    """Run a command like ``fixit <args>`` would and return its exit code.
+
+    The command must not be the server or shell itself; ``nested`` in the
+    context object tells them to refuse.
+    """
+    try:
+        command.main(
+            args=args, prog_name="fixit", standalone_mode=True, color=color, obj={"nested": True}
+        )
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    return 0
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        kind, payload = recv_frame(self.request)
+        if kind != REQUEST:
+            return
+        args, cwd, environ, color = decode_request(payload)
+        logger.debug(f"Running request: {args}")
+        code = 1
+        try:
+            with _client_environment(cwd, environ), _redirected(self.request):
+                server = cast(CommandServer, self.server)
+                code = run_command(server.command, args, color)
+        except OSError as e:
+            # The client went away or its working directory is not visible here.
+            logger.warning(f"Request {args} failed: {e}")
+            try:
+                send_frame(self.request, STDERR, f"fixit: {e}\n".encode())
+            except OSError:
+                pass
+        try:
+            send_frame(self.request, EXIT, str(code).encode())
+        except OSError:
+            pass
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    """Unix socket server that runs one command request at a time.
+
+    Args:
+        path: Socket path; created with owner-only permissions
+        command: The click group requests are dispatched to
+    """
+
+    def __init__(self, path: str, command: "click.Command") -> None:
+        self.command = command
+        self.socket_path = path
+        _prepare_socket_directory(path)
+        _remove_stale_socket(path)
+        previous = os.umask(0o077)
+        try:
+            super().__init__(path, _RequestHandler)
+        finally:
+            os.umask(previous)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def _prepare_socket_directory(path: str) -> None:
+    """Create the socket's directory privately and make sure no one else controls it.
+
+    Raises:
+        UserInputError: If another user could replace the socket
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        raise UserInputError(f"Cannot create socket directory {directory}: {e}") from e
+    info = os.lstat(directory)
+    if info.st_uid == os.getuid():
+        return
+    # Someone else's directory is only safe if it is sticky (like /tmp), so
+    # they cannot delete or rename our socket and put their own in its place.
+    if info.st_mode & 0o022 and not info.st_mode & stat.S_ISVTX:
+        raise UserInputError(
+            f"Socket directory {directory} belongs to uid {info.st_uid} and is writable by others"
+        )
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Delete a socket left behind by a server that exited without cleaning up.
+
+    Raises:
+        UserInputError: If a server is still listening on ``path``, or the
+            socket belongs to another user
+    """
+    if not os.path.lexists(path):
+        return
+    try:
+        check_socket_owner(path)
+    except PermissionError as e:
+        raise UserInputError(str(e)) from e
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise UserInputError(f"A fixit server is already running on {path}")
+    finally:
+        probe.close()
+
+
+def serve(path: str, command: "click.Command") -> CommandServer:
+    """Create a warm server on ``path``; call ``serve_forever`` to start handling requests.
+
+    Raises:
+        UserInputError: If Unix sockets are unavailable or the socket is in use
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise UserInputError("fixit serve needs Unix domain sockets, which this platform lacks")
+    import importlib
+
+    for name in WARM_MODULES:
+        importlib.import_module(name)
+    return CommandServer(path, command)
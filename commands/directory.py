@@ -0,0 +1,254 @@
+"""Account directory backends for password resets.
+
+``reset_user`` and bulk resets write new passwords through a
+:class:`DirectoryBackend`. The default :class:`SimulatedDirectory` accepts every
+update without storing anything. :class:`SQLiteDirectory` is a local reference
+implementation with a connection pool and batched, transactional writes; it
+also lets the test suite exercise the real write path offline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from commands.exceptions import DirectoryError
+
+logger = logging.getLogger(__name__)
+
+PasswordUpdate = Tuple[str, str]
+
+# SQLite builds before 3.32 allow at most 999 bound parameters per statement.
+_MAX_QUERY_PARAMS = 900
+
+
+class DirectoryBackend(ABC):
+    """Interface for a store of account credentials."""
+
+    @abstractmethod
+    def set_passwords(self, updates: Sequence[PasswordUpdate]) -> List[str]:
+        """Replace the passwords of existing accounts.
+
+        Args:
+            updates: (username, new password) pairs
+
+        Returns:
+            Usernames that do not exist in the directory; they are not updated
+
+        Raises:
+            DirectoryError: If the directory cannot be updated
+        """
+
+    def close(self) -> None:  # noqa: B027 - optional hook, a no-op unless overridden
+        """Release any resources held by the backend.
+
+        Backends without connections or files to release need not override it.
+        """
+
+    def __enter__(self) -> "DirectoryBackend":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class SimulatedDirectory(DirectoryBackend):
+    """Directory that accepts every update and stores nothing."""
+
+    def set_passwords(self, updates: Sequence[PasswordUpdate]) -> List[str]:
+        logger.debug(f"Simulated directory accepted {len(updates)} password updates")
+        return []
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections shared between threads.
+
+    Connections are created lazily up to ``size`` and handed to one thread at a
+    time, so worker threads never pay for a fresh connection per update.
+    """
+
+    def __init__(self, path: str, size: int = 4, timeout: float = 30.0) -> None:
+        if size < 1:
+            raise DirectoryError("Connection pool size must be at least 1")
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error as e:
+            raise DirectoryError(f"Cannot open account directory {self.path}: {e}") from e
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of the ``with`` block."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = len(self._all) < self.size
+                if create:
+                    conn = self._connect()
+                    self._all.append(conn)
+            if not create:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close every connection the pool has opened."""
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all = []
+            self._idle = queue.LifoQueue()
+
+
+def hash_password(password: str, salt: Optional[bytes] = None) -> Tuple[bytes, bytes]:
+    """Return (salt, digest) for storing a password in the reference directory."""
+    salt = salt or os.urandom(16)
+    return salt, hashlib.sha256(salt + password.encode("utf-8")).digest()
+
+
+class SQLiteDirectory(DirectoryBackend):
+    """Local SQLite account directory.
+
+    Updates are split into batches of ``batch_size`` accounts; each batch is
+    committed in a single transaction on a pooled connection. Passwords are
+    stored as salted SHA-256 digests, which is enough for a reference backend
+    but not a substitute for a real directory's password hashing.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, batch_size: int = 500) -> None:
+        if batch_size < 1:
+            raise DirectoryError("Batch size must be at least 1")
+        self.path = path
+        self.batch_size = batch_size
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS accounts ("
+                    " username TEXT PRIMARY KEY,"
+                    " salt BLOB,"
+                    " password_hash BLOB,"
+                    " updated_at TEXT)"
+                )
+            except sqlite3.Error as e:
+                raise DirectoryError(f"Cannot initialise account directory {path}: {e}") from e
+
+    def add_accounts(self, usernames: Iterable[str]) -> None:
+        """Create accounts that do not exist yet, without a password."""
+        with self.pool.connection() as conn:
+            try:
+                with _transaction(conn):
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO accounts (username) VALUES (?)",
+                        ((username,) for username in usernames),
+                    )
+            except sqlite3.Error as e:
+                raise DirectoryError(f"Failed to add accounts to {self.path}: {e}") from e
+
+    def get_password_hash(self, username: str) -> Optional[Tuple[bytes, bytes]]:
+        """Return the stored (salt, digest) for an account, if it has one."""
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    "SELECT salt, password_hash FROM accounts WHERE username = ?", (username,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            raise DirectoryError(f"Failed to read account directory {self.path}: {e}") from e
+        if row is None or row[0] is None:
+            return None
+        return row[0], row[1]
+
+    def set_passwords(self, updates: Sequence[PasswordUpdate]) -> List[str]:
+        missing: List[str] = []
+        for start in range(0, len(updates), self.batch_size):
+            missing.extend(self._write_batch(updates[start : start + self.batch_size]))
+        return missing
+
+    def _write_batch(self, batch: Sequence[PasswordUpdate]) -> List[str]:
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        with self.pool.connection() as conn:
+            try:
+                with _transaction(conn):
+                    existing: Set[str] = set()
+                    for start in range(0, len(batch), _MAX_QUERY_PARAMS):
+                        names = [
+                            username for username, _ in batch[start : start + _MAX_QUERY_PARAMS]
+                        ]
+                        placeholders = ",".join("?" * len(names))
+                        existing.update(
+                            row[0]
+                            for row in conn.execute(
+                                f"SELECT username FROM accounts WHERE username IN ({placeholders})",
+                                names,
+                            )
+                        )
+                    rows = []
+                    for username, password in batch:
+                        if username in existing:
+                            salt, digest = hash_password(password)
+                            rows.append((salt, digest, timestamp, username))
+                    conn.executemany(
+                        "UPDATE accounts SET salt = ?, password_hash = ?, updated_at = ?"
+                        " WHERE username = ?",
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                raise DirectoryError(f"Failed to update account directory {self.path}: {e}") from e
+        logger.debug(f"Committed {len(batch)} password updates to {self.path}")
+        return [username for username, _ in batch if username not in existing]
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    """Run the block in a write transaction, rolling back on error.
+
+    A failed ``COMMIT`` is rolled back too, so the connection never goes back
+    to the pool with a transaction still open.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def open_directory(
+    path: Optional[str] = None, pool_size: int = 4, batch_size: int = 500
+) -> DirectoryBackend:
+    """Return the SQLite directory at ``path``, or the simulated one if no path is given.
+
+    Raises:
+        DirectoryError: If the directory cannot be opened
+    """
+    if path is None:
+        return SimulatedDirectory()
+    return SQLiteDirectory(path, pool_size=pool_size, batch_size=batch_size)
@@ -22,3 +22,10 @@ class LogFileError(FixitError):
 class NetworkError(FixitError):
     """Raised when network operations fail."""
 
+
+class DirectoryError(FixitError):
+    """Raised when the account directory cannot be read or updated."""
+
+
+class OperationCancelled(FixitError):
+    """Raised when an operation is cancelled before it completes."""
@@ -0,0 +1,585 @@
+"""Batch job runner for ``fixit run``.
+
+A manifest (JSON or TOML) lists ``ping-test``, ``log-dump`` and ``reset-user``
+jobs. They all run on one shared thread pool, with separate concurrency limits
+for I/O-bound jobs (pings, plain log reads, resets) and CPU-bound jobs (reading
+gzipped logs, grep filtering). Each job writes its records to a private
+collector; the runner reports a job as soon as it finishes, times out or is
+cancelled, so results stream in completion order.
+
+Manifest layout (JSON shown; TOML uses ``[defaults]`` and ``[[jobs]]``)::
+
+    {
+      "defaults": {"job_timeout": 60},
+      "jobs": [
+        {"command": "ping-test", "host": "db1.example.com", "count": 2},
+        {"command": "log-dump", "path": "app.log.gz", "grep": "INC-1234", "tail": true},
+        {"command": "reset-user", "username": "alice", "name": "alice (INC-1234)"}
+      ]
+    }
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import click
+
+from commands.exceptions import FixitError, OperationCancelled, UserInputError
+from commands.output import Record, RecordCollector, RecordEmitter
+
+if TYPE_CHECKING:
+    from commands.directory import DirectoryBackend
+    from commands.notify import NotificationQueue, SmtpSettings
+    from commands.profiling import Profiler
+
+logger = logging.getLogger(__name__)
+
+IO_BOUND = "io"
+CPU_BOUND = "cpu"
+
+# Per command: required options, then optional options with their types.
+COMMANDS: Dict[str, Tuple[Tuple[str, ...], Dict[str, type]]] = {
+    "ping-test": (("host",), {"count": int, "timeout": int, "verbose": bool}),
+    "log-dump": (
+        ("path",),
+        {"lines": int, "tail": bool, "grep": str, "output": str, "since_last_run": bool},
+    ),
+    "reset-user": (("username",), {"email": str}),
+}
+_TYPE_NAMES = {int: "an integer", str: "a string", bool: "true or false"}
+JOB_KEYS = {"name", "job_timeout"}
+MAX_REPORTED_ERRORS = 10
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    """One validated manifest entry."""
+
+    index: int
+    name: str
+    command: str
+    options: Dict[str, Any]
+    timeout: Optional[float] = None
+
+
+@dataclass
+class JobResult:
+    """Outcome of one job, reported as soon as it is known."""
+
+    job: JobSpec
+    status: str
+    elapsed: float
+    records: List[Record] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class RunSummary:
+    """Counts for a whole manifest run."""
+
+    total: int = 0
+    ok: int = 0
+    failed: int = 0
+    timeout: int = 0
+    cancelled: int = 0
+    elapsed: float = 0.0
+
+
+def _load_manifest(path: str) -> Any:
+    """Parse a JSON or TOML manifest; TOML is chosen by the ``.toml`` extension.
+
+    Raises:
+        UserInputError: If the file cannot be read or parsed
+    """
+    try:
+        if path == "-":
+            text = sys.stdin.read()
+        else:
+            text = Path(path).read_text(encoding="utf-8")
+    except OSError as e:
+        raise UserInputError(f"Cannot read job manifest {path}: {e}") from e
+
+    if path.endswith(".toml"):
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise UserInputError(
+                    "TOML manifests need Python 3.11+ or the tomli package"
+                ) from None
+        try:
+            return tomllib.loads(text)
+        except tomllib.TOMLDecodeError as e:
+            raise UserInputError(f"Invalid TOML in {path}: {e}") from e
+
+    import json
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise UserInputError(f"Invalid JSON in {path}: {e}") from e
+
+
+def _validate_job(index: int, entry: Any, defaults: Dict[str, Any]) -> JobSpec:
+    """Build a JobSpec from a manifest entry, raising ValueError with the reason."""
+    if not isinstance(entry, dict):
+        raise ValueError("must be a table/object")
+    own = {key.replace("-", "_"): value for key, value in entry.items()}
+    command = own.pop("command", None)
+    if command not in COMMANDS:
+        raise ValueError(f"unknown command {command!r} (expected one of {', '.join(COMMANDS)})")
+    required, optional = COMMANDS[command]
+    # Defaults only fill in options this command accepts; the job's own keys win.
+    accepted = JOB_KEYS | set(required) | set(optional)
+    entry = {**{k: v for k, v in defaults.items() if k in accepted}, **own}
+
+    name = entry.pop("name", None)
+    timeout = entry.pop("job_timeout", None)
+    if timeout is not None and (
+        isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0
+    ):
+        raise ValueError("job_timeout must be a positive number of seconds")
+
+    options: Dict[str, Any] = {}
+    for key in required:
+        value = entry.pop(key, None)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"{command} needs a non-empty {key!r}")
+        options[key] = value.strip()
+    for key, value in entry.items():
+        if key not in optional:
+            raise ValueError(f"unknown option {key!r} for {command}")
+        expected = optional[key]
+        if isinstance(value, bool) != (expected is bool) or not isinstance(value, expected):
+            raise ValueError(f"{key!r} must be {_TYPE_NAMES[expected]}")
+        options[key] = value
+
+    if name is None:
+        name = f"{command} {options[required[0]]}"
+    return JobSpec(index, str(name), command, options, None if timeout is None else float(timeout))
+
+
+def read_manifest(path: str) -> List[JobSpec]:
+    """Load and validate every job in a manifest before anything runs.
+
+    Keys in an optional ``defaults`` table apply to every job that accepts them.
+
+    Raises:
+        UserInputError: If the manifest is unreadable, empty or has invalid jobs
+    """
+    data = _load_manifest(path)
+    if isinstance(data, list):
+        data = {"jobs": data}
+    if not isinstance(data, dict) or not isinstance(data.get("jobs"), list):
+        raise UserInputError(f"Job manifest {path} must contain a list of jobs")
+    defaults = data.get("defaults") or {}
+    if not isinstance(defaults, dict):
+        raise UserInputError(f"'defaults' in {path} must be a table/object")
+    defaults = {key.replace("-", "_"): value for key, value in defaults.items()}
+
+    jobs: List[JobSpec] = []
+    errors: List[str] = []
+    for index, entry in enumerate(data["jobs"], start=1):
+        try:
+            jobs.append(_validate_job(index, entry, defaults))
+        except ValueError as e:
+            errors.append(f"job {index}: {e}")
+    if errors:
+        shown = "; ".join(errors[:MAX_REPORTED_ERRORS])
+        more = len(errors) - MAX_REPORTED_ERRORS
+        if more > 0:
+            shown += f"; and {more} more"
+        raise UserInputError(f"Invalid jobs in {path}: {shown}")
+    if not jobs:
+        raise UserInputError(f"No jobs found in {path}")
+    return jobs
+
+
+def classify(job: JobSpec) -> str:
+    """Return whether a job is limited by I/O or by CPU.
+
+    Log jobs that decompress or filter spend their time in Python code and
+    zlib; everything else mostly waits on the network, a subprocess or disk.
+    """
+    if job.command != "log-dump":
+        return IO_BOUND
+    if job.options.get("grep"):
+        return CPU_BOUND
+    from commands.log_dump import is_gzipped
+
+    return CPU_BOUND if is_gzipped(Path(job.options["path"])) else IO_BOUND
+
+
+def _execute(
+    job: JobSpec,
+    collector: RecordCollector,
+    cancel: threading.Event,
+    profiler: Optional[Profiler] = None,
+    directory: Optional[DirectoryBackend] = None,
+    notifier: Optional[NotificationQueue] = None,
+) -> None:
+    options = job.options
+    if job.command == "ping-test":
+        from commands.ping_test import ping_test
+
+        ping_test(
+            options["host"],
+            options.get("count", 4),
+            options.get("timeout", 2),
+            options.get("verbose", False),
+            emitter=collector,
+            profiler=profiler,
+        )
+    elif job.command == "log-dump":
+        from commands.log_dump import log_dump
+
+        log_dump(
+            options["path"],
+            options.get("lines", 50),
+            options.get("tail", False),
+            options.get("grep"),
+            options.get("output"),
+            options.get("since_last_run", False),
+            emitter=collector,
+            cancel=cancel,
+            profiler=profiler,
+        )
+    else:
+        from commands.reset_user import reset_user
+
+        # The runner has already confirmed every reset up front.
+        reset_user(
+            options["username"],
+            True,
+            options.get("email"),
+            emitter=collector,
+            directory=directory,
+            notifier=notifier,
+            profiler=profiler,
+        )
+
+
+def _run_job(
+    job: JobSpec,
+    cancel: threading.Event,
+    profiler: Optional[Profiler] = None,
+    directory: Optional[DirectoryBackend] = None,
+    notifier: Optional[NotificationQueue] = None,
+) -> JobResult:
+    """Run one job on a worker thread; never raises."""
+    collector = RecordCollector()
+    start = time.monotonic()
+    status, error = "ok", None
+    try:
+        if cancel.is_set():
+            raise OperationCancelled("Cancelled before it started")
+        _execute(job, collector, cancel, profiler, directory, notifier)
+    except OperationCancelled as e:
+        status, error = "cancelled", str(e)
+    except FixitError as e:
+        status, error = "failed", str(e)
+    except Exception as e:  # noqa: BLE001 - one broken job must not stop the run
+        logger.exception(f"Job {job.name} crashed")
+        status, error = "failed", f"Unexpected error: {e}"
+    else:
+        for record in collector.records:
+            if record.get("type") == "ping" and not record.get("reachable"):
+                status, error = "failed", "Host is unreachable"
+    return JobResult(job, status, time.monotonic() - start, collector.records, error)
+
+
+@dataclass
+class _Running:
+    job: JobSpec
+    kind: str
+    cancel: threading.Event
+    deadline: Optional[float]
+    reported: bool = False
+
+
+def run_jobs(
+    jobs: List[JobSpec],
+    io_workers: int = 16,
+    cpu_workers: int = 2,
+    on_result: Optional[Callable[[JobResult], None]] = None,
+    profiler: Optional[Profiler] = None,
+    directory: Optional[DirectoryBackend] = None,
+    notifier: Optional[NotificationQueue] = None,
+) -> RunSummary:
+    """Run jobs concurrently and report each one as soon as its outcome is known.
+
+    At most ``io_workers`` I/O-bound and ``cpu_workers`` CPU-bound jobs run at
+    once. A job that passes its ``job_timeout`` is reported as timed out right
+    away and asked to stop; log reads stop within a few thousand lines, while a
+    ping already in flight finishes on its own bounded timeout before its slot
+    is reused. On Ctrl+C every job is cancelled and reported.
+
+    Args:
+        jobs: Validated jobs, in manifest order
+        io_workers: Concurrency limit for I/O-bound jobs
+        cpu_workers: Concurrency limit for CPU-bound jobs
+        on_result: Called on the calling thread with each result as it arrives
+        profiler: Shared by every job; also counts job outcomes
+        directory: Account directory shared by every reset-user job
+        notifier: Queue for reset notifications, shared by every reset-user job
+
+    Returns:
+        Counts of job outcomes
+
+    Raises:
+        UserInputError: If a concurrency limit is below 1
+        KeyboardInterrupt: After reporting cancelled jobs, if interrupted
+    """
+    if io_workers < 1 or cpu_workers < 1:
+        raise UserInputError("--io-workers and --cpu-workers must be at least 1")
+
+    summary = RunSummary(total=len(jobs))
+    start = time.monotonic()
+    pending: Dict[str, Deque[JobSpec]] = {IO_BOUND: deque(), CPU_BOUND: deque()}
+    for job in jobs:
+        pending[classify(job)].append(job)
+    limits = {IO_BOUND: io_workers, CPU_BOUND: cpu_workers}
+    busy = {IO_BOUND: 0, CPU_BOUND: 0}
+    running: Dict["Future[JobResult]", _Running] = {}
+
+    def report(result: JobResult) -> None:
+        setattr(summary, result.status, getattr(summary, result.status) + 1)
+        if profiler is not None:
+            profiler.count(f"jobs_{result.status}")
+        if on_result is not None:
+            on_result(result)
+
+    executor = ThreadPoolExecutor(
+        max_workers=io_workers + cpu_workers, thread_name_prefix="fixit-job"
+    )
+    try:
+        while running or pending[IO_BOUND] or pending[CPU_BOUND]:
+            for kind, queue in pending.items():
+                while queue and busy[kind] < limits[kind]:
+                    job = queue.popleft()
+                    cancel = threading.Event()
+                    deadline = None if job.timeout is None else time.monotonic() + job.timeout
+                    future = executor.submit(_run_job, job, cancel, profiler, directory, notifier)
+                    running[future] = _Running(job, kind, cancel, deadline)
+                    busy[kind] += 1
+
+            deadlines = [
+                state.deadline
+                for state in running.values()
+                if state.deadline is not None and not state.reported
+            ]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                state = running.pop(future)
+                busy[state.kind] -= 1
+                if not state.reported:
+                    report(future.result())
+
+            now = time.monotonic()
+            for state in running.values():
+                if not state.reported and state.deadline is not None and now >= state.deadline:
+                    state.reported = True
+                    state.cancel.set()
+                    report(
+                        JobResult(
+                            state.job,
+                            "timeout",
+                            state.job.timeout or 0.0,
+                            error=f"Timed out after {state.job.timeout:g}s",
+                        )
+                    )
+    except KeyboardInterrupt:
+        for state in running.values():
+            state.cancel.set()
+            if not state.reported:
+                report(JobResult(state.job, "cancelled", 0.0, error="Interrupted"))
+        for queue in pending.values():
+            while queue:
+                report(JobResult(queue.popleft(), "cancelled", 0.0, error="Interrupted"))
+        raise
+    finally:
+        executor.shutdown(wait=False)
+        summary.elapsed = time.monotonic() - start
+    return summary
+
+
+_STATUS_STYLE = {
+    "ok": ("✅", "green"),
+    "failed": ("❌", "red"),
+    "timeout": ("⏰", "yellow"),
+    "cancelled": ("🚫", "yellow"),
+}
+
+
+def _echo_result(result: JobResult) -> None:
+    """Print one finished job in the decorated text style."""
+    icon, colour = _STATUS_STYLE[result.status]
+    click.echo(
+        f"{icon} {click.style(result.job.name, fg=colour, bold=True)}"
+        f" ({result.status}, {result.elapsed:.2f}s)"
+    )
+    for line in (result.error or "").splitlines():
+        click.echo(f"   {line}")
+    for record in result.records:
+        kind = record.get("type")
+        if kind == "line":
+            click.echo(f"   {record['line']:6d} │ {record['text']}")
+        elif kind == "log_dump":
+            click.echo(
+                f"   {record['shown_lines']} of {record['matched_lines']} matching lines"
+                f" ({record['scanned_lines']} scanned)"
+            )
+        elif kind == "ping" and record.get("stats"):
+            click.echo(f"   {record['stats']}")
+        elif kind == "reset":
+            click.echo(
+                f"   New Password: {click.style(record['password'], fg='yellow', bold=True)}"
+            )
+
+
+def run_manifest(
+    path: str,
+    io_workers: int = 16,
+    cpu_workers: int = 2,
+    force: bool = False,
+    emitter: Optional[RecordEmitter] = None,
+    profiler: Optional[Profiler] = None,
+    directory: Optional[str] = None,
+    smtp: Optional[SmtpSettings] = None,
+    notify_timeout: float = 30.0,
+) -> RunSummary:
+    """Run every job in a manifest and stream results as jobs finish.
+
+    The account directory and notification queue are opened once, only if
+    the manifest has reset-user jobs, and shared by all of them.
+
+    Args:
+        path: JSON or TOML manifest (``-`` reads JSON from stdin)
+        io_workers: Concurrency limit for I/O-bound jobs
+        cpu_workers: Concurrency limit for CPU-bound jobs
+        force: Skip the confirmation for reset-user jobs
+        emitter: Emit job records instead of styled text
+        profiler: Shared by every job
+        directory: SQLite account directory for reset-user jobs (default: simulated)
+        smtp: Mail server for reset notifications (default: simulated)
+        notify_timeout: Seconds to wait for queued notifications at the end
+
+    Returns:
+        Counts of job outcomes
+
+    Raises:
+        UserInputError: If the manifest or limits are invalid
+        DirectoryError: If the account directory cannot be opened
+    """
+    jobs = read_manifest(path)
+    resets = sum(job.command == "reset-user" for job in jobs)
+    logger.info(f"Running {len(jobs)} jobs from {path}")
+
+    if emitter is None:
+        click.echo(
+            f"\n🏃 Running {click.style(str(len(jobs)), fg='cyan', bold=True)} jobs from {path}"
+        )
+        click.echo("─" * 60)
+
+    if resets and not force:
+        prompt = f"This runbook resets {resets} account password(s). Continue?"
+        if not click.confirm(prompt, err=emitter is not None):
+            logger.info("Job run cancelled by user")
+            if emitter is not None:
+                emitter.emit({"type": "run", "status": "cancelled", "jobs": len(jobs)})
+            else:
+                click.echo(click.style("❌ Run cancelled.", fg="yellow"))
+            return RunSummary(total=len(jobs), cancelled=len(jobs))
+
+    def on_result(result: JobResult) -> None:
+        if emitter is None:
+            _echo_result(result)
+            return
+        for record in result.records:
+            emitter.emit({"job": result.job.name, **record})
+        emitter.emit(
+            {
+                "type": "job",
+                "job": result.job.name,
+                "index": result.job.index,
+                "command": result.job.command,
+                "status": result.status,
+                "error": result.error,
+                "elapsed": round(result.elapsed, 6),
+            }
+        )
+        # Stream each job as it finishes rather than waiting for the buffer to fill.
+        emitter.flush()
+
+    backend: Optional[DirectoryBackend] = None
+    notifier: Optional[NotificationQueue] = None
+    try:
+        if resets and directory:
+            from commands.directory import open_directory
+
+            backend = open_directory(directory, pool_size=min(io_workers, resets))
+        if resets and smtp is not None:
+            from commands.notify import NotificationQueue
+
+            notifier = NotificationQueue(smtp)
+        summary = run_jobs(
+            jobs,
+            io_workers,
+            cpu_workers,
+            on_result,
+            profiler,
+            directory=backend,
+            notifier=notifier,
+        )
+    finally:
+        if backend is not None:
+            backend.close()
+        if notifier is not None:
+            from commands.notify import finish_notifications
+
+            finish_notifications(notifier, notify_timeout, emitter, profiler)
+
+    if emitter is not None:
+        emitter.emit(
+            {
+                "type": "run",
+                "status": "ok" if summary.ok == summary.total else "failed",
+                "jobs": summary.total,
+                "ok": summary.ok,
+                "failed": summary.failed,
+                "timeout": summary.timeout,
+                "cancelled": summary.cancelled,
+                "elapsed": round(summary.elapsed, 6),
+            }
+        )
+        return summary
+
+    colour = "green" if summary.ok == summary.total else "yellow"
+    click.echo("─" * 60)
+    click.echo(
+        click.style(
+            f"🏁 {summary.ok}/{summary.total} jobs succeeded in {summary.elapsed:.2f} seconds",
+            fg=colour,
+            bold=True,
+        )
+    )
+    if summary.ok != summary.total:
+        click.echo(
+            f"   Failed: {summary.failed}, timed out: {summary.timeout},"
+            f" cancelled: {summary.cancelled}"
+        )
+    click.echo()
+    return summary
@@ -2,14 +2,34 @@
 
 from __future__ import annotations
 
-import gzip
 import logging
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import asdict
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    ContextManager,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import click
 
-from commands.exceptions import LogFileError, UserInputError
+from commands.exceptions import LogFileError, OperationCancelled, UserInputError
+
+if TYPE_CHECKING:
+    import threading
+
+    from commands.checkpoints import Segment
+    from commands.output import RecordEmitter
+    from commands.profiling import Profiler
 
 logger = logging.getLogger(__name__)
 
@@ -30,12 +50,220 @@ def is_gzipped(filepath: Path) -> bool:
         return False
 
 
+def _chunks(
+    handle: Iterable[str], cancel: Optional[threading.Event], chunk_lines: int = 4096
+) -> Iterator[List[str]]:
+    """Yield lists of up to ``chunk_lines`` lines, checking ``cancel`` between them.
+    
+    Raises:
+        OperationCancelled: Once ``cancel`` is set
+    """
+    lines = iter(handle)
+    while True:
+        chunk = list(islice(lines, chunk_lines))
+        if not chunk:
+            return
+        if cancel is not None and cancel.is_set():
+            raise OperationCancelled("Log read cancelled")
+        yield chunk
+
+
+def _cancellable(
+    handle: IO[str], cancel: threading.Event, chunk_lines: int = 4096
+) -> Iterator[str]:
+    """Yield lines from handle, checking ``cancel`` between chunks of lines.
+    
+    Raises:
+        OperationCancelled: Once ``cancel`` is set
+    """
+    for chunk in _chunks(handle, cancel, chunk_lines):
+        yield from chunk
+
+
+def select_lines(
+    handle: Iterable[str],
+    lines: int,
+    tail: bool = False,
+    grep: Optional[str] = None,
+) -> Tuple[List[Tuple[int, str]], int, int]:
+    """Stream a log once and keep only the lines that will be shown.
+    
+    Args:
+        handle: Open text handle to read from
+        lines: Number of lines to keep
+        tail: Keep the last lines instead of the first
+        grep: Case-insensitive substring filter
+        
+    Returns:
+        Tuple of (selected (line_number, text) pairs, total lines, matching lines).
+        Line numbers are 1-based positions in the source file.
+    """
+    needle = grep.lower() if grep else None
+    limit = max(lines, 0)
+    head: List[Tuple[int, str]] = []
+    last: Deque[Tuple[int, str]] = deque(maxlen=limit)
+    total = 0
+    matched = 0
+    for total, line in enumerate(handle, start=1):
+        if needle is not None and needle not in line.lower():
+            continue
+        matched += 1
+        if tail:
+            last.append((total, line))
+        elif matched <= limit:
+            head.append((total, line))
+    return (list(last) if tail else head), total, matched
+
+
+def select_new_lines(
+    segments: List[Segment],
+    lines: int,
+    tail: bool = False,
+    grep: Optional[str] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[List[Tuple[Path, int, str]], int, int, Segment]:
+    """Like :func:`select_lines`, over the segments left by the last checkpoint.
+    
+    In head mode reading stops at the last line that will be shown, so the
+    next run picks up right after it instead of skipping unshown matches.
+    
+    Returns:
+        Tuple of (selected (file, line_number, text) triples, lines read,
+        matching lines, segment to checkpoint)
+        
+    Raises:
+        OperationCancelled: Once ``cancel`` is set
+    """
+    from commands.checkpoints import read_segment
+
+    needle = grep.lower() if grep else None
+    limit = max(lines, 0)
+    kept: Deque[Tuple[Path, int, str]] = deque(maxlen=limit)
+    total = 0
+    matched = 0
+    if not tail and limit == 0:
+        return [], total, matched, segments[0]
+    for segment in segments:
+        for line_number, line in read_segment(segment):
+            total += 1
+            if cancel is not None and total % 4096 == 0 and cancel.is_set():
+                raise OperationCancelled("Log read cancelled")
+            if needle is not None and needle not in line.lower():
+                continue
+            matched += 1
+            kept.append((segment.path, line_number, line))
+            if not tail and matched == limit:
+                return list(kept), total, matched, segment
+    return list(kept), total, matched, segments[-1]
+
+
+def _open_text(log_file: Path, gzipped: bool) -> IO[str]:
+    if gzipped:
+        import gzip
+        
+        return gzip.open(log_file, 'rt', encoding='utf-8', errors='ignore')
+    return open(log_file, 'r', encoding='utf-8', errors='ignore')
+
+
+def _render_line(number: int, line: str, grep: Optional[str]) -> str:
+    if grep and grep.lower() in line.lower():
+        line = line.replace(grep, click.style(grep, fg='yellow', bold=True))
+    return f"{number:4d} │ {line.rstrip()}\n"
+
+
+def _paged_lines(
+    log_file: Path,
+    gzipped: bool,
+    lines: int,
+    tail: bool,
+    grep: Optional[str],
+    cancel: Optional[threading.Event],
+    profiler: Optional[Profiler],
+    heartbeat_lines: int = 4096,
+) -> Iterator[str]:
+    """Render a log dump lazily for :func:`commands.pager.page`.
+    
+    The file is read ``heartbeat_lines`` lines at a time. In head mode each
+    chunk is filtered and rendered only when the pager asks for more, so the
+    first screen never waits for the rest of the file; tail mode has to scan
+    to the end before it can render anything. An empty string is yielded
+    after every chunk so the pager pump can notice the user quitting during
+    a long, sparse search or tail scan.
+    """
+    yield f"\n📋 Log Dump: {click.style(str(log_file), fg='cyan', bold=True)}\n"
+    yield "─" * 60 + "\n"
+    if grep:
+        yield f"🔍 Filtering for pattern: {click.style(grep, fg='yellow')}\n"
+    yield "\n"
+    needle = grep.lower() if grep else None
+    limit = max(lines, 0)
+    scanned = 0
+    shown = 0
+    try:
+        with _open_text(log_file, gzipped) as f:
+            if tail:
+                kept: Deque[Tuple[int, str]] = deque(maxlen=limit)
+                for chunk in _chunks(f, cancel, heartbeat_lines):
+                    selected, count, _ = select_lines(chunk, limit, tail=True, grep=grep)
+                    kept.extend((scanned + number, line) for number, line in selected)
+                    scanned += count
+                    yield ""
+                for shown, (_, line) in enumerate(kept, start=1):
+                    yield _render_line(shown, line, grep)
+            elif limit:
+                for chunk in _chunks(f, cancel, heartbeat_lines):
+                    for line in chunk:
+                        scanned += 1
+                        if needle is not None and needle not in line.lower():
+                            continue
+                        shown += 1
+                        yield _render_line(shown, line, grep)
+                        if shown == limit:
+                            break
+                    if shown == limit:
+                        break
+                    yield ""
+    except PermissionError as e:
+        raise LogFileError(f"Permission denied reading {log_file}") from e
+    except (OSError, EOFError) as e:
+        raise LogFileError(f"Error reading file: {e}") from e
+    finally:
+        if profiler is not None:
+            profiler.count("lines_scanned", scanned)
+            profiler.count("lines_shown", shown)
+    
+    position = "tail" if tail else "head"
+    yield f"\n📊 Showed {shown} lines from {position} ({scanned} lines scanned)\n"
+    yield "─" * 60 + "\n"
+
+
+def _write_output(output_path: Path, selected: List[Tuple[int, str]]) -> None:
+    """Write selected lines to an output file.
+    
+    Raises:
+        LogFileError: If the file cannot be written
+    """
+    try:
+        output_path.write_text(''.join(line for _, line in selected), encoding='utf-8')
+        logger.info(f"Output saved to: {output_path}")
+    except Exception as e:
+        error_msg = f"Failed to write output file {output_path}: {str(e)}"
+        logger.error(error_msg)
+        raise LogFileError(error_msg) from e
+
+
 def log_dump(
     log_path: str,
     lines: int = 50,
     tail: bool = False,
     grep: Optional[str] = None,
     output: Optional[str] = None,
+    since_last_run: bool = False,
+    checkpoint_file: Optional[str] = None,
+    pager: bool = False,
+    emitter: Optional[RecordEmitter] = None,
+    cancel: Optional[threading.Event] = None,
+    profiler: Optional[Profiler] = None,
 ) -> None:
     """Dump log file contents with filtering options.
     
@@ -45,10 +273,19 @@ def log_dump(
         tail: Show tail instead of head
         grep: Filter pattern to search for
         output: Optional output file path
+        since_last_run: Only read lines added since the last run with the
+            same grep pattern, and checkpoint where this run stops
+        checkpoint_file: Checkpoint store (default: under $XDG_STATE_HOME)
+        pager: Stream the rendered lines into a pager, reading the file only
+            as fast as the pager consumes it
+        emitter: Emit structured line records instead of styled text
+        cancel: Stop reading once this event is set
+        profiler: Record read, decompress, scan and render timings and line counts
         
     Raises:
         UserInputError: If log_path is invalid or empty
         LogFileError: If file operations fail
+        OperationCancelled: If ``cancel`` is set before the file has been read
     """
     if not log_path or not log_path.strip():
         raise UserInputError("Log path cannot be empty")
@@ -56,8 +293,12 @@ def log_dump(
     log_file = Path(log_path.strip())
     logger.info(f"Log dump requested for: {log_file} (lines={lines}, tail={tail}, grep={grep})")
     
-    click.echo(f"\n📋 Log Dump: {click.style(str(log_file), fg='cyan', bold=True)}")
-    click.echo("─" * 60)
+    if pager and (emitter is not None or output or since_last_run):
+        raise UserInputError("--pager cannot be combined with --format, --output or --since-last-run")
+    
+    if emitter is None and not pager:
+        click.echo(f"\n📋 Log Dump: {click.style(str(log_file), fg='cyan', bold=True)}")
+        click.echo("─" * 60)
     
     # Check if file exists
     if not log_file.exists():
@@ -68,71 +309,135 @@ def log_dump(
     # Check if file is readable
     if not log_file.is_file():
         error_msg = f"Not a regular file: {log_file}"
+        if log_file.is_dir():
+            error_msg += " (use --recursive --grep to search a directory)"
         logger.error(error_msg)
         raise LogFileError(error_msg)
     
+    if pager:
+        from commands.pager import page
+
+        gzipped = is_gzipped(log_file)
+        if not page(_paged_lines(log_file, gzipped, lines, tail, grep, cancel, profiler)):
+            logger.debug(f"Pager closed early; stopped reading {log_file}")
+        return
+    
     try:
         # Handle gzipped files
-        if is_gzipped(log_file):
+        gzipped = is_gzipped(log_file)
+        if gzipped:
             logger.debug(f"Detected gzipped file: {log_file}")
-            click.echo("📦 Detected gzipped file, decompressing...")
-            file_handle = gzip.open(log_file, 'rt', encoding='utf-8', errors='ignore')
+            if emitter is None:
+                click.echo("📦 Detected gzipped file, decompressing...")
+        sources: Optional[List[Path]] = None
+        if since_last_run:
+            if gzipped:
+                raise UserInputError("--since-last-run needs an uncompressed log file")
+            from commands.checkpoints import CheckpointStore, checkpoint_for, plan_segments
+
+            store = CheckpointStore(checkpoint_file)
+            segments, resume = plan_segments(log_file, store.get(log_file, grep))
+            skipped, start_line, start_path = segments[0].offset, segments[0].line, segments[0].path
+            with profiler.phase("scan") if profiler is not None else nullcontext():
+                kept, scanned_lines, matched_lines, stop = select_new_lines(
+                    segments, lines, tail, grep, cancel
+                )
+            checkpoint = checkpoint_for(stop)
+            sources = [path for path, _, _ in kept]
+            selected = [(line_number, line) for _, line_number, line in kept]
+            if profiler is not None:
+                profiler.count("bytes_skipped", skipped)
+                profiler.count("bytes_read", sum(s.offset for s in segments) - skipped)
+            logger.debug(f"Resuming {log_file} ({resume}) at byte {skipped}")
+            if emitter is None:
+                click.echo(
+                    f"🔖 Reading new lines since the last run ({resume}), "
+                    f"from line {start_line + 1} of {start_path}"
+                )
         else:
-            file_handle = open(log_file, 'r', encoding='utf-8', errors='ignore')
+            file_handle: ContextManager[IO[str]]
+            if profiler is not None:
+                file_handle = profiler.open_log(log_file, gzipped)
+            else:
+                file_handle = _open_text(log_file, gzipped)
+            
+            with file_handle as f:
+                source = f if cancel is None else _cancellable(f, cancel)
+                selected, scanned_lines, matched_lines = select_lines(source, lines, tail, grep)
         
-        with file_handle as f:
-            all_lines = f.readlines()
+        if profiler is not None:
+            profiler.count("lines_scanned", scanned_lines)
+            profiler.count("lines_matched", matched_lines)
+            profiler.count("lines_shown", len(selected))
         
-        logger.debug(f"Read {len(all_lines)} lines from {log_file}")
+        logger.debug(f"Read {scanned_lines} lines from {log_file}")
         
         # Apply grep filter if specified
         if grep:
-            filtered_lines = [line for line in all_lines if grep.lower() in line.lower()]
-            click.echo(f"🔍 Filtering for pattern: {click.style(grep, fg='yellow')}")
-            click.echo(f"   Found {len(filtered_lines)} matching lines out of {len(all_lines)} total")
-            all_lines = filtered_lines
-            logger.debug(f"Filtered to {len(filtered_lines)} matching lines")
+            if emitter is None:
+                click.echo(f"🔍 Filtering for pattern: {click.style(grep, fg='yellow')}")
+                click.echo(f"   Found {matched_lines} matching lines out of {scanned_lines} total")
+            logger.debug(f"Filtered to {matched_lines} matching lines")
         
         # Select lines (head or tail)
-        if tail:
-            selected_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-            position = "tail"
-        else:
-            selected_lines = all_lines[:lines] if len(all_lines) > lines else all_lines
-            position = "head"
+        position = "tail" if tail else "head"
         
         # Display info
-        total_lines = len(all_lines)
-        shown_lines = len(selected_lines)
+        total_lines = matched_lines
+        shown_lines = len(selected)
+        
+        phase = "write" if output else "render"
+        if emitter is not None:
+            with profiler.phase(phase) if profiler is not None else nullcontext():
+                if output:
+                    _write_output(Path(output), selected)
+                else:
+                    for index, (line_number, line) in enumerate(selected):
+                        emitter.emit({
+                            "type": "line",
+                            "file": str(log_file if sources is None else sources[index]),
+                            "line": line_number,
+                            "text": line.rstrip('\r\n'),
+                        })
+            summary = {
+                "type": "log_dump",
+                "file": str(log_file),
+                "gzipped": gzipped,
+                "position": position,
+                "grep": grep,
+                "scanned_lines": scanned_lines,
+                "matched_lines": matched_lines,
+                "shown_lines": shown_lines,
+                "output": output,
+            }
+            if since_last_run:
+                store.update(log_file, grep, checkpoint)
+                summary["resume"] = resume
+                summary["checkpoint"] = {"file": str(stop.path), **asdict(checkpoint)}
+            emitter.emit(summary)
+            return
+        
         click.echo(f"📊 Showing {shown_lines} lines from {position} (total: {total_lines} lines)")
         click.echo()
         
         # Output to file or console
-        output_content = ''.join(selected_lines)
-        
-        if output:
-            output_path = Path(output)
-            try:
-                output_path.write_text(output_content, encoding='utf-8')
-                logger.info(f"Output saved to: {output_path}")
+        with profiler.phase(phase) if profiler is not None else nullcontext():
+            if output:
+                output_path = Path(output)
+                _write_output(output_path, selected)
                 click.echo(click.style(f"✅ Output saved to: {output_path}", fg='green', bold=True))
-            except Exception as e:
-                error_msg = f"Failed to write output file {output_path}: {str(e)}"
-                logger.error(error_msg)
-                raise LogFileError(error_msg) from e
-        else:
-            # Display with line numbers
-            for i, line in enumerate(selected_lines, start=1):
-                # Highlight grep matches
-                if grep and grep.lower() in line.lower():
-                    # Simple highlighting - replace matched text with styled version
-                    highlighted = line.replace(
-                        grep,
-                        click.style(grep, fg='yellow', bold=True)
-                    )
-                    click.echo(f"{i:4d} │ {highlighted.rstrip()}")
-                else:
-                    click.echo(f"{i:4d} │ {line.rstrip()}")
+            else:
+                # Display with line numbers
+                for i, (line_number, line) in enumerate(selected, start=1):
+                    if sources is not None:
+                        # Positions in the file are what the next run resumes from
+                        i = line_number
+                    click.echo(_render_line(i, line, grep), nl=False)
+        
+        if since_last_run:
+            store.update(log_file, grep, checkpoint)
+            click.echo()
+            click.echo(f"🔖 Checkpoint saved at line {checkpoint.line} of {stop.path}")
         
         click.echo()
         click.echo(f"💡 Tip: Use --tail to see the end, --grep to filter, --output to save")
@@ -142,7 +447,7 @@ def log_dump(
         logger.error(error_msg)
         raise LogFileError(error_msg) from e
     except Exception as e:
-        if isinstance(e, LogFileError):
+        if isinstance(e, (LogFileError, OperationCancelled, UserInputError)):
             raise
         error_msg = f"Error reading file: {str(e)}"
         logger.exception(error_msg)
@@ -0,0 +1,468 @@
+"""Recursive log search for ``fixit log-dump DIR --recursive --grep``.
+
+The tree is walked once, applying include/exclude globs, and every candidate
+file is searched on a worker pool, largest first so one big file does not
+finish long after everything else. Threads are used by default; ``processes``
+switches to a process pool when scanning (not disk or decompression) is the
+bottleneck. Binary files are detected from their first few KiB and skipped.
+
+Each file is read in large text chunks: the chunk is lower-cased and searched
+in one call, and line numbers are recovered by counting newlines only up to
+each hit, so files with few matches are scanned at close to memory speed.
+Results are printed grouped per file, in path order, as soon as every file
+before them has finished.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import click
+
+from commands.exceptions import LogFileError, OperationCancelled, UserInputError
+
+if TYPE_CHECKING:
+    import gzip
+
+    from commands.output import RecordEmitter
+    from commands.profiling import Profiler
+
+logger = logging.getLogger(__name__)
+
+CHUNK_CHARS = 1 << 20
+BINARY_SNIFF_BYTES = 8192
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class FileResult:
+    """Outcome of searching one file."""
+
+    path: str
+    size: int = 0
+    gzipped: bool = False
+    binary: bool = False
+    scanned_lines: int = 0
+    matched_lines: int = 0
+    matches: List[Tuple[int, str]] = field(default_factory=list)
+    bytes_read: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class SearchSummary:
+    """Totals for one recursive search."""
+
+    files: int = 0
+    matching_files: int = 0
+    matched_lines: int = 0
+    skipped_binary: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+
+def _matches_any(relative: str, name: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch(relative, pattern) or fnmatch(name, pattern) for pattern in patterns)
+
+
+def find_logs(
+    root: Path, include: Sequence[str] = (), exclude: Sequence[str] = ()
+) -> List[Tuple[str, int]]:
+    """Walk ``root`` and return the files to search with their sizes.
+
+    Patterns are matched against both the file name and the path relative to
+    ``root``. Excluded directories are not descended into; symlinked
+    directories are not followed.
+
+    Args:
+        root: Directory to walk
+        include: Only keep files matching one of these globs (all files if empty)
+        exclude: Skip files and directories matching any of these globs
+
+    Returns:
+        List of (path, size in bytes) pairs, in path order
+    """
+    found: List[Tuple[str, int]] = []
+    pending = [str(root)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                listing = list(entries)
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory {directory}: {e}")
+            continue
+        for entry in listing:
+            relative = Path(os.path.relpath(entry.path, root)).as_posix()
+            if _matches_any(relative, entry.name, exclude):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    if include and not _matches_any(relative, entry.name, include):
+                        continue
+                    found.append((entry.path, entry.stat().st_size))
+            except OSError as e:
+                logger.warning(f"Skipping {entry.path}: {e}")
+    found.sort()
+    return found
+
+
+def _chunks(handle: IO[str], cancel: Optional[threading.Event]) -> Iterator[str]:
+    """Yield large pieces of ``handle`` that always end on a line boundary."""
+    while True:
+        chunk = handle.read(CHUNK_CHARS)
+        if not chunk:
+            return
+        if not chunk.endswith("\n"):
+            chunk += handle.readline()
+        if cancel is not None and cancel.is_set():
+            raise OperationCancelled("Log search cancelled")
+        yield chunk
+
+
+def _scan(
+    handle: IO[str],
+    needle: str,
+    result: FileResult,
+    lines: int,
+    tail: bool,
+    first_only: bool,
+    cancel: Optional[threading.Event],
+) -> None:
+    limit = max(lines, 0)
+    last: Deque[Tuple[int, str]] = deque(maxlen=limit)
+    shown = last if tail else result.matches
+    line_base = 0
+    chunk = ""
+    for chunk in _chunks(handle, cancel):
+        lowered = chunk.lower()
+        pos = lowered.find(needle)
+        split: Optional[List[str]] = None
+        index = 0
+        cursor = 0
+        while pos >= 0:
+            # Lower-casing can change lengths, but never newlines, so line
+            # indexes in ``lowered`` and ``chunk`` agree.
+            index += lowered.count("\n", cursor, pos)
+            result.matched_lines += 1
+            if tail or len(shown) < limit:
+                if split is None:
+                    split = chunk.split("\n")
+                shown.append((line_base + index + 1, split[index]))
+            if first_only:
+                result.scanned_lines = line_base + index + 1
+                result.matches = list(shown)
+                return
+            end = lowered.find("\n", pos)
+            if end < 0:
+                break
+            cursor = end + 1
+            index += 1
+            pos = lowered.find(needle, cursor)
+        line_base += chunk.count("\n")
+    if chunk and not chunk.endswith("\n"):
+        line_base += 1
+    result.scanned_lines = line_base
+    if tail:
+        result.matches = list(last)
+
+
+def search_file(
+    path: str,
+    needle: str,
+    lines: int = 50,
+    tail: bool = False,
+    first_only: bool = False,
+    cancel: Optional[threading.Event] = None,
+) -> FileResult:
+    """Search one (optionally gzipped) file for a lower-cased substring.
+
+    Never raises for unreadable or corrupt files; the error is recorded on
+    the result instead so one bad file does not abort the whole search.
+
+    Args:
+        path: File to search
+        needle: Lower-cased substring to look for
+        lines: Keep at most this many matching lines
+        tail: Keep the last matching lines instead of the first
+        first_only: Stop reading at the first match
+        cancel: Stop reading once this event is set
+
+    Returns:
+        The file's matches and counts
+
+    Raises:
+        OperationCancelled: If ``cancel`` is set while the file is read
+    """
+    result = FileResult(path)
+    try:
+        with open(path, "rb") as raw:
+            source: Union[io.BufferedReader, gzip.GzipFile] = raw
+            if raw.read(2) == GZIP_MAGIC:
+                import gzip
+
+                result.gzipped = True
+                raw.seek(0)
+                source = gzip.GzipFile(fileobj=raw, mode="rb")
+            else:
+                raw.seek(0)
+            if b"\0" in source.peek(BINARY_SNIFF_BYTES)[:BINARY_SNIFF_BYTES]:
+                result.binary = True
+                return result
+            text = io.TextIOWrapper(source, encoding="utf-8", errors="ignore")
+            try:
+                _scan(text, needle, result, lines, tail, first_only, cancel)
+                result.bytes_read = raw.tell()
+            finally:
+                text.close()
+    except OperationCancelled:
+        raise
+    except (OSError, EOFError) as e:
+        result.error = f"Error reading {path}: {e}"
+        logger.warning(result.error)
+    return result
+
+
+def _emit_result(emitter: RecordEmitter, result: FileResult, files_with_matches: bool) -> None:
+    if not files_with_matches:
+        for line_number, line in result.matches:
+            emitter.emit({"type": "line", "file": result.path, "line": line_number, "text": line})
+    record = {
+        "type": "file",
+        "file": result.path,
+        "gzipped": result.gzipped,
+        "scanned_lines": result.scanned_lines,
+        "matched_lines": result.matched_lines,
+        "shown_lines": 0 if files_with_matches else len(result.matches),
+    }
+    if result.error is not None:
+        record["error"] = result.error
+    emitter.emit(record)
+
+
+def _echo_result(result: FileResult, grep: str, files_with_matches: bool) -> None:
+    if result.error is not None:
+        click.echo(click.style(f"⚠️  {result.error}", fg="yellow"))
+        return
+    if files_with_matches:
+        click.echo(result.path)
+        return
+    click.echo(
+        click.style(f"📄 {result.path}", fg="cyan", bold=True)
+        + f" ({result.matched_lines} matching lines)"
+    )
+    for line_number, line in result.matches:
+        highlighted = line.replace(grep, click.style(grep, fg="yellow", bold=True))
+        click.echo(f"{line_number:6d} │ {highlighted.rstrip()}")
+    click.echo()
+
+
+def _write_result(handle: IO[str], result: FileResult, files_with_matches: bool) -> None:
+    if files_with_matches:
+        handle.write(f"{result.path}\n")
+        return
+    for line_number, line in result.matches:
+        handle.write(f"{result.path}:{line_number}:{line}\n")
+
+
+def search_logs(
+    root: str,
+    grep: Optional[str],
+    lines: int = 50,
+    tail: bool = False,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    files_with_matches: bool = False,
+    workers: int = 8,
+    processes: bool = False,
+    output: Optional[str] = None,
+    emitter: Optional[RecordEmitter] = None,
+    cancel: Optional[threading.Event] = None,
+    profiler: Optional[Profiler] = None,
+) -> SearchSummary:
+    """Search every log file under a directory for a pattern.
+
+    Args:
+        root: Directory to search
+        grep: Case-insensitive substring to look for
+        lines: Matching lines to show per file
+        tail: Show each file's last matching lines instead of the first
+        include: Only search files matching one of these globs
+        exclude: Skip files and directories matching any of these globs
+        files_with_matches: Only list the files that match, reading each
+            file only up to its first hit
+        workers: Files searched at once
+        processes: Search in worker processes instead of threads
+        output: Write ``path:line:text`` (or matching paths) to this file
+        emitter: Emit structured records instead of styled text
+        cancel: Stop searching once this event is set
+        profiler: Record walk, search and render timings and counters
+
+    Returns:
+        Totals for the search
+
+    Raises:
+        UserInputError: If the arguments are invalid
+        LogFileError: If ``root`` is not a directory or the output cannot be written
+        OperationCancelled: If ``cancel`` is set before the search finishes
+    """
+    if not grep:
+        raise UserInputError("--recursive needs a --grep pattern")
+    if workers < 1:
+        raise UserInputError("--workers must be at least 1")
+    root_path = Path(root.strip())
+    if not root_path.is_dir():
+        raise LogFileError(f"Not a directory: {root_path}")
+    needle = grep.lower()
+    logger.info(f"Log search requested for: {root_path} (grep={grep}, workers={workers})")
+
+    start = time.monotonic()
+    with profiler.phase("walk") if profiler is not None else nullcontext():
+        candidates = find_logs(root_path, include, exclude)
+    summary = SearchSummary(files=len(candidates))
+    if emitter is None:
+        click.echo(f"\n📂 Log Search: {click.style(str(root_path), fg='cyan', bold=True)}")
+        click.echo("─" * 60)
+        click.echo(f"🔍 Searching {len(candidates)} files for: {click.style(grep, fg='yellow')}")
+        click.echo()
+
+    try:
+        handle = open(output, "w", encoding="utf-8") if output else None
+    except OSError as e:
+        raise LogFileError(f"Failed to write output file {output}: {e}") from e
+
+    # Print in path order, but schedule the biggest files first.
+    order = [path for path, _ in candidates]
+    sizes = dict(candidates)
+    done: Dict[str, FileResult] = {}
+    next_index = 0
+
+    def release() -> None:
+        nonlocal next_index
+        while next_index < len(order) and order[next_index] in done:
+            result = done.pop(order[next_index])
+            next_index += 1
+            if result.binary:
+                summary.skipped_binary += 1
+                continue
+            if result.error is not None:
+                summary.errors += 1
+            elif result.matched_lines:
+                summary.matching_files += 1
+                summary.matched_lines += result.matched_lines
+            else:
+                continue
+            if profiler is not None:
+                profiler.count("lines_shown", len(result.matches))
+            with profiler.phase("render") if profiler is not None else nullcontext():
+                if emitter is not None and (handle is None or result.error is not None):
+                    _emit_result(emitter, result, files_with_matches)
+                elif handle is not None and result.error is None:
+                    _write_result(handle, result, files_with_matches)
+                else:
+                    _echo_result(result, grep, files_with_matches)
+
+    executor: Executor
+    if processes:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fixit-search")
+    # Worker threads watch their own event so Ctrl+C stops them too; worker
+    # processes receive the interrupt themselves.
+    stop = threading.Event()
+    futures: List["Future[FileResult]"] = []
+    try:
+        with handle if handle is not None else nullcontext():
+            for path in sorted(order, key=lambda p: -sizes[p]):
+                futures.append(
+                    executor.submit(
+                        search_file,
+                        path,
+                        needle,
+                        lines,
+                        tail,
+                        files_with_matches,
+                        None if processes else stop,
+                    )
+                )
+            remaining = set(futures)
+            while remaining:
+                if cancel is not None and cancel.is_set():
+                    raise OperationCancelled("Log search cancelled")
+                finished, remaining = wait(remaining, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    result.size = sizes[result.path]
+                    done[result.path] = result
+                    if profiler is not None:
+                        profiler.count("files_searched", 0 if result.binary else 1)
+                        profiler.count("files_skipped_binary", 1 if result.binary else 0)
+                        profiler.count("bytes_read", result.bytes_read)
+                        profiler.count("lines_scanned", result.scanned_lines)
+                        profiler.count("lines_matched", result.matched_lines)
+                release()
+    except BaseException:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=not processes)
+        raise
+    executor.shutdown()
+    summary.elapsed = time.monotonic() - start
+
+    if emitter is not None:
+        emitter.emit(
+            {
+                "type": "log_search",
+                "path": str(root_path),
+                "grep": grep,
+                "files": summary.files,
+                "matching_files": summary.matching_files,
+                "matched_lines": summary.matched_lines,
+                "skipped_binary": summary.skipped_binary,
+                "errors": summary.errors,
+                "output": output,
+            }
+        )
+        return summary
+
+    if output:
+        click.echo(click.style(f"✅ Output saved to: {output}", fg="green", bold=True))
+    click.echo(
+        f"📊 {summary.matched_lines} matching lines in {summary.matching_files} of "
+        f"{summary.files} files ({summary.skipped_binary} binary skipped) "
+        f"in {summary.elapsed:.2f}s"
+    )
+    click.echo("─" * 60 + "\n")
+    return summary
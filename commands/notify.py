@@ -0,0 +1,316 @@
+"""Password reset notifications over SMTP.
+
+Resets hand notifications to a :class:`NotificationQueue` and return
+immediately. Background sender threads each keep one SMTP session open and
+deliver many messages over it, retrying transient failures with exponential
+backoff. :meth:`NotificationQueue.close` flushes the queue but gives up once
+its deadline passes, so a slow mail server can delay exit by at most that long.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple, Union
+
+import click
+
+from commands.exceptions import UserInputError
+
+if TYPE_CHECKING:
+    from commands.output import RecordEmitter
+    from commands.profiling import Profiler
+
+logger = logging.getLogger(__name__)
+
+_STOP = None
+
+# Reset notices are queued as (username, email) and built on the sender thread,
+# so queueing one costs the caller next to nothing.
+_Pending = Union[EmailMessage, Tuple[str, str]]
+
+
+@dataclass(frozen=True)
+class SmtpSettings:
+    """Connection details for the outgoing mail server."""
+
+    host: str
+    port: int = 25
+    sender: str = "fixit@localhost"
+    username: Optional[str] = None
+    password: Optional[str] = None
+    starttls: bool = False
+    timeout: float = 10.0
+    local_hostname: Optional[str] = None
+
+
+@dataclass
+class NotificationStats:
+    """Delivery counts reported when the queue is closed."""
+
+    sent: int = 0
+    failed: int = 0
+    dropped: int = 0
+    sessions: int = 0
+
+
+def build_reset_notice(username: str, email: str, sender: str) -> EmailMessage:
+    """Build the notification sent after a password reset.
+
+    The new password is deliberately not included; users collect it from
+    support through a verified channel.
+    """
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = email
+    message["Subject"] = f"Password reset for {username}"
+    message.set_content(
+        f"The password for account '{username}' has been reset by IT support.\n\n"
+        "Contact the service desk to receive your new password, and change it "
+        "as soon as you sign in.\n\n"
+        "If you did not request this reset, report it to the service desk immediately.\n"
+    )
+    return message
+
+
+class NotificationQueue:
+    """In-process queue of notifications delivered by background senders.
+
+    Args:
+        settings: SMTP server to deliver through
+        workers: Number of sender threads, each with its own SMTP session
+        max_per_session: Messages sent before a session is recycled
+        retries: Extra delivery attempts for transient failures
+        backoff: Initial retry delay in seconds, doubled on each attempt
+        idle_timeout: Close a session after this many idle seconds
+        connect: Factory for SMTP sessions (defaults to :func:`smtplib.SMTP`)
+    """
+
+    def __init__(
+        self,
+        settings: SmtpSettings,
+        workers: int = 2,
+        max_per_session: int = 100,
+        retries: int = 3,
+        backoff: float = 0.5,
+        idle_timeout: float = 30.0,
+        connect: Optional[Callable[[SmtpSettings], smtplib.SMTP]] = None,
+    ) -> None:
+        if workers < 1:
+            raise UserInputError("Notification workers must be at least 1")
+        if max_per_session < 1:
+            raise UserInputError("Messages per SMTP session must be at least 1")
+        self.settings = settings
+        self.max_per_session = max_per_session
+        self.retries = retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self._connect_factory = connect or _connect
+        self._queue: "queue.Queue[Optional[_Pending]]" = queue.Queue()
+        self._abandon = threading.Event()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = NotificationStats()
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._run, name=f"fixit-smtp-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def send(self, message: EmailMessage) -> None:
+        """Queue a message for delivery without waiting for the mail server."""
+        if self._closed:
+            raise RuntimeError("Notification queue is closed")
+        if message["From"] is None:
+            message["From"] = self.settings.sender
+        self._queue.put(message)
+
+    def notify_reset(self, username: str, email: str) -> None:
+        """Queue the password reset notice for an account."""
+        if self._closed:
+            raise RuntimeError("Notification queue is closed")
+        self._queue.put((username, email))
+
+    def close(self, timeout: float = 30.0) -> NotificationStats:
+        """Deliver queued messages, giving up after ``timeout`` seconds.
+
+        Returns:
+            Delivery counts; messages still queued at the deadline are dropped
+        """
+        if not self._closed:
+            self._closed = True
+            for _ in self._threads:
+                self._queue.put(_STOP)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        if any(thread.is_alive() for thread in self._threads):
+            self._abandon.set()
+            for thread in self._threads:
+                thread.join(1.0)
+        dropped = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                dropped += 1
+        with self._lock:
+            self.stats.dropped += dropped
+        if dropped:
+            logger.warning(f"Dropped {dropped} notifications at the {timeout:.1f}s flush deadline")
+        return self.stats
+
+    def __enter__(self) -> "NotificationQueue":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+    def _run(self) -> None:
+        session: Optional[smtplib.SMTP] = None
+        sent_in_session = 0
+        while True:
+            try:
+                message = self._queue.get(timeout=self.idle_timeout if session else None)
+            except queue.Empty:
+                _quit(session)
+                session = None
+                continue
+            if message is _STOP:
+                break
+            if self._abandon.is_set():
+                self._count("dropped")
+                continue
+            if isinstance(message, tuple):
+                username, email = message
+                try:
+                    message = build_reset_notice(username, email, sender=self.settings.sender)
+                except Exception as e:  # noqa: BLE001 - one bad notice must not stop the sender
+                    logger.error(f"Cannot build notification for {username!r}: {e}")
+                    self._count("failed")
+                    continue
+            if session is not None and sent_in_session >= self.max_per_session:
+                _quit(session)
+                session = None
+            previous = session
+            session, delivered = self._deliver(session, message)
+            if session is not previous:
+                sent_in_session = 0
+            if delivered:
+                sent_in_session += 1
+        _quit(session)
+
+    def _deliver(
+        self, session: Optional[smtplib.SMTP], message: EmailMessage
+    ) -> Tuple[Optional[smtplib.SMTP], bool]:
+        """Send one message, reusing ``session`` and retrying transient errors."""
+        for attempt in range(self.retries + 1):
+            try:
+                if session is None:
+                    session = self._connect_factory(self.settings)
+                    self._count("sessions")
+                session.send_message(message)
+                self._count("sent")
+                return session, True
+            except smtplib.SMTPRecipientsRefused as e:
+                if all(code >= 500 for code, _ in e.recipients.values()):
+                    logger.error(f"Notification to {message['To']} refused: {e.recipients}")
+                    break
+                # 4xx replies are temporary; retry on a fresh session.
+                error: Exception = e
+            except (smtplib.SMTPException, OSError) as e:
+                error = e
+            except Exception as e:  # noqa: BLE001 - e.g. a header the policy cannot encode
+                # Not transient: retrying the same message would fail the same way.
+                logger.error(f"Notification to {message['To']} cannot be sent: {e}")
+                _quit(session)
+                session = None
+                break
+            _quit(session)
+            session = None
+            if attempt == self.retries:
+                logger.error(f"Notification to {message['To']} failed: {error}")
+                break
+            delay = self.backoff * (2**attempt)
+            logger.debug(
+                f"Notification to {message['To']} failed ({error}); retrying in {delay:.2f}s"
+            )
+            if self._abandon.wait(delay):
+                break
+        self._count("failed")
+        return session, False
+
+
+def finish_notifications(
+    notifier: Optional[NotificationQueue],
+    timeout: float,
+    emitter: Optional[RecordEmitter] = None,
+    profiler: Optional[Profiler] = None,
+) -> None:
+    """Flush a command's notification queue and report what was delivered.
+
+    Args:
+        notifier: The queue to close; nothing happens if it is None
+        timeout: Seconds to wait for queued notifications
+        emitter: Emit a ``notifications`` record instead of styled text
+        profiler: Records the flush time and delivery counts
+    """
+    if notifier is None:
+        return
+    start = time.perf_counter()
+    stats = notifier.close(timeout)
+    if profiler is not None:
+        profiler.add_time("notify_flush", time.perf_counter() - start)
+        profiler.count("notifications_sent", stats.sent)
+        profiler.count("notifications_failed", stats.failed + stats.dropped)
+    if emitter is not None:
+        emitter.emit({"type": "notifications", **vars(stats)})
+        return
+    message = f"📧 Delivered {stats.sent} notification(s)"
+    if stats.failed or stats.dropped:
+        message += f" ({stats.failed} failed, {stats.dropped} not sent before the deadline)"
+        click.echo(click.style(message, fg="yellow"))
+    else:
+        click.echo(click.style(message, fg="blue"))
+
+
+def _connect(settings: SmtpSettings) -> smtplib.SMTP:
+    """Open an SMTP session, upgraded to certificate-checked TLS if configured, and log in."""
+    session = smtplib.SMTP(
+        settings.host,
+        settings.port,
+        local_hostname=settings.local_hostname,
+        timeout=settings.timeout,
+    )
+    try:
+        if settings.starttls:
+            session.starttls(context=ssl.create_default_context())
+        if settings.username:
+            session.login(settings.username, settings.password or "")
+    except BaseException:
+        session.close()
+        raise
+    return session
+
+
+def _quit(session: Optional[smtplib.SMTP]) -> None:
+    """Close a session politely, ignoring errors from a dead connection."""
+    if session is None:
+        return
+    try:
+        session.quit()
+    except (smtplib.SMTPException, OSError):
+        session.close()
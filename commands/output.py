@@ -0,0 +1,105 @@
+"""Machine-readable output for Fix-It CLI commands.
+
+Commands render decorated text by default. When the CLI is invoked with
+``--format json`` or ``--format ndjson`` they instead hand structured records
+to a :class:`RecordEmitter`, which serialises them without any styling work and
+writes them to the output stream in large buffered chunks.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, List, Optional, TextIO
+
+FORMATS = ("text", "json", "ndjson")
+
+Record = Dict[str, Any]
+
+
+class RecordEmitter:
+    """Buffered writer for structured command records.
+
+    ``ndjson`` writes one compact JSON object per line. ``json`` writes a single
+    JSON array; it is streamed element by element, so memory stays flat no
+    matter how many records a command produces.
+    """
+
+    def __init__(
+        self,
+        fmt: str = "ndjson",
+        stream: Optional[TextIO] = None,
+        buffer_size: int = 64 * 1024,
+    ) -> None:
+        if fmt not in ("json", "ndjson"):
+            raise ValueError(f"Unsupported record format: {fmt}")
+        import json
+
+        self.fmt = fmt
+        self._stream = stream
+        self._buffer_size = buffer_size
+        self._chunks: List[str] = []
+        self._pending = 0
+        self._count = 0
+        self._closed = False
+        self._encode = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode
+
+    @property
+    def count(self) -> int:
+        """Number of records emitted so far."""
+        return self._count
+
+    def emit(self, record: Record) -> None:
+        """Serialise a record and queue it for output."""
+        encoded = self._encode(record)
+        if self.fmt == "ndjson":
+            chunk = encoded + "\n"
+        elif self._count == 0:
+            chunk = "[\n" + encoded
+        else:
+            chunk = ",\n" + encoded
+        self._count += 1
+        self._chunks.append(chunk)
+        self._pending += len(chunk)
+        if self._pending >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued records to the output stream."""
+        if not self._chunks:
+            return
+        stream = self._stream
+        if stream is None:
+            stream = self._stream = sys.stdout
+        stream.write("".join(self._chunks))
+        stream.flush()
+        self._chunks = []
+        self._pending = 0
+
+    def close(self) -> None:
+        """Flush remaining records and terminate the JSON document if needed."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.fmt == "json":
+            self._chunks.append("\n]\n" if self._count else "[]\n")
+        self.flush()
+
+
+class RecordCollector(RecordEmitter):
+    """Emitter that keeps records in memory instead of writing them out."""
+
+    def __init__(self) -> None:
+        super().__init__("ndjson")
+        self.records: List[Record] = []
+
+    def emit(self, record: Record) -> None:
+        self.records.append(record)
+
+
+def get_emitter(fmt: str) -> Optional[RecordEmitter]:
+    """Return an emitter for a ``--format`` value, or None for styled text."""
+    if fmt == "text":
+        return None
+    return RecordEmitter(fmt)
@@ -0,0 +1,127 @@
+"""Stream command output into a pager.
+
+Text is pulled from a generator only as fast as the pager reads it: writes go
+straight into the pager's stdin pipe, so once the pipe is full the producer
+blocks and no further input is read or decompressed. Output is batched to keep
+syscalls down, but the first piece is sent at once and later batches at least
+every :data:`FLUSH_SECONDS`, so the first screen appears immediately.
+
+Producers may yield empty strings while they work without producing output;
+the pump uses them to notice that the pager has been quit. When it is, the
+generator is closed straight away, which closes whatever it was reading.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import click
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BYTES = 64 * 1024
+FLUSH_SECONDS = 0.05
+
+
+def _pager_command() -> Optional[Tuple[List[str], Dict[str, str]]]:
+    """Return the pager argv and environment, or None to write to stdout directly."""
+    if not sys.stdout.isatty():
+        return None
+    env = dict(os.environ)
+    configured = env.get("PAGER", "").strip()
+    argv = shlex.split(configured) if configured else ["less", "-R"]
+    if not argv or shutil.which(argv[0]) is None:
+        logger.debug(f"Pager {argv[:1]} not found; writing to stdout")
+        return None
+    if os.path.basename(argv[0]) == "less":
+        # Raw colours, exit if it all fits on one screen, keep it on screen after.
+        env.setdefault("LESS", "FRX")
+    return argv, env
+
+
+def _echo_all(chunks: Iterable[str]) -> bool:
+    for text in chunks:
+        if text:
+            click.echo(text, nl=False)
+    return True
+
+
+def page(chunks: Iterable[str]) -> bool:
+    """Show text in a pager, producing it lazily as the pager consumes it.
+
+    Falls back to plain output when stdout is not a terminal or no pager is
+    installed. Ctrl+C stops producing output but leaves the pager open on what
+    it already has.
+
+    Args:
+        chunks: Text to show, typically a generator of rendered lines
+
+    Returns:
+        True if all text was shown, False if the pager was quit first
+    """
+    command = _pager_command()
+    if command is None:
+        return _echo_all(chunks)
+    argv, env = command
+    try:
+        process = subprocess.Popen(argv, stdin=subprocess.PIPE, env=env)
+    except OSError as e:
+        logger.warning(f"Could not start pager {argv[0]}: {e}")
+        return _echo_all(chunks)
+
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    pipe = process.stdin
+    assert pipe is not None
+    iterator = iter(chunks)
+    batch: List[bytes] = []
+    pending = 0
+    last_flush = 0.0
+    finished = False
+    try:
+        for text in iterator:
+            if text:
+                data = text.encode(encoding, errors="replace")
+                batch.append(data)
+                pending += len(data)
+            now = time.monotonic()
+            if pending and (pending >= FLUSH_BYTES or now - last_flush >= FLUSH_SECONDS):
+                pipe.write(b"".join(batch))
+                pipe.flush()
+                batch = []
+                pending = 0
+                last_flush = now
+            elif not text and process.poll() is not None:
+                break
+        else:
+            if batch:
+                pipe.write(b"".join(batch))
+            finished = True
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+    except Exception:
+        # Close the pager so the error is not hidden behind it.
+        process.terminate()
+        raise
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+        try:
+            pipe.close()
+        except BrokenPipeError:
+            pass
+        while True:
+            try:
+                process.wait()
+            except KeyboardInterrupt:
+                # less handles Ctrl+C itself; wait for the user to quit it.
+                continue
+            break
+    return finished
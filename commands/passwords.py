@@ -0,0 +1,197 @@
+"""High-throughput password generation.
+
+Passwords are drawn from the operating system CSPRNG (the same source as the
+``secrets`` module) in large blocks rather than one call per character. Each
+block is mapped onto the alphabet with rejection sampling: bytes that would
+make ``byte % len(alphabet)`` uneven are discarded, so every character is
+chosen uniformly. The mapping runs through ``bytes.translate``, which keeps
+the per-character work in C.
+"""
+
+from __future__ import annotations
+
+import secrets
+import string
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from commands.exceptions import UserInputError
+
+DEFAULT_SYMBOLS = "!@#$%^&*"
+AMBIGUOUS_CHARACTERS = "Il1O0o|`'\""
+MAX_BLOCK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class PasswordPolicy:
+    """Constraints applied to generated passwords.
+
+    Attributes:
+        min_lowercase: Minimum number of lowercase letters
+        min_uppercase: Minimum number of uppercase letters
+        min_digits: Minimum number of digits
+        min_symbols: Minimum number of symbols
+        symbols: Symbol characters to draw from (empty disables symbols)
+        exclude_ambiguous: Drop look-alike characters such as ``l``, ``1`` and ``O``
+    """
+
+    min_lowercase: int = 0
+    min_uppercase: int = 0
+    min_digits: int = 0
+    min_symbols: int = 0
+    symbols: str = DEFAULT_SYMBOLS
+    exclude_ambiguous: bool = False
+
+    def classes(self) -> List[Tuple[str, int]]:
+        """Return (characters, minimum) for each enabled character class."""
+        classes = [
+            (string.ascii_lowercase, self.min_lowercase),
+            (string.ascii_uppercase, self.min_uppercase),
+            (string.digits, self.min_digits),
+            (self.symbols, self.min_symbols),
+        ]
+        if self.exclude_ambiguous:
+            classes = [
+                ("".join(c for c in chars if c not in AMBIGUOUS_CHARACTERS), minimum)
+                for chars, minimum in classes
+            ]
+        return classes
+
+    def alphabet(self) -> str:
+        """Return every character a password may contain, without duplicates."""
+        return "".join(dict.fromkeys("".join(chars for chars, _ in self.classes())))
+
+
+class _CharacterStream:
+    """Uniform characters from a fixed ASCII alphabet, drawn in blocks."""
+
+    def __init__(self, alphabet: str, block_size: int) -> None:
+        size = len(alphabet)
+        limit = 256 - 256 % size
+        self._table = bytes(ord(alphabet[b % size]) if b < limit else 0 for b in range(256))
+        self._rejected = bytes(range(limit, 256))
+        self._block_size = block_size
+        self._buffer = b""
+        self._offset = 0
+
+    def take(self, count: int) -> str:
+        """Return ``count`` uniformly chosen characters."""
+        while len(self._buffer) - self._offset < count:
+            block = secrets.token_bytes(self._block_size)
+            fresh = block.translate(self._table, self._rejected)
+            self._buffer = self._buffer[self._offset :] + fresh
+            self._offset = 0
+        start = self._offset
+        self._offset += count
+        return self._buffer[start : self._offset].decode("ascii")
+
+
+class _IndexStream:
+    """Uniform integers below small bounds, drawn from buffered random bytes."""
+
+    def __init__(self, block_size: int) -> None:
+        self._block_size = block_size
+        self._buffer = b""
+        self._offset = 0
+
+    def below(self, bound: int) -> int:
+        """Return a uniform integer in ``range(bound)`` for ``bound <= 256``."""
+        limit = 256 - 256 % bound
+        while True:
+            if self._offset >= len(self._buffer):
+                self._buffer = secrets.token_bytes(self._block_size)
+                self._offset = 0
+            value = self._buffer[self._offset]
+            self._offset += 1
+            if value < limit:
+                return value % bound
+
+
+def _validate(count: int, length: int, policy: PasswordPolicy) -> None:
+    """Reject arguments that cannot produce a password.
+
+    Raises:
+        UserInputError: If the count, length or policy is invalid
+    """
+    if count < 0:
+        raise UserInputError("Password count cannot be negative")
+    if length < 1:
+        raise UserInputError("Password length must be at least 1")
+    classes = policy.classes()
+    if any(minimum < 0 for _, minimum in classes):
+        raise UserInputError("Password policy minimums cannot be negative")
+    if any(minimum and not chars for chars, minimum in classes):
+        raise UserInputError("Password policy requires a character class that is empty")
+    if sum(minimum for _, minimum in classes) > length:
+        raise UserInputError(f"Password policy requires more characters than the length ({length})")
+    alphabet = policy.alphabet()
+    if not alphabet:
+        raise UserInputError("Password policy leaves no characters to choose from")
+    if not alphabet.isascii():
+        raise UserInputError("Password policy characters must be ASCII")
+    if length > 256 and any(minimum for _, minimum in classes):
+        raise UserInputError("Passwords with class minimums are limited to 256 characters")
+
+
+def generate_passwords(
+    count: int,
+    length: int = 12,
+    policy: Optional[PasswordPolicy] = None,
+) -> Iterator[str]:
+    """Lazily generate ``count`` random passwords.
+
+    Characters not claimed by a class minimum are drawn uniformly from the
+    whole policy alphabet. When the policy has minimums, the required
+    characters are drawn from their classes and moved to uniformly random
+    positions with an unbiased Fisher-Yates pass, so no password is ever
+    regenerated.
+
+    Args:
+        count: Number of passwords to generate
+        length: Length of each password
+        policy: Character constraints (defaults to letters, digits and symbols)
+
+    Returns:
+        An iterator producing the passwords one at a time
+
+    Raises:
+        UserInputError: If the count, length or policy is invalid
+    """
+    policy = policy or PasswordPolicy()
+    _validate(count, length, policy)
+    return _generate(count, length, policy)
+
+
+def _generate(count: int, length: int, policy: PasswordPolicy) -> Iterator[str]:
+    """Generator body of :func:`generate_passwords` for validated arguments."""
+    if count == 0:
+        return
+
+    required = [(chars, minimum) for chars, minimum in policy.classes() if minimum]
+    free = length - sum(minimum for _, minimum in required)
+    # Size the random blocks to the job so a single password does not read 64 KiB.
+    block_size = min(MAX_BLOCK_SIZE, max(64, 2 * count * length))
+    stream = _CharacterStream(policy.alphabet(), block_size)
+
+    if not required:
+        for _ in range(count):
+            yield stream.take(length)
+        return
+
+    class_streams = [
+        (_CharacterStream(chars, max(64, block_size // 4)), minimum) for chars, minimum in required
+    ]
+    indexes = _IndexStream(block_size)
+    placed = length - free
+    for _ in range(count):
+        chars: List[str] = []
+        for class_stream, minimum in class_streams:
+            chars.extend(class_stream.take(minimum))
+        chars.extend(stream.take(free))
+        # The free characters are independent and identically distributed, so
+        # only the required ones need uniformly random positions: a partial
+        # Fisher-Yates pass over them gives the same distribution as a full one.
+        for i in range(placed):
+            j = i + indexes.below(length - i)
+            chars[i], chars[j] = chars[j], chars[i]
+        yield "".join(chars)
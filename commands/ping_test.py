@@ -6,16 +6,36 @@ import logging
 import platform
 import subprocess
 import time
-from typing import Optional
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Optional
 
 import click
 
 from commands.exceptions import NetworkError, UserInputError
 
+if TYPE_CHECKING:
+    from commands.output import RecordEmitter
+    from commands.profiling import Profiler
+
 logger = logging.getLogger(__name__)
 
 
-def ping_test(host: str, count: int = 4, timeout: int = 2, verbose: bool = False) -> None:
+def _extract_stats(output: str) -> Optional[str]:
+    """Return the packet statistics line from ping output, if present."""
+    for line in output.split('\n'):
+        if 'packets transmitted' in line.lower() or 'packets:' in line.lower():
+            return line.strip()
+    return None
+
+
+def ping_test(
+    host: str,
+    count: int = 4,
+    timeout: int = 2,
+    verbose: bool = False,
+    emitter: Optional[RecordEmitter] = None,
+    profiler: Optional[Profiler] = None,
+) -> None:
     """Test network connectivity to a host.
     
     Args:
@@ -23,6 +43,8 @@ def ping_test(host: str, count: int = 4, timeout: int = 2, verbose: bool = False
         count: Number of pings to send
         timeout: Timeout in seconds
         verbose: Show detailed output
+        emitter: Emit a structured result record instead of styled text
+        profiler: Record time spent waiting on the ping subprocess
         
     Raises:
         UserInputError: If host is invalid or empty
@@ -34,8 +56,9 @@ def ping_test(host: str, count: int = 4, timeout: int = 2, verbose: bool = False
     host = host.strip()
     logger.info(f"Ping test requested for host: {host} (count={count}, timeout={timeout})")
     
-    click.echo(f"\n🌐 Network Connectivity Test: {click.style(host, fg='cyan', bold=True)}")
-    click.echo("─" * 60)
+    if emitter is None:
+        click.echo(f"\n🌐 Network Connectivity Test: {click.style(host, fg='cyan', bold=True)}")
+        click.echo("─" * 60)
     
     # Check if ping command is available
     try:
@@ -47,7 +70,7 @@ def ping_test(host: str, count: int = 4, timeout: int = 2, verbose: bool = False
         else:
             ping_cmd = ['ping', '-c', str(count), '-W', str(timeout), host]
         
-        if verbose:
+        if verbose and emitter is None:
             click.echo(f"Running: {' '.join(ping_cmd)}")
             click.echo()
         
@@ -55,28 +78,47 @@ def ping_test(host: str, count: int = 4, timeout: int = 2, verbose: bool = False
         
         # Execute ping
         start_time = time.time()
-        result = subprocess.run(
-            ping_cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout * count + 5
-        )
+        with profiler.phase("subprocess_wait") if profiler is not None else nullcontext():
+            result = subprocess.run(
+                ping_cmd,
+                capture_output=True,
+                text=True,
+                timeout=timeout * count + 5
+            )
         elapsed = time.time() - start_time
+        if profiler is not None:
+            profiler.count("pings_sent", count)
         
         logger.debug(f"Ping completed with return code {result.returncode} in {elapsed:.2f}s")
         
+        reachable = result.returncode == 0
+        if not reachable:
+            logger.warning(f"Host {host} is unreachable (return code: {result.returncode})")
+        
+        if emitter is not None:
+            record = {
+                "type": "ping",
+                "host": host,
+                "reachable": reachable,
+                "returncode": result.returncode,
+                "count": count,
+                "timeout": timeout,
+                "stats": _extract_stats(result.stdout) if reachable else None,
+                "elapsed": round(elapsed, 6),
+            }
+            if verbose:
+                record["command"] = ping_cmd
+                record["stdout"] = result.stdout
+                record["stderr"] = result.stderr
+            emitter.emit(record)
+            return
+        
         # Parse results
-        if result.returncode == 0:
+        if reachable:
             click.echo(click.style("✅ Host is reachable!", fg='green', bold=True))
             
             # Try to extract some stats from output
-            output_lines = result.stdout.split('\n')
-            stats_line = None
-            for line in output_lines:
-                if 'packets transmitted' in line.lower() or 'packets:' in line.lower():
-                    stats_line = line.strip()
-                    break
-            
+            stats_line = _extract_stats(result.stdout)
             if stats_line:
                 click.echo(f"   {stats_line}")
             
@@ -84,8 +126,6 @@ def ping_test(host: str, count: int = 4, timeout: int = 2, verbose: bool = False
                 click.echo("\nFull output:")
                 click.echo(result.stdout)
         else:
-            error_msg = f"Host {host} is unreachable (return code: {result.returncode})"
-            logger.warning(error_msg)
             click.echo(click.style("❌ Host is unreachable!", fg='red', bold=True))
             click.echo(f"   Return code: {result.returncode}")
             
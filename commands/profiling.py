@@ -0,0 +1,294 @@
+"""Per-phase timers and counters for ``fixit --profile``.
+
+Commands accept an optional :class:`Profiler` and record phases only at
+coarse boundaries (opening a file, rendering output, waiting on a
+subprocess), never per line, so a run without ``--profile`` pays for nothing
+but a few ``is None`` checks. Log reads are the exception: with a profiler,
+the file is opened through :meth:`Profiler.open_log`, which times raw reads
+and decompression separately from line scanning.
+
+At exit the report is rendered as a table, JSON, or a Prometheus textfile
+(for node_exporter's textfile collector). ``cProfile`` and ``tracemalloc``
+can be layered on for function-level and allocation detail.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Protocol
+
+REPORT_FORMATS = ("table", "json", "prometheus")
+TOP_ENTRIES = 15
+
+
+class _Readable(Protocol):
+    """A binary stream that fills buffers, such as a raw file or a GzipFile."""
+
+    def readinto(self, __buffer: Any) -> Optional[int]: ...
+
+    def close(self) -> None: ...
+
+
+class _TimedReader(io.RawIOBase):
+    """Raw stream that measures time spent in, and bytes returned by, another stream."""
+
+    def __init__(self, inner: _Readable) -> None:
+        self._inner = inner
+        self.seconds = 0.0
+        self.bytes = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        start = time.perf_counter()
+        count = self._inner.readinto(buffer) or 0
+        self.seconds += time.perf_counter() - start
+        self.bytes += count
+        return count
+
+    def close(self) -> None:
+        if not self.closed:
+            self._inner.close()
+        super().close()
+
+
+class _ProfiledLog:
+    """Text handle over a log file whose layers are timed individually.
+
+    Time inside the ``with`` block that is not spent reading or decompressing
+    is attributed to ``scan`` (decoding, splitting and filtering lines).
+    """
+
+    def __init__(self, profiler: "Profiler", path: Path, gzipped: bool) -> None:
+        self._profiler = profiler
+        self._raw = _TimedReader(open(path, "rb", buffering=0))
+        self._inflated: Optional[_TimedReader] = None
+        source: IO[bytes] = io.BufferedReader(self._raw)
+        if gzipped:
+            import gzip
+
+            self._inflated = _TimedReader(gzip.GzipFile(fileobj=source, mode="rb"))
+            source = io.BufferedReader(self._inflated)
+        self._text = io.TextIOWrapper(source, encoding="utf-8", errors="ignore")
+        self._start = 0.0
+
+    def __enter__(self) -> IO[str]:
+        self._start = time.perf_counter()
+        return self._text
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = time.perf_counter() - self._start
+        self._text.close()
+        # GzipFile does not close the stream it wraps.
+        self._raw.close()
+        profiler = self._profiler
+        profiler.add_time("read", self._raw.seconds)
+        profiler.count("bytes_read", self._raw.bytes)
+        inner = self._raw.seconds
+        if self._inflated is not None:
+            profiler.add_time("decompress", self._inflated.seconds - self._raw.seconds)
+            profiler.count("bytes_decompressed", self._inflated.bytes)
+            inner = self._inflated.seconds
+        profiler.add_time("scan", elapsed - inner)
+
+
+class Profiler:
+    """Collects phase timings and counters for one command run.
+
+    Safe to share between threads (bulk resets and ``fixit run`` jobs record
+    from worker threads); phase times from concurrent workers add up, so they
+    can exceed the wall-clock time.
+
+    Args:
+        command: Name of the command being profiled, used as a report label
+        python: Also run cProfile over the whole command
+        memory: Also trace allocations with tracemalloc
+    """
+
+    def __init__(self, command: str = "", python: bool = False, memory: bool = False) -> None:
+        self.command = command
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._start = 0.0
+        self.wall = 0.0
+        self._python = None
+        self._memory = memory
+        self.memory_peak: Optional[int] = None
+        self._memory_top: List[Dict[str, Any]] = []
+        self._python_top: List[Dict[str, Any]] = []
+        if python:
+            import cProfile
+
+            self._python = cProfile.Profile()
+
+    def start(self) -> None:
+        """Start the wall clock and any optional tracers."""
+        if self._memory:
+            import tracemalloc
+
+            tracemalloc.start()
+        if self._python is not None:
+            self._python.enable()
+        self._start = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop the wall clock and collect results from the optional tracers."""
+        self.wall = time.perf_counter() - self._start
+        if self._python is not None:
+            self._python.disable()
+            self._python_top = _top_functions(self._python)
+        if self._memory:
+            import tracemalloc
+
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self._memory_top = [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "bytes": stat.size,
+                    "blocks": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[:TOP_ENTRIES]
+            ]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the ``with`` block and add it to phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def open_log(self, path: Path, gzipped: bool) -> _ProfiledLog:
+        """Open a log for reading with read, decompress and scan timed separately."""
+        return _ProfiledLog(self, path, gzipped)
+
+    def as_dict(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {
+            "command": self.command,
+            "wall_seconds": round(self.wall, 6),
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+        if self._python is not None:
+            report["functions"] = self._python_top
+        if self.memory_peak is not None:
+            report["memory"] = {"peak_bytes": self.memory_peak, "top": self._memory_top}
+        return report
+
+    def render(self, fmt: str = "table") -> str:
+        """Return the report in one of :data:`REPORT_FORMATS`."""
+        if fmt == "json":
+            import json
+
+            return json.dumps(self.as_dict(), indent=2) + "\n"
+        if fmt == "prometheus":
+            return self._render_prometheus()
+        return self._render_table()
+
+    def _render_table(self) -> str:
+        lines = [f"⏱️  Profile: {self.command or 'fixit'} took {self.wall:.3f}s"]
+        if self.phases:
+            lines.append(f"   {'Phase':<24}{'Seconds':>12}{'Share':>9}")
+            for name, seconds in sorted(self.phases.items(), key=lambda item: -item[1]):
+                share = seconds / self.wall if self.wall else 0.0
+                lines.append(f"   {name:<24}{seconds:>12.4f}{share:>9.1%}")
+        if self.counters:
+            lines.append(f"   {'Counter':<24}{'Value':>12}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"   {name:<24}{value:>12,}")
+        if self.memory_peak is not None:
+            lines.append(f"   Peak traced memory: {self.memory_peak / 1e6:.2f} MB")
+            for entry in self._memory_top:
+                lines.append(f"   {entry['bytes'] / 1e3:>10.1f} KB  {entry['location']}")
+        if self._python_top:
+            lines.append(f"   {'Calls':>10}{'Cumulative':>12}{'Own':>10}  Function")
+            for entry in self._python_top:
+                lines.append(
+                    f"   {entry['calls']:>10}{entry['cumulative']:>12.4f}"
+                    f"{entry['own']:>10.4f}  {entry['function']}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def _render_prometheus(self) -> str:
+        label = f'command="{_escape(self.command)}"'
+        lines = [
+            "# HELP fixit_run_seconds Wall-clock time of the last fixit run.",
+            "# TYPE fixit_run_seconds gauge",
+            f"fixit_run_seconds{{{label}}} {self.wall:.6f}",
+            "# HELP fixit_phase_seconds Time spent in each phase of the last fixit run.",
+            "# TYPE fixit_phase_seconds gauge",
+        ]
+        for name, seconds in sorted(self.phases.items()):
+            lines.append(f'fixit_phase_seconds{{{label},phase="{_escape(name)}"}} {seconds:.6f}')
+        lines += [
+            "# HELP fixit_counter Counters recorded during the last fixit run.",
+            "# TYPE fixit_counter gauge",
+        ]
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'fixit_counter{{{label},counter="{_escape(name)}"}} {value}')
+        if self.memory_peak is not None:
+            lines += [
+                "# HELP fixit_peak_traced_memory_bytes Peak memory traced by tracemalloc.",
+                "# TYPE fixit_peak_traced_memory_bytes gauge",
+                f"fixit_peak_traced_memory_bytes{{{label}}} {self.memory_peak}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _top_functions(profile: Any) -> List[Dict[str, Any]]:
+    """Return the functions with the highest cumulative time."""
+    import pstats
+
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():  # type: ignore[attr-defined]
+        rows.append(
+            {
+                "function": f"{name} ({os.path.basename(filename)}:{line})",
+                "calls": calls,
+                "own": round(own, 6),
+                "cumulative": round(cumulative, 6),
+            }
+        )
+    rows.sort(key=lambda row: -row["cumulative"])
+    return rows[:TOP_ENTRIES]
+
+
+def write_report(text: str, path: Optional[str]) -> None:
+    """Write a report to ``path`` atomically, or to stderr when no path is given.
+
+    The file is replaced in one step, so textfile collectors never read a
+    partial report.
+    """
+    if path is None:
+        import sys
+
+        sys.stderr.write(text)
+        sys.stderr.flush()
+        return
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(partial, path)
@@ -3,44 +3,96 @@
 from __future__ import annotations
 
 import logging
-import secrets
-import string
+import os
+import sys
 import time
+from contextlib import nullcontext
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, TextIO
 
 import click
 
-from commands.exceptions import UserInputError
+from commands.exceptions import DirectoryError, UserInputError
+from commands.passwords import PasswordPolicy, generate_passwords
+
+if TYPE_CHECKING:
+    from commands.directory import DirectoryBackend
+    from commands.notify import NotificationQueue
+    from commands.output import RecordEmitter
+    from commands.profiling import Profiler
 
 logger = logging.getLogger(__name__)
 
+# Reset passwords always mix letter cases and digits, like most directory policies require.
+RESET_POLICY = PasswordPolicy(min_lowercase=1, min_uppercase=1, min_digits=1)
+
+RESULT_FIELDS = ("username", "email", "status", "password", "timestamp", "error")
+MAX_REPORTED_ERRORS = 10
+
+
+@dataclass(frozen=True)
+class ResetRequest:
+    """A single account in a bulk reset batch."""
+
+    username: str
+    email: Optional[str] = None
+    line: int = 0
+
+
+@dataclass
+class ResetResult:
+    """Outcome of resetting one account."""
+
+    username: str
+    email: Optional[str]
+    status: str
+    password: Optional[str] = None
+    timestamp: Optional[str] = None
+    error: Optional[str] = None
+
 
 def generate_password(length: int = 12) -> str:
     """Generate a random password.
     
+    The password contains at least one lowercase letter, uppercase letter and
+    digit (for lengths of 3 or more).
+    
     Args:
         length: Length of the password to generate
         
     Returns:
         A randomly generated password string
     """
-    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-    password = ''.join(secrets.choice(alphabet) for _ in range(length))
+    policy = RESET_POLICY if length >= 3 else None
+    password = next(generate_passwords(1, length, policy))
     logger.debug(f"Generated password of length {length}")
     return password
 
 
-def reset_user(username: str, force: bool = False, email: Optional[str] = None) -> None:
-    """Simulate resetting a user's password.
+def reset_user(
+    username: str,
+    force: bool = False,
+    email: Optional[str] = None,
+    emitter: Optional[RecordEmitter] = None,
+    directory: Optional[DirectoryBackend] = None,
+    notifier: Optional[NotificationQueue] = None,
+    profiler: Optional[Profiler] = None,
+) -> None:
+    """Reset a user's password (simulated unless a directory is given).
     
     Args:
         username: The username to reset
         force: Skip confirmation prompt
         email: Optional email to send notification to
+        emitter: Emit a structured result record instead of styled text
+        directory: Account directory to store the new password in (simulated if omitted)
+        notifier: Queue that delivers the email notification in the background
+        profiler: Record generate, directory write and render timings
         
     Raises:
         UserInputError: If username is invalid or empty
+        DirectoryError: If the account is missing or the directory update fails
     """
     if not username or not username.strip():
         raise UserInputError("Username cannot be empty")
@@ -48,27 +100,62 @@ def reset_user(username: str, force: bool = False, email: Optional[str] = None)
     username = username.strip()
     logger.info(f"Password reset requested for user: {username}")
     
-    click.echo(f"\n🔐 Password Reset Request for: {click.style(username, fg='cyan', bold=True)}")
-    click.echo("─" * 60)
+    if emitter is None:
+        click.echo(f"\n🔐 Password Reset Request for: {click.style(username, fg='cyan', bold=True)}")
+        click.echo("─" * 60)
     
-    # Confirmation (unless forced)
+    # Confirmation (unless forced). Machine-readable runs prompt on stderr so
+    # stdout stays a clean record stream.
     if not force:
-        if not click.confirm(f"Are you sure you want to reset password for '{username}'?"):
-            click.echo(click.style("❌ Password reset cancelled.", fg='yellow'))
+        prompt = f"Are you sure you want to reset password for '{username}'?"
+        if not click.confirm(prompt, err=emitter is not None):
             logger.info(f"Password reset cancelled by user for: {username}")
+            if emitter is not None:
+                emitter.emit({"type": "reset", "username": username, "status": "cancelled"})
+            else:
+                click.echo(click.style("❌ Password reset cancelled.", fg='yellow'))
             return
     
     # Simulate processing
     logger.debug("Processing password reset...")
-    with click.progressbar(range(3), label='Processing reset request') as bar:
-        for _ in bar:
-            time.sleep(0.3)
+    if emitter is None:
+        with profiler.phase("render") if profiler is not None else nullcontext():
+            with click.progressbar(range(3), label='Processing reset request') as bar:
+                for _ in bar:
+                    time.sleep(0.3)
     
     # Generate new password
-    new_password = generate_password()
+    with profiler.phase("generate") if profiler is not None else nullcontext():
+        new_password = generate_password()
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
+    if directory is not None:
+        with profiler.phase("directory_write") if profiler is not None else nullcontext():
+            missing = directory.set_passwords([(username, new_password)])
+        if missing:
+            raise DirectoryError(f"User not found in directory: {username}")
+    
     logger.info(f"Password reset successful for user: {username}")
+    if profiler is not None:
+        profiler.count("accounts_reset")
+    
+    if email and notifier is not None:
+        notifier.notify_reset(username, email)
+        logger.debug(f"Email notification queued for: {email}")
+    elif email:
+        logger.debug(f"Email notification would be sent to: {email}")
+    
+    if emitter is not None:
+        emitter.emit({
+            "type": "reset",
+            "username": username,
+            "status": "reset",
+            "password": new_password,
+            "timestamp": timestamp,
+            "email": email,
+            "notified": bool(email),
+        })
+        return
     
     # Display results
     click.echo("\n" + click.style("✅ Password Reset Successful!", fg='green', bold=True))
@@ -76,8 +163,9 @@ def reset_user(username: str, force: bool = False, email: Optional[str] = None)
     click.echo(f"   New Password: {click.style(new_password, fg='yellow', bold=True)}")
     click.echo(f"   Reset Time: {timestamp}")
     
-    if email:
-        logger.debug(f"Email notification would be sent to: {email}")
+    if email and notifier is not None:
+        click.echo(f"\n📧 Notification queued for: {click.style(email, fg='blue')}")
+    elif email:
         click.echo(f"\n📧 Notification sent to: {click.style(email, fg='blue')}")
         click.echo("   (In a real system, this would actually send an email)")
     else:
@@ -87,3 +175,296 @@ def reset_user(username: str, force: bool = False, email: Optional[str] = None)
     
     click.echo("\n" + click.style("💡 Pro Tip:", fg='magenta') + " Tell the user to change this password immediately!")
     click.echo("─" * 60 + "\n")
+
+
+def _has_control_chars(value: str) -> bool:
+    """Whether value contains characters that are unsafe in files and mail headers."""
+    return any(ord(char) < 32 or ord(char) == 127 for char in value)
+
+
+def read_reset_requests(rows: Iterable[str], source: str = "input") -> List[ResetRequest]:
+    """Parse and validate a bulk reset batch.
+    
+    The input is CSV with a ``username`` column and an optional ``email``
+    column. A header row is optional; without one the first column is the
+    username and the second the email. Blank lines and ``#`` comments are
+    skipped. Every row is validated before anything is reset.
+    
+    Args:
+        rows: Lines of CSV text
+        source: Name of the input, used in error messages
+        
+    Returns:
+        The validated reset requests, in input order
+        
+    Raises:
+        UserInputError: If any row is invalid, listing the offending lines
+    """
+    import csv
+    
+    requests: List[ResetRequest] = []
+    errors: List[str] = []
+    seen: Dict[str, int] = {}
+    username_col, email_col = 0, 1
+    header_checked = False
+    
+    reader = csv.reader(rows)
+    for row in reader:
+        line = reader.line_num
+        if not row or not any(cell.strip() for cell in row) or row[0].lstrip().startswith('#'):
+            continue
+        if not header_checked:
+            header_checked = True
+            header = [cell.strip().lower() for cell in row]
+            # Only a row made of exactly the known column names is a header, so
+            # an account called e.g. "usernames" is still reset.
+            if "username" in header and sorted(header) in (["username"], ["email", "username"]):
+                username_col = header.index("username")
+                email_col = header.index("email") if "email" in header else -1
+                continue
+        
+        username = row[username_col].strip() if username_col < len(row) else ""
+        email = row[email_col].strip() if 0 <= email_col < len(row) else ""
+        if not username:
+            errors.append(f"line {line}: username cannot be empty")
+            continue
+        if _has_control_chars(username) or _has_control_chars(email):
+            errors.append(f"line {line}: control characters in entry for {username!r}")
+            continue
+        if username in seen:
+            errors.append(f"line {line}: duplicate username '{username}' (first on line {seen[username]})")
+            continue
+        if email and ('@' not in email or email.startswith('@') or email.endswith('@')):
+            errors.append(f"line {line}: invalid email '{email}' for '{username}'")
+            continue
+        seen[username] = line
+        requests.append(ResetRequest(username, email or None, line))
+    
+    if errors:
+        shown = errors[:MAX_REPORTED_ERRORS]
+        if len(errors) > len(shown):
+            shown.append(f"... and {len(errors) - len(shown)} more")
+        raise UserInputError(f"Invalid entries in {source}:\n  " + "\n  ".join(shown))
+    if not requests:
+        raise UserInputError(f"No usernames found in {source}")
+    
+    logger.debug(f"Loaded {len(requests)} reset requests from {source}")
+    return requests
+
+
+def _open_results_file(results_path: str) -> TextIO:
+    """Create the results file readable only by the current user.
+    
+    Raises:
+        UserInputError: If the file already exists or cannot be created
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    try:
+        fd = os.open(results_path, flags, 0o600)
+    except FileExistsError as e:
+        raise UserInputError(f"Results file already exists: {results_path}") from e
+    except OSError as e:
+        raise UserInputError(f"Cannot create results file {results_path}: {e.strerror}") from e
+    return os.fdopen(fd, 'w', encoding='utf-8', newline='')
+
+
+def _reset_chunk(
+    chunk: Sequence[ResetRequest],
+    directory: Optional[DirectoryBackend],
+    profiler: Optional[Profiler] = None,
+) -> List[ResetResult]:
+    """Reset a chunk of accounts in one directory write; runs on a worker thread."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with profiler.phase("generate") if profiler is not None else nullcontext():
+        updates = [
+            (request.username, password)
+            for request, password in zip(chunk, generate_passwords(len(chunk), policy=RESET_POLICY))
+        ]
+    try:
+        with profiler.phase("directory_write") if profiler is not None else nullcontext():
+            missing = set(directory.set_passwords(updates)) if directory is not None else set()
+    except DirectoryError as e:
+        logger.error(f"Directory update failed for {len(chunk)} accounts: {e}")
+        return [ResetResult(r.username, r.email, "failed", error=str(e)) for r in chunk]
+    return [
+        ResetResult(request.username, request.email, "failed", error="not found in directory")
+        if request.username in missing
+        else ResetResult(request.username, request.email, "reset", password, timestamp)
+        for request, (_, password) in zip(chunk, updates)
+    ]
+
+
+def reset_users(
+    requests: Sequence[ResetRequest],
+    results_path: str,
+    force: bool = False,
+    workers: int = 8,
+    source: str = "input",
+    emitter: Optional[RecordEmitter] = None,
+    directory: Optional[DirectoryBackend] = None,
+    batch_size: int = 500,
+    notifier: Optional[NotificationQueue] = None,
+    profiler: Optional[Profiler] = None,
+) -> List[ResetResult]:
+    """Reset a batch of accounts through a worker pool.
+    
+    Accounts are reset in chunks of ``batch_size``; each chunk is a single
+    directory write. New passwords are written only to ``results_path``, which
+    is created with owner-only permissions; the terminal gets an aggregate
+    summary.
+    
+    Args:
+        requests: Validated requests from :func:`read_reset_requests`
+        results_path: CSV file to stream per-user results to (must not exist)
+        force: Skip the batch confirmation prompt
+        workers: Number of worker threads
+        source: Name of the input, used in messages
+        emitter: Emit a structured summary record instead of styled text
+        directory: Account directory to store new passwords in (simulated if omitted)
+        batch_size: Accounts per directory write
+        notifier: Queue that delivers email notifications in the background
+        profiler: Record generate, directory write and results write timings
+        
+    Returns:
+        The per-user results, without passwords
+        
+    Raises:
+        UserInputError: If the arguments or results file are invalid
+    """
+    if workers < 1:
+        raise UserInputError("Workers must be at least 1")
+    if batch_size < 1:
+        raise UserInputError("Batch size must be at least 1")
+    if os.path.lexists(results_path):
+        raise UserInputError(f"Results file already exists: {results_path}")
+    
+    import csv
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    total = len(requests)
+    logger.info(f"Bulk password reset requested for {total} accounts from {source}")
+    
+    if emitter is None:
+        click.echo(
+            f"\n📦 Bulk Password Reset: {click.style(str(total), fg='cyan', bold=True)} accounts from {source}"
+        )
+        click.echo("─" * 60)
+    
+    if not force:
+        if not click.confirm(f"Reset passwords for {total} accounts?", err=emitter is not None):
+            logger.info("Bulk password reset cancelled by user")
+            if emitter is not None:
+                emitter.emit({"type": "bulk_reset", "status": "cancelled", "requested": total})
+            else:
+                click.echo(click.style("❌ Bulk password reset cancelled.", fg='yellow'))
+            return []
+    
+    chunk_size = max(1, min(batch_size, -(-total // workers)))
+    chunks = [requests[i:i + chunk_size] for i in range(0, total, chunk_size)]
+    results: List[ResetResult] = []
+    start_time = time.perf_counter()
+    
+    with _open_results_file(results_path) as results_file:
+        writer = csv.writer(results_file)
+        writer.writerow(RESULT_FIELDS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_reset_chunk, chunk, directory, profiler) for chunk in chunks]
+            progress = None
+            if emitter is None:
+                progress = click.progressbar(length=total, label='Processing reset requests')
+            with progress if progress is not None else nullcontext():
+                for future in as_completed(futures):
+                    chunk_results = future.result()
+                    with profiler.phase("results_write") if profiler is not None else nullcontext():
+                        writer.writerows(
+                            (r.username, r.email or "", r.status, r.password or "", r.timestamp or "", r.error or "")
+                            for r in chunk_results
+                        )
+                    for r in chunk_results:
+                        r.password = None
+                        if notifier is not None and r.email and r.status == "reset":
+                            notifier.notify_reset(r.username, r.email)
+                    results.extend(chunk_results)
+                    if progress is not None:
+                        progress.update(len(chunk_results))
+    
+    elapsed = time.perf_counter() - start_time
+    succeeded = sum(1 for r in results if r.status == "reset")
+    failed = total - succeeded
+    notified = sum(1 for r in results if r.status == "reset" and r.email)
+    if profiler is not None:
+        profiler.count("accounts_reset", succeeded)
+        profiler.count("accounts_failed", failed)
+    logger.info(f"Bulk password reset finished: {succeeded} reset, {failed} failed in {elapsed:.2f}s")
+    
+    if emitter is not None:
+        emitter.emit({
+            "type": "bulk_reset",
+            "status": "complete",
+            "requested": total,
+            "reset": succeeded,
+            "failed": failed,
+            "notified": notified,
+            "results_file": results_path,
+            "elapsed": round(elapsed, 6),
+        })
+        return results
+    
+    status_style = 'green' if not failed else 'yellow'
+    click.echo("\n" + click.style("✅ Bulk Password Reset Complete!", fg=status_style, bold=True))
+    click.echo(f"   Accounts reset: {succeeded}")
+    click.echo(f"   Failed: {failed}")
+    click.echo(f"   Notifications: {notified}")
+    click.echo(f"   Results file: {results_path}")
+    click.echo(f"   Completed in {elapsed:.2f} seconds")
+    click.echo(
+        "\n" + click.style("🔒 Note:", fg='magenta')
+        + " New passwords are only written to the results file. Guard it carefully!"
+    )
+    click.echo("─" * 60 + "\n")
+    return results
+
+
+def bulk_reset(
+    from_file: str,
+    results_path: Optional[str],
+    force: bool = False,
+    workers: int = 8,
+    emitter: Optional[RecordEmitter] = None,
+    directory: Optional[DirectoryBackend] = None,
+    batch_size: int = 500,
+    notifier: Optional[NotificationQueue] = None,
+    profiler: Optional[Profiler] = None,
+) -> List[ResetResult]:
+    """Load a batch from a CSV file (or ``-`` for stdin) and reset it.
+    
+    Raises:
+        UserInputError: If the input or options are invalid
+    """
+    if not results_path:
+        raise UserInputError("--results is required for bulk resets")
+    if from_file == '-' and not force:
+        raise UserInputError("--force is required when reading users from stdin")
+    with profiler.phase("parse") if profiler is not None else nullcontext():
+        if from_file == '-':
+            requests = read_reset_requests(sys.stdin, source="stdin")
+            source = "stdin"
+        else:
+            try:
+                with open(from_file, 'r', encoding='utf-8', newline='') as f:
+                    requests = read_reset_requests(f, source=from_file)
+            except OSError as e:
+                raise UserInputError(f"Cannot read {from_file}: {e.strerror}") from e
+            source = from_file
+    return reset_users(
+        requests,
+        results_path,
+        force,
+        workers,
+        source,
+        emitter,
+        directory,
+        batch_size,
+        notifier,
+        profiler,
+    )
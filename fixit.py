@@ -7,29 +7,59 @@ A command-line tool that mimics real-life IT support tasks with a touch of humor
 from __future__ import annotations
 
 import click
-import logging
-import traceback
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, TypeVar
 
-# Import command modules
-from commands.reset_user import reset_user
-from commands.ping_test import ping_test
-from commands.log_dump import log_dump
-from commands.exceptions import FixitError
+# Command modules (and the stdlib they pull in) are imported inside each
+# command, so `fixit --help` or a single `ping-test` only loads what it runs.
+from commands.exceptions import FixitError, UserInputError
+from commands.output import FORMATS, get_emitter
+
+if TYPE_CHECKING:
+    from commands.notify import NotificationQueue, SmtpSettings
+    from commands.output import RecordEmitter
+    from commands.profiling import Profiler
+    from commands.reset_user import ResetResult
 
 
 __version__ = "1.0.0"
 
+F = TypeVar("F", bound=Callable[..., Any])
+
 
 def _configure_logging(log_level: str) -> None:
+    import sys
+
+    configured = sys.modules.get("logging")
+    if log_level == "WARNING" and (configured is None or not configured.root.handlers):
+        # Nothing to change: the root logger defaults to WARNING and logging's
+        # last-resort handler already prints warnings and errors to stderr.
+        return
+    import logging
+
     logging.basicConfig(
         level=getattr(logging, log_level, logging.INFO),
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        # Replace earlier handlers: `fixit serve` and `fixit shell` run many
+        # commands in one process, each with its own stderr.
+        force=True,
     )
 
 
-def _handle_error(exc: Exception, debug: bool) -> None:
+def _handle_error(exc: Exception, debug: bool, emitter: Optional[RecordEmitter] = None) -> None:
+    import traceback
+
+    if emitter is not None:
+        record = {"type": "error", "error": type(exc).__name__, "message": str(exc)}
+        if not isinstance(exc, FixitError):
+            record["message"] = "Unexpected error occurred."
+            if debug:
+                record["traceback"] = "".join(
+                    traceback.format_exception(type(exc), exc, exc.__traceback__)
+                )
+        emitter.emit(record)
+        return
+
     if isinstance(exc, FixitError):
         click.echo(click.style(f"❌ {exc}", fg="red", bold=True))
         return
@@ -40,6 +70,71 @@ def _handle_error(exc: Exception, debug: bool) -> None:
         click.echo("".join(traceback.format_exception(type(exc), exc, exc.__traceback__)))
 
 
+def _directory_option(f: F) -> F:
+    """Add --directory (FIXIT_DIRECTORY) for commands that reset passwords."""
+    return click.option(
+        '--directory',
+        type=click.Path(dir_okay=False),
+        envvar='FIXIT_DIRECTORY',
+        help='SQLite account directory to update (default: simulated)',
+    )(f)
+
+
+def _smtp_options(f: F) -> F:
+    """Add the SMTP notification options shared by reset-user and run."""
+    options = [
+        click.option(
+            '--smtp-host',
+            envvar='FIXIT_SMTP_HOST',
+            help='Deliver notifications through this SMTP server',
+        ),
+        click.option(
+            '--smtp-port', envvar='FIXIT_SMTP_PORT', default=25, show_default=True, help='SMTP port'
+        ),
+        click.option(
+            '--smtp-from',
+            envvar='FIXIT_SMTP_FROM',
+            default='fixit@localhost',
+            show_default=True,
+            help='Sender address for notifications',
+        ),
+        click.option(
+            '--smtp-starttls', is_flag=True, envvar='FIXIT_SMTP_STARTTLS', help='Use STARTTLS'
+        ),
+        click.option(
+            '--smtp-user',
+            envvar='FIXIT_SMTP_USER',
+            help='SMTP login (password: FIXIT_SMTP_PASSWORD)',
+        ),
+        click.option('--smtp-password', envvar='FIXIT_SMTP_PASSWORD', hidden=True),
+        click.option(
+            '--notify-timeout',
+            default=30.0,
+            show_default=True,
+            help='Seconds to wait for queued notifications on exit',
+        ),
+    ]
+    for option in reversed(options):
+        f = option(f)
+    return f
+
+
+def _smtp_settings(
+    host: Optional[str],
+    port: int,
+    sender: str,
+    starttls: bool,
+    user: Optional[str],
+    password: Optional[str],
+) -> Optional[SmtpSettings]:
+    """Return the SMTP server to notify through, or None to simulate notifications."""
+    if not host:
+        return None
+    from commands.notify import SmtpSettings
+
+    return SmtpSettings(host, port, sender, user, password, starttls)
+
+
 @click.group()
 @click.version_option(version=__version__, prog_name="fixit")
 @click.option(
@@ -49,8 +144,52 @@ def _handle_error(exc: Exception, debug: bool) -> None:
     show_default=True,
     help="Logging verbosity for diagnostics.",
 )
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(FORMATS, case_sensitive=False),
+    default="text",
+    show_default=True,
+    help="Output style: decorated text, a JSON array, or newline-delimited JSON records.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Report per-phase timings and counters (bytes, lines, matches) when the command exits.",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(("table", "json", "prometheus"), case_sensitive=False),
+    default="table",
+    show_default=True,
+    help="Profile report style; prometheus writes the node_exporter textfile format.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False),
+    help="Write the profile report to this file (replaced atomically) instead of stderr.",
+)
+@click.option(
+    "--profile-python",
+    is_flag=True,
+    help="Add cProfile's slowest functions (implies --profile).",
+)
+@click.option(
+    "--profile-memory",
+    is_flag=True,
+    help="Add tracemalloc peak and top allocations (implies --profile).",
+)
 @click.pass_context
-def cli(ctx: click.Context, log_level: str) -> None:
+def cli(
+    ctx: click.Context,
+    log_level: str,
+    output_format: str,
+    profile: bool,
+    profile_format: str,
+    profile_output: Optional[str],
+    profile_python: bool,
+    profile_memory: bool,
+) -> None:
     """
     🔧 Fix-It CLI: Your friendly neighborhood IT support toolkit.
     
@@ -62,20 +201,142 @@ def cli(ctx: click.Context, log_level: str) -> None:
     ctx.obj['start_time'] = datetime.now()
     ctx.obj["log_level"] = log_level.upper()
     _configure_logging(ctx.obj["log_level"])
+    ctx.obj["profiler"] = None
+    if profile or profile_output or profile_python or profile_memory:
+        # Registered before the emitter so the report also covers its final flush.
+        ctx.obj["profiler"] = _start_profiler(
+            ctx, profile_format.lower(), profile_output, profile_python, profile_memory
+        )
+    emitter = get_emitter(output_format.lower())
+    ctx.obj["emitter"] = emitter
+    if emitter is not None:
+        ctx.call_on_close(emitter.close)
+
+
+def _start_profiler(
+    ctx: click.Context, fmt: str, output: Optional[str], python: bool, memory: bool
+) -> Profiler:
+    from commands.profiling import Profiler, write_report
+
+    profiler = Profiler(ctx.invoked_subcommand or "", python=python, memory=memory)
+
+    def report() -> None:
+        profiler.stop()
+        write_report(profiler.render(fmt), output)
+
+    ctx.call_on_close(report)
+    profiler.start()
+    return profiler
 
 
 @cli.command()
-@click.argument('username')
+@click.argument('username', required=False)
 @click.option('--force', '-f', is_flag=True, help='Force reset without confirmation (use with caution!)')
 @click.option('--email', '-e', help='Send reset notification to this email')
+@click.option(
+    '--from-file',
+    type=click.Path(dir_okay=False, allow_dash=True),
+    help="Bulk reset the accounts in this CSV file ('-' for stdin)",
+)
+@click.option(
+    '--results',
+    type=click.Path(dir_okay=False),
+    help='Bulk mode: new file to write per-user results (including passwords) to',
+)
+@click.option('--workers', '-w', default=8, show_default=True, help='Bulk mode: worker threads')
+@_directory_option
+@click.option(
+    '--batch-size', default=500, show_default=True, help='Bulk mode: accounts per directory write'
+)
+@_smtp_options
 @click.pass_context
-def reset_user_cmd(ctx: click.Context, username: str, force: bool, email: Optional[str]) -> None:
-    """Reset a user's password (simulated, of course)."""
+def reset_user_cmd(
+    ctx: click.Context,
+    username: Optional[str],
+    force: bool,
+    email: Optional[str],
+    from_file: Optional[str],
+    results: Optional[str],
+    workers: int,
+    directory: Optional[str],
+    batch_size: int,
+    smtp_host: Optional[str],
+    smtp_port: int,
+    smtp_from: str,
+    smtp_starttls: bool,
+    smtp_user: Optional[str],
+    smtp_password: Optional[str],
+    notify_timeout: float,
+) -> None:
+    """Reset a user's password (simulated, of course).
+
+    Pass --from-file instead of USERNAME to reset a whole batch of accounts.
+    """
+    from commands.reset_user import bulk_reset, reset_user
+
     try:
-        reset_user(username, force, email)
+        if from_file is not None:
+            if username is not None or email:
+                raise UserInputError("USERNAME and --email cannot be combined with --from-file")
+        elif username is None:
+            raise UserInputError("Provide a USERNAME or --from-file")
+        if workers < 1 or batch_size < 1:
+            raise UserInputError("--workers and --batch-size must be at least 1")
+        pool_size = workers if from_file is not None else 1
+        bulk_results: List[ResetResult] = []
+        backend = None
+        notifier: Optional[NotificationQueue] = None
+        try:
+            if directory:
+                from commands.directory import open_directory
+
+                backend = open_directory(directory, pool_size=pool_size, batch_size=batch_size)
+            settings = _smtp_settings(
+                smtp_host, smtp_port, smtp_from, smtp_starttls, smtp_user, smtp_password
+            )
+            if settings is not None:
+                from commands.notify import NotificationQueue
+
+                notifier = NotificationQueue(settings)
+            if from_file is not None:
+                bulk_results = bulk_reset(
+                    from_file,
+                    results,
+                    force,
+                    workers,
+                    emitter=ctx.obj.get("emitter"),
+                    directory=backend,
+                    batch_size=batch_size,
+                    notifier=notifier,
+                    profiler=ctx.obj.get("profiler"),
+                )
+            elif username is not None:
+                reset_user(
+                    username,
+                    force,
+                    email,
+                    emitter=ctx.obj.get("emitter"),
+                    directory=backend,
+                    notifier=notifier,
+                    profiler=ctx.obj.get("profiler"),
+                )
+        finally:
+            if backend is not None:
+                backend.close()
+            if notifier is not None:
+                from commands.notify import finish_notifications
+
+                finish_notifications(
+                    notifier, notify_timeout, ctx.obj.get("emitter"), ctx.obj.get("profiler")
+                )
     except Exception as exc:  # noqa: BLE001 - CLI boundary: render friendly message
-        _handle_error(exc, debug=ctx.obj.get("log_level") == "DEBUG")
+        _handle_error(
+            exc, debug=ctx.obj.get("log_level") == "DEBUG", emitter=ctx.obj.get("emitter")
+        )
         raise SystemExit(1) from exc
+    # Let automation notice a batch where some accounts were not reset.
+    if any(result.status != "reset" for result in bulk_results):
+        raise SystemExit(1)
 
 
 @cli.command()
@@ -88,10 +349,21 @@ def ping_test_cmd(
     ctx: click.Context, host: str, count: int, timeout: int, verbose: bool
 ) -> None:
     """Test network connectivity to a host."""
+    from commands.ping_test import ping_test
+
     try:
-        ping_test(host, count, timeout, verbose)
+        ping_test(
+            host,
+            count,
+            timeout,
+            verbose,
+            emitter=ctx.obj.get("emitter"),
+            profiler=ctx.obj.get("profiler"),
+        )
     except Exception as exc:  # noqa: BLE001 - CLI boundary: render friendly message
-        _handle_error(exc, debug=ctx.obj.get("log_level") == "DEBUG")
+        _handle_error(
+            exc, debug=ctx.obj.get("log_level") == "DEBUG", emitter=ctx.obj.get("emitter")
+        )
         raise SystemExit(1) from exc
 
 
@@ -101,6 +373,43 @@ def ping_test_cmd(
 @click.option('--tail', '-t', is_flag=True, help='Show tail instead of head')
 @click.option('--grep', '-g', help='Filter lines containing this pattern')
 @click.option('--output', '-o', type=click.Path(), help='Save output to file')
+@click.option(
+    '--recursive', '-r', is_flag=True, help='Search every file under LOG_PATH (needs --grep)'
+)
+@click.option(
+    '--include', multiple=True, help='Recursive: only search files matching this glob (repeatable)'
+)
+@click.option(
+    '--exclude',
+    multiple=True,
+    help='Recursive: skip files and directories matching this glob (repeatable)',
+)
+@click.option(
+    '--files-with-matches',
+    '-l',
+    is_flag=True,
+    help='Recursive: only list matching files, reading each up to its first hit',
+)
+@click.option(
+    '--workers', '-w', default=8, show_default=True, help='Recursive: files searched at once'
+)
+@click.option(
+    '--processes', is_flag=True, help='Recursive: search in worker processes instead of threads'
+)
+@click.option(
+    '--since-last-run',
+    is_flag=True,
+    help='Only read lines added since the last run with the same --grep (follows rotation)',
+)
+@click.option(
+    '--checkpoint-file',
+    type=click.Path(dir_okay=False),
+    envvar='FIXIT_CHECKPOINT_FILE',
+    help='Where --since-last-run keeps its checkpoints (default: $XDG_STATE_HOME/fixit)',
+)
+@click.option(
+    '--pager', is_flag=True, help='Page through the lines as they are read (less -R or $PAGER)'
+)
 @click.pass_context
 def log_dump_cmd(
     ctx: click.Context,
@@ -109,14 +418,212 @@ def log_dump_cmd(
     tail: bool,
     grep: Optional[str],
     output: Optional[str],
+    recursive: bool,
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    files_with_matches: bool,
+    workers: int,
+    processes: bool,
+    since_last_run: bool,
+    checkpoint_file: Optional[str],
+    pager: bool,
 ) -> None:
-    """Dump log file contents with various filtering options."""
+    """Dump log file contents with various filtering options.
+
+    With --recursive, LOG_PATH is a directory and every file under it is
+    searched in parallel; matches are grouped per file with their line numbers.
+    """
     try:
-        log_dump(log_path, lines, tail, grep, output)
+        if recursive and (since_last_run or pager):
+            raise UserInputError("--since-last-run and --pager work on a single log file")
+        if recursive:
+            from commands.log_search import search_logs
+
+            search_logs(
+                log_path,
+                grep,
+                lines,
+                tail,
+                include,
+                exclude,
+                files_with_matches,
+                workers,
+                processes,
+                output,
+                emitter=ctx.obj.get("emitter"),
+                profiler=ctx.obj.get("profiler"),
+            )
+            return
+        if include or exclude or files_with_matches:
+            raise UserInputError(
+                "--include, --exclude and --files-with-matches need --recursive"
+            )
+        from commands.log_dump import log_dump
+
+        log_dump(
+            log_path,
+            lines,
+            tail,
+            grep,
+            output,
+            since_last_run,
+            checkpoint_file,
+            pager,
+            emitter=ctx.obj.get("emitter"),
+            profiler=ctx.obj.get("profiler"),
+        )
+    except Exception as exc:  # noqa: BLE001 - CLI boundary: render friendly message
+        _handle_error(
+            exc, debug=ctx.obj.get("log_level") == "DEBUG", emitter=ctx.obj.get("emitter")
+        )
+        raise SystemExit(1) from exc
+
+
+@cli.command()
+@click.argument('manifest', type=click.Path(dir_okay=False, allow_dash=True))
+@click.option(
+    '--io-workers', default=16, show_default=True, help='Concurrent I/O-bound jobs (pings, reads)'
+)
+@click.option(
+    '--cpu-workers', default=2, show_default=True, help='Concurrent CPU-bound jobs (gzip, grep)'
+)
+@click.option('--force', '-f', is_flag=True, help='Run reset-user jobs without confirmation')
+@_directory_option
+@_smtp_options
+@click.pass_context
+def run_cmd(
+    ctx: click.Context,
+    manifest: str,
+    io_workers: int,
+    cpu_workers: int,
+    force: bool,
+    directory: Optional[str],
+    smtp_host: Optional[str],
+    smtp_port: int,
+    smtp_from: str,
+    smtp_starttls: bool,
+    smtp_user: Optional[str],
+    smtp_password: Optional[str],
+    notify_timeout: float,
+) -> None:
+    """Run the jobs in a JSON or TOML manifest concurrently.
+
+    Results are shown as each job finishes; the exit code is non-zero if any
+    job failed, timed out or was cancelled. reset-user jobs use the same
+    account directory and SMTP settings as the reset-user command.
+    """
+    from commands.jobs import run_manifest
+
+    try:
+        summary = run_manifest(
+            manifest,
+            io_workers,
+            cpu_workers,
+            force,
+            emitter=ctx.obj.get("emitter"),
+            profiler=ctx.obj.get("profiler"),
+            directory=directory,
+            smtp=_smtp_settings(
+                smtp_host, smtp_port, smtp_from, smtp_starttls, smtp_user, smtp_password
+            ),
+            notify_timeout=notify_timeout,
+        )
+    except Exception as exc:  # noqa: BLE001 - CLI boundary: render friendly message
+        _handle_error(
+            exc, debug=ctx.obj.get("log_level") == "DEBUG", emitter=ctx.obj.get("emitter")
+        )
+        raise SystemExit(1) from exc
+    if summary.ok != summary.total:
+        raise SystemExit(1)
+
+
+def _refuse_nested(ctx: click.Context, name: str) -> None:
+    if ctx.obj.get("nested"):
+        raise click.UsageError(f"'{name}' cannot be run from inside fixit serve or fixit shell")
+
+
+@cli.command()
+@click.option(
+    '--socket',
+    'socket_path',
+    type=click.Path(dir_okay=False),
+    envvar='FIXIT_SOCKET',
+    help='Unix socket to listen on (default: per-user socket in $XDG_RUNTIME_DIR)',
+)
+@click.pass_context
+def serve_cmd(ctx: click.Context, socket_path: Optional[str]) -> None:
+    """Keep a warm fixit process running for fixit-client.
+
+    Commands sent with fixit-client run here without paying Python and
+    click start-up costs again. Stop the server with Ctrl+C.
+    """
+    _refuse_nested(ctx, "serve")
+    from commands.client import default_socket_path
+    from commands.daemon import serve
+
+    try:
+        path = socket_path or default_socket_path()
+        server = serve(path, ctx.find_root().command)
     except Exception as exc:  # noqa: BLE001 - CLI boundary: render friendly message
         _handle_error(exc, debug=ctx.obj.get("log_level") == "DEBUG")
         raise SystemExit(1) from exc
 
+    click.echo(click.style(f"🔌 Serving fixit on {path}", fg="cyan", bold=True), err=True)
+    import signal
+
+    def _stop(signum: int, frame: object) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    click.echo(click.style("👋 Server stopped", fg="cyan"), err=True)
+
+
+@cli.command()
+@click.pass_context
+def shell_cmd(ctx: click.Context) -> None:
+    """Run fixit commands interactively in one warm process.
+
+    Type a command without the leading 'fixit' (e.g. 'ping-test localhost');
+    'exit', 'quit' or Ctrl+D leaves the shell.
+    """
+    _refuse_nested(ctx, "shell")
+    import shlex
+
+    from commands.daemon import run_command
+
+    try:
+        import readline  # noqa: F401 - enables line editing and history for input()
+    except ImportError:
+        pass
+
+    group = ctx.find_root().command
+    color = ctx.color
+    while True:
+        try:
+            line = input("fixit> ")
+        except EOFError:
+            click.echo()
+            break
+        except KeyboardInterrupt:
+            click.echo()
+            continue
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            click.echo(click.style(f"❌ {e}", fg="red", bold=True))
+            continue
+        if not args:
+            continue
+        if args[0] in ("exit", "quit"):
+            break
+        run_command(group, args, color)
+
 
 if __name__ == '__main__':
     cli()
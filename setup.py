@@ -21,11 +21,13 @@ setup(
     packages=["commands"],
     install_requires=[
         "click>=8.0.0",
+        "tomli>=1.1.0; python_version < '3.11'",
     ],
     python_requires=">=3.8",
     entry_points={
         "console_scripts": [
             "fixit=fixit:cli",
+            "fixit-client=commands.client:main",
         ],
     },
     classifiers=[
@@ -0,0 +1,88 @@
+"""Tests for the benchmark data generator and regression check."""
+
+import gzip
+
+from benchmarks.cases import build_cases
+from benchmarks.compare import compare
+from benchmarks.datagen import NEEDLE, generate_log, parse_size
+
+
+def _results(**metrics):
+    return {"results": [{"name": "case", "metrics": metrics}]}
+
+
+class TestGenerateLog:
+    """Test synthetic log generation."""
+
+    def test_size_and_density(self, tmp_path):
+        """Test that logs have the requested size and share of matching lines."""
+        path = generate_log(str(tmp_path), parse_size("2MB"), density=0.05)
+        with open(path, "rb") as f:
+            data = f.read()
+        lines = data.splitlines()
+        share = sum(NEEDLE.encode() in line for line in lines) / len(lines)
+
+        assert parse_size("2MB") - 200 < len(data) <= parse_size("2MB")
+        assert data.endswith(b"\n")
+        assert abs(share - 0.05) < 0.001
+
+    def test_gzip_matches_plain_and_is_cached(self, tmp_path):
+        """Test that compressed logs hold the same lines and are reused."""
+        plain = generate_log(str(tmp_path), parse_size("1MB"), density=0.01)
+        packed = generate_log(str(tmp_path), parse_size("1MB"), density=0.01, compressed=True)
+        with gzip.open(packed, "rb") as f, open(plain, "rb") as g:
+            assert f.read() == g.read()
+        assert (
+            generate_log(str(tmp_path), parse_size("1MB"), density=0.01, compressed=True) == packed
+        )
+
+
+class TestCompare:
+    """Test the offline regression check."""
+
+    def test_throughput_drop_is_regression(self):
+        """Test that lower throughput beyond the threshold is reported."""
+        regressions = compare(_results(mb_per_s=70.0), _results(mb_per_s=100.0), threshold=0.25)
+        assert [r.metric for r in regressions] == ["mb_per_s"]
+
+    def test_time_and_memory_growth_is_regression(self):
+        """Test that slower runs and higher peak RSS are reported."""
+        current = _results(seconds=1.3, peak_rss_mb=200.0)
+        baseline = _results(seconds=1.0, peak_rss_mb=100.0)
+        assert {r.metric for r in compare(current, baseline, threshold=0.25)} == {
+            "seconds",
+            "peak_rss_mb",
+        }
+
+    def test_improvements_and_noise_pass(self):
+        """Test that improvements and changes within the threshold pass."""
+        current = _results(seconds=0.5, mb_per_s=90.0, peak_rss_mb=110.0)
+        baseline = _results(seconds=1.0, mb_per_s=100.0, peak_rss_mb=100.0)
+        assert compare(current, baseline, threshold=0.25) == []
+
+    def test_unknown_cases_ignored(self):
+        """Test that cases missing from the baseline are skipped."""
+        current = {"results": [{"name": "new", "metrics": {"seconds": 9.0}}]}
+        assert compare(current, _results(seconds=1.0)) == []
+
+
+class TestBuildCases:
+    """Test benchmark profiles."""
+
+    def test_quick_profile_covers_every_area(self):
+        """Test that the quick profile measures every mode and workload."""
+        names = [case.name for case in build_cases("quick")]
+        assert len(names) == len(set(names))
+        for fragment in (
+            "/plain/",
+            "/gzip/",
+            "/head",
+            "/tail",
+            "/grep-sparse",
+            "/grep-dense",
+            "/output",
+            "ping_sweep/",
+            "passwords/",
+            "resets/sqlite/",
+        ):
+            assert any(fragment in name for name in names), fragment
@@ -0,0 +1,174 @@
+"""Tests for log-dump --since-last-run checkpoints."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from commands.checkpoints import STORE_VERSION, CheckpointStore, plan_segments
+from commands.exceptions import UserInputError
+from commands.log_dump import log_dump
+from commands.output import RecordCollector
+from fixit import cli
+
+
+def _dump(log_path, store_path, **kwargs):
+    collector = RecordCollector()
+    log_dump(
+        str(log_path),
+        since_last_run=True,
+        checkpoint_file=str(store_path),
+        emitter=collector,
+        **kwargs,
+    )
+    lines = [(r["file"], r["line"], r["text"]) for r in collector.records if r["type"] == "line"]
+    return lines, collector.records[-1]
+
+
+class TestSinceLastRun:
+    """Test incremental reads from a checkpoint."""
+
+    def test_only_appended_lines_are_read(self, tmp_path):
+        """Test that a second run scans only what was appended."""
+        log_path = tmp_path / "app.log"
+        store = tmp_path / "state.json"
+        log_path.write_text("ERROR one\nINFO two\n")
+        lines, summary = _dump(log_path, store, grep="error")
+        assert lines == [(str(log_path), 1, "ERROR one")]
+        assert summary["resume"] == "new"
+
+        with open(log_path, "a") as f:
+            f.write("ERROR three\nINFO four\n")
+        lines, summary = _dump(log_path, store, grep="error")
+        assert lines == [(str(log_path), 3, "ERROR three")]
+        assert summary["resume"] == "resumed"
+        assert summary["scanned_lines"] == 2
+
+        lines, summary = _dump(log_path, store, grep="error")
+        assert lines == []
+        assert summary["scanned_lines"] == 0
+
+    def test_partial_line_waits_for_next_run(self, tmp_path):
+        """Test that a line still being written is read once it is complete."""
+        log_path = tmp_path / "app.log"
+        store = tmp_path / "state.json"
+        log_path.write_text("one\ntw")
+        lines, _ = _dump(log_path, store)
+        assert [text for _, _, text in lines] == ["one"]
+        with open(log_path, "a") as f:
+            f.write("o\n")
+        lines, _ = _dump(log_path, store)
+        assert lines == [(str(log_path), 2, "two")]
+
+    def test_rotation_finishes_old_file(self, tmp_path):
+        """Test that lines appended before a rename rotation are not lost."""
+        log_path = tmp_path / "app.log"
+        store = tmp_path / "state.json"
+        log_path.write_text("one\n")
+        _dump(log_path, store)
+        with open(log_path, "a") as f:
+            f.write("two\n")
+        log_path.rename(tmp_path / "app.log.1")
+        log_path.write_text("fresh\n")
+
+        lines, summary = _dump(log_path, store)
+        assert lines == [
+            (str(tmp_path / "app.log.1"), 2, "two"),
+            (str(log_path), 1, "fresh"),
+        ]
+        assert summary["resume"] == "rotated"
+
+    def test_truncation_rereads_from_start(self, tmp_path):
+        """Test that a file truncated in place and refilled is read from line 1."""
+        log_path = tmp_path / "app.log"
+        store = tmp_path / "state.json"
+        log_path.write_text("aaaa\nbbbb\n")
+        _dump(log_path, store)
+        # Same inode, grown past the old offset, but different content.
+        log_path.write_text("cccc\ndddd\neeee\n")
+
+        lines, summary = _dump(log_path, store)
+        assert [line for _, line, _ in lines] == [1, 2, 3]
+        assert summary["resume"] == "truncated"
+
+    def test_head_limit_resumes_after_last_shown_line(self, tmp_path):
+        """Test that matches beyond --lines are shown on the next run, not skipped."""
+        log_path = tmp_path / "app.log"
+        store = tmp_path / "state.json"
+        log_path.write_text("".join(f"ERROR {i}\n" for i in range(1, 6)))
+        lines, _ = _dump(log_path, store, lines=2, grep="error")
+        assert [line for _, line, _ in lines] == [1, 2]
+        lines, _ = _dump(log_path, store, lines=2, grep="error")
+        assert [line for _, line, _ in lines] == [3, 4]
+
+    def test_checkpoints_are_per_query(self, tmp_path):
+        """Test that different grep patterns keep separate checkpoints."""
+        log_path = tmp_path / "app.log"
+        store = tmp_path / "state.json"
+        log_path.write_text("ERROR a\nWARN b\n")
+        _dump(log_path, store, grep="error")
+        lines, _ = _dump(log_path, store, grep="warn")
+        assert lines == [(str(log_path), 2, "WARN b")]
+        entries = json.loads(store.read_text())["checkpoints"]
+        assert set(entries[str(log_path.resolve())]) == {"error", "warn"}
+
+    def test_gzipped_rejected(self, tmp_path):
+        """Test that compressed logs cannot be read incrementally."""
+        log_path = tmp_path / "app.log.gz"
+        log_path.write_bytes(b"\x1f\x8b\x08\x00")
+        with pytest.raises(UserInputError, match="uncompressed"):
+            _dump(log_path, tmp_path / "state.json")
+
+
+class TestCheckpointStore:
+    """Test the checkpoint file."""
+
+    def test_corrupt_store_starts_over(self, tmp_path):
+        """Test that an unreadable store is ignored rather than fatal."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("one\n")
+        store_path = tmp_path / "state.json"
+        store_path.write_text("{broken")
+        store = CheckpointStore(str(store_path))
+        segments, resume = plan_segments(log_path, store.get(log_path, None))
+        assert resume == "new"
+        assert segments[0].offset == 0
+
+    def test_unexpected_checkpoints_value(self, tmp_path):
+        """Test that a store whose checkpoints are not a mapping is ignored."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("one\n")
+        store_path = tmp_path / "state.json"
+        store_path.write_text(json.dumps({"version": STORE_VERSION, "checkpoints": ["x"]}))
+        store = CheckpointStore(str(store_path))
+        assert store.get(log_path, None) is None
+        lines, _ = _dump(log_path, store_path)
+        assert [text for _, _, text in lines] == ["one"]
+
+
+class TestSinceLastRunCommand:
+    """Test --since-last-run on the command line."""
+
+    def test_env_checkpoint_file(self, tmp_path):
+        """Test that FIXIT_CHECKPOINT_FILE selects the store."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("one\ntwo\n")
+        store = tmp_path / "state.json"
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["log-dump", str(log_path), "--since-last-run"],
+            env={"FIXIT_CHECKPOINT_FILE": str(store)},
+        )
+        assert result.exit_code == 0
+        assert "Checkpoint saved at line 2" in result.output
+        assert store.exists()
+
+    def test_not_with_recursive(self, tmp_path):
+        """Test that checkpoints are only supported for single files."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["log-dump", str(tmp_path), "-r", "-g", "x", "--since-last-run"]
+        )
+        assert result.exit_code == 1
+        assert "single log file" in result.output
@@ -1,5 +1,7 @@
 """Integration tests for CLI."""
 
+import json
+
 from click.testing import CliRunner
 
 from fixit import cli
@@ -35,3 +37,12 @@ class TestCLI:
         result = runner.invoke(cli, ["invalid-command"])
         assert result.exit_code != 0
         assert "No such command" in result.output or "Usage:" in result.output
+
+    def test_cli_format_json_error(self):
+        """Test that errors are reported as records in machine-readable mode."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["--format", "json", "log-dump", "/nonexistent/file.log"])
+        assert result.exit_code == 1
+        records = json.loads(result.stdout)
+        assert records[0]["type"] == "error"
+        assert "File not found" in records[0]["message"]
@@ -0,0 +1,192 @@
+"""Tests for the warm server, its client and the interactive shell."""
+
+import io
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from commands.client import decode_request, default_socket_path, encode_request, run_remote
+from commands.exceptions import UserInputError
+from fixit import cli
+
+unix_only = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def server():
+    """Warm server on a short socket path, running on a background thread."""
+    from commands.daemon import serve
+
+    # Unix socket paths are limited to ~100 bytes, so avoid pytest's deep tmp_path.
+    directory = tempfile.mkdtemp(dir="/tmp")
+    server = serve(os.path.join(directory, "fixit.sock"), cli)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    shutil.rmtree(directory)
+
+
+def _run(server, *args):
+    stdout, stderr = io.BytesIO(), io.BytesIO()
+    code = run_remote(list(args), server.server_address, stdout, stderr, color=False)
+    return code, stdout.getvalue().decode(), stderr.getvalue().decode()
+
+
+class TestRequestEncoding:
+    """Test request frame encoding."""
+
+    def test_round_trip(self):
+        """Test that argv, cwd, environment and colour survive encoding."""
+        payload = encode_request(["log-dump", "a b.log", ""], "/srv", ["FIXIT_X=1=2"], True)
+        assert decode_request(payload) == (
+            ["log-dump", "a b.log", ""],
+            "/srv",
+            ["FIXIT_X=1=2"],
+            True,
+        )
+
+
+@unix_only
+class TestServer:
+    """Test commands run through fixit serve."""
+
+    def test_streams_output_and_exit_code(self, server):
+        """Test that output and the exit code reach the client."""
+        code, stdout, _ = _run(server, "--version")
+        assert code == 0
+        assert "1.0.0" in stdout
+
+        code, stdout, _ = _run(server, "log-dump", "/nonexistent/file.log")
+        assert code == 1
+        assert "File not found" in stdout
+
+    def test_runs_in_client_directory(self, server, tmp_path, monkeypatch):
+        """Test that relative paths resolve against the client's working directory."""
+        (tmp_path / "app.log").write_text("INFO ok\nERROR bad\n")
+        monkeypatch.chdir(tmp_path)
+        cwd = os.getcwd()
+
+        code, stdout, _ = _run(
+            server, "--format", "ndjson", "log-dump", "app.log", "--grep", "error"
+        )
+
+        assert code == 0
+        assert '"text":"ERROR bad"' in stdout
+        assert os.getcwd() == cwd
+
+    def test_state_persists_between_requests(self, server):
+        """Test that repeated requests are served by the same warm process."""
+        for _ in range(3):
+            code, stdout, _ = _run(server, "--version")
+            assert code == 0
+        assert server.command is cli
+
+    def test_refuses_nested_server(self, server):
+        """Test that a client cannot start another server inside the daemon."""
+        code, _, stderr = _run(server, "serve")
+        assert code == 2
+        assert "cannot be run from inside" in stderr
+
+    def test_refuses_live_socket(self, server):
+        """Test that a second server will not steal a socket in use."""
+        from commands.daemon import serve
+
+        with pytest.raises(UserInputError):
+            serve(server.server_address, cli)
+
+
+@unix_only
+class TestSocketOwnership:
+    """Test that sockets belonging to other users are never trusted."""
+
+    def test_default_path_in_private_directory(self, monkeypatch):
+        """Test that without a runtime directory the socket goes in a per-user directory."""
+        monkeypatch.delenv("FIXIT_SOCKET", raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        monkeypatch.setenv("TMPDIR", "/tmp")
+        assert default_socket_path() == f"/tmp/fixit-{os.getuid()}/fixit.sock"
+
+    def test_client_refuses_foreign_socket(self, server, monkeypatch):
+        """Test that nothing is sent to a socket owned by another user."""
+        uid = os.getuid()
+        monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+        with pytest.raises(PermissionError, match="refusing"):
+            _run(server, "--version")
+
+    @pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="needs SO_PEERCRED")
+    def test_client_checks_server_credentials(self, monkeypatch):
+        """Test that the peer's uid is checked after connecting."""
+        from commands.client import _check_peer
+
+        left, right = socket.socketpair()
+        uid = os.getuid()
+        _check_peer(left, "pair")
+        monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+        with pytest.raises(PermissionError, match="runs as uid"):
+            _check_peer(left, "pair")
+        left.close()
+        right.close()
+
+    def test_server_creates_private_directory(self):
+        """Test that a missing socket directory is created owner-only."""
+        from commands.daemon import serve
+
+        parent = tempfile.mkdtemp(dir="/tmp")
+        directory = os.path.join(parent, "run")
+        server = serve(os.path.join(directory, "fixit.sock"), cli)
+        try:
+            assert os.stat(directory).st_mode & 0o777 == 0o700
+        finally:
+            server.server_close()
+            shutil.rmtree(parent)
+
+    def test_server_refuses_shared_directory(self, monkeypatch):
+        """Test that a directory others could swap the socket in is rejected."""
+        from commands.daemon import serve
+
+        directory = tempfile.mkdtemp(dir="/tmp")
+        os.chmod(directory, 0o777)
+        uid = os.getuid()
+        monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+        try:
+            with pytest.raises(UserInputError, match="writable by others"):
+                serve(os.path.join(directory, "fixit.sock"), cli)
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestShell:
+    """Test fixit shell."""
+
+    def test_runs_commands_until_exit(self, tmp_path):
+        """Test that the shell runs several commands and stops at 'exit'."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("first\nsecond\n")
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["shell"],
+            input=f"log-dump '{log_path}' -n 1\n\n--version\nexit\nlog-dump '{log_path}'\n",
+        )
+        assert result.exit_code == 0
+        assert "first" in result.output
+        assert "second" not in result.output
+        assert "1.0.0" in result.output
+
+    def test_survives_failing_command(self):
+        """Test that a failing command does not end the shell."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["shell"], input="log-dump /nonexistent.log\nnot-a-command\n--version\n"
+        )
+        assert result.exit_code == 0
+        assert "File not found" in result.output
+        assert "No such command" in result.output
+        assert "1.0.0" in result.output
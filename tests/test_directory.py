@@ -0,0 +1,123 @@
+"""Tests for account directory backends."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from commands.directory import (
+    ConnectionPool,
+    SimulatedDirectory,
+    SQLiteDirectory,
+    _transaction,
+    hash_password,
+    open_directory,
+)
+from commands.exceptions import DirectoryError
+
+
+@pytest.fixture
+def directory(tmp_path):
+    """SQLite directory seeded with a few accounts."""
+    backend = SQLiteDirectory(str(tmp_path / "accounts.db"), pool_size=4, batch_size=3)
+    backend.add_accounts(["alice", "bob", "carol", "dave"])
+    yield backend
+    backend.close()
+
+
+class TestSQLiteDirectory:
+    """Test SQLiteDirectory backend."""
+
+    def test_set_passwords_stores_hashes(self, directory):
+        """Test that new passwords are stored as salted hashes."""
+        assert directory.set_passwords([("alice", "s3cret!"), ("bob", "hunter2")]) == []
+
+        salt, digest = directory.get_password_hash("alice")
+        assert hash_password("s3cret!", salt) == (salt, digest)
+        assert directory.get_password_hash("carol") is None
+
+    def test_set_passwords_reports_missing(self, directory):
+        """Test that unknown accounts are reported and not created."""
+        updates = [("alice", "a"), ("ghost", "b"), ("bob", "c"), ("carol", "d"), ("nobody", "e")]
+        assert directory.set_passwords(updates) == ["ghost", "nobody"]
+        assert directory.get_password_hash("ghost") is None
+        assert directory.get_password_hash("carol") is not None
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test that pooled connections handle concurrent batches."""
+        backend = SQLiteDirectory(str(tmp_path / "accounts.db"), pool_size=4, batch_size=50)
+        usernames = [f"user{i}" for i in range(400)]
+        backend.add_accounts(usernames)
+
+        def write(names):
+            assert backend.set_passwords([(name, "pw") for name in names]) == []
+
+        threads = [threading.Thread(target=write, args=(usernames[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(backend.get_password_hash(name) for name in usernames)
+        backend.close()
+
+    def test_invalid_batch_size(self, tmp_path):
+        """Test that a zero batch size is rejected."""
+        with pytest.raises(DirectoryError, match="Batch size"):
+            SQLiteDirectory(str(tmp_path / "accounts.db"), batch_size=0)
+
+    def test_unopenable_path(self, tmp_path):
+        """Test that an unusable path raises DirectoryError."""
+        with pytest.raises(DirectoryError, match="Cannot open account directory"):
+            SQLiteDirectory(str(tmp_path / "missing" / "accounts.db"))
+
+    def test_read_error_is_directory_error(self, directory):
+        """Test that a failed lookup raises DirectoryError, not sqlite3.Error."""
+        with directory.pool.connection() as conn:
+            conn.execute("DROP TABLE accounts")
+        with pytest.raises(DirectoryError, match="Failed to read"):
+            directory.get_password_hash("alice")
+
+
+class TestTransaction:
+    """Test the write transaction helper."""
+
+    def test_failed_commit_is_rolled_back(self):
+        """Test that a COMMIT that fails leaves no transaction open."""
+        conn = sqlite3.connect(":memory:", isolation_level=None)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("CREATE TABLE parent (id INTEGER PRIMARY KEY)")
+        conn.execute(
+            "CREATE TABLE child (parent_id INTEGER"
+            " REFERENCES parent (id) DEFERRABLE INITIALLY DEFERRED)"
+        )
+        with pytest.raises(sqlite3.IntegrityError):
+            with _transaction(conn):
+                conn.execute("INSERT INTO child VALUES (1)")
+        assert not conn.in_transaction
+        with _transaction(conn):
+            conn.execute("INSERT INTO parent VALUES (1)")
+        conn.close()
+
+
+class TestConnectionPool:
+    """Test ConnectionPool."""
+
+    def test_reuses_connections(self, tmp_path):
+        """Test that connections are reused rather than reopened."""
+        pool = ConnectionPool(str(tmp_path / "pool.db"), size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            assert second is first
+        pool.close()
+
+
+class TestOpenDirectory:
+    """Test open_directory function."""
+
+    def test_default_is_simulated(self):
+        """Test that no path gives the simulated directory."""
+        backend = open_directory()
+        assert isinstance(backend, SimulatedDirectory)
+        assert backend.set_passwords([("anyone", "pw")]) == []
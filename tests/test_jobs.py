@@ -0,0 +1,275 @@
+"""Tests for the manifest job runner."""
+
+import gzip
+import json
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner
+
+import commands.jobs as jobs
+from commands.directory import SQLiteDirectory
+from commands.exceptions import OperationCancelled, UserInputError
+from commands.jobs import CPU_BOUND, IO_BOUND, JobSpec, classify, read_manifest, run_jobs
+from commands.log_dump import log_dump
+from commands.output import RecordCollector
+from fixit import cli
+
+
+def _write_manifest(tmp_path, data, name="jobs.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+class TestReadManifest:
+    """Test manifest parsing and validation."""
+
+    def test_json_with_defaults(self, tmp_path):
+        """Test that defaults fill in only the options each command accepts."""
+        path = _write_manifest(
+            tmp_path,
+            {
+                "defaults": {"job_timeout": 5, "count": 2},
+                "jobs": [
+                    {"command": "ping-test", "host": "db1"},
+                    {"command": "log-dump", "path": "app.log", "grep": "ERROR", "name": "errors"},
+                ],
+            },
+        )
+        ping, dump = read_manifest(path)
+        assert ping.name == "ping-test db1"
+        assert ping.options == {"host": "db1", "count": 2}
+        assert ping.timeout == 5.0
+        assert dump.name == "errors"
+        assert dump.options == {"path": "app.log", "grep": "ERROR"}
+
+    def test_toml(self, tmp_path):
+        """Test that .toml manifests are parsed as TOML."""
+        pytest.importorskip("tomllib")
+        path = tmp_path / "jobs.toml"
+        path.write_text('[[jobs]]\ncommand = "reset-user"\nusername = "alice"\n')
+        (job,) = read_manifest(str(path))
+        assert job.command == "reset-user"
+        assert job.options == {"username": "alice"}
+
+    def test_reports_every_invalid_job(self, tmp_path):
+        """Test that all invalid jobs are reported before anything runs."""
+        path = _write_manifest(
+            tmp_path,
+            [
+                {"command": "format-disk"},
+                {"command": "log-dump"},
+                {"command": "ping-test", "host": "db1", "count": "3"},
+                {"command": "ping-test", "host": "db1", "colour": True},
+            ],
+        )
+        with pytest.raises(UserInputError) as exc_info:
+            read_manifest(path)
+        message = str(exc_info.value)
+        assert "job 1: unknown command" in message
+        assert "job 2: log-dump needs a non-empty 'path'" in message
+        assert "job 3: 'count' must be an integer" in message
+        assert "job 4: unknown option 'colour'" in message
+
+    def test_empty_manifest(self, tmp_path):
+        """Test that a manifest without jobs is rejected."""
+        with pytest.raises(UserInputError, match="No jobs"):
+            read_manifest(_write_manifest(tmp_path, {"jobs": []}))
+
+    def test_invalid_json(self, tmp_path):
+        """Test that a malformed manifest raises UserInputError."""
+        path = tmp_path / "jobs.json"
+        path.write_text("{not json")
+        with pytest.raises(UserInputError, match="Invalid JSON"):
+            read_manifest(str(path))
+
+
+class TestClassify:
+    """Test I/O versus CPU job classification."""
+
+    def test_classification(self, tmp_path):
+        """Test that gzip and grep log jobs are CPU-bound and the rest I/O-bound."""
+        plain = tmp_path / "app.log"
+        plain.write_text("hello\n")
+        packed = tmp_path / "app.log.gz"
+        with gzip.open(packed, "wt") as f:
+            f.write("hello\n")
+
+        assert classify(JobSpec(1, "p", "ping-test", {"host": "db1"})) == IO_BOUND
+        assert classify(JobSpec(2, "l", "log-dump", {"path": str(plain)})) == IO_BOUND
+        assert classify(JobSpec(3, "g", "log-dump", {"path": str(plain), "grep": "x"})) == CPU_BOUND
+        assert classify(JobSpec(4, "z", "log-dump", {"path": str(packed)})) == CPU_BOUND
+
+
+class TestRunJobs:
+    """Test concurrent job execution."""
+
+    def test_respects_concurrency_limits(self, monkeypatch):
+        """Test that I/O and CPU jobs run concurrently up to their own limits."""
+        lock = threading.Lock()
+        active = {IO_BOUND: 0, CPU_BOUND: 0}
+        peak = {IO_BOUND: 0, CPU_BOUND: 0}
+
+        def fake_execute(job, collector, cancel, profiler=None, directory=None, notifier=None):
+            kind = job.options["kind"]
+            with lock:
+                active[kind] += 1
+                peak[kind] = max(peak[kind], active[kind])
+            time.sleep(0.05)
+            with lock:
+                active[kind] -= 1
+
+        monkeypatch.setattr(jobs, "_execute", fake_execute)
+        monkeypatch.setattr(jobs, "classify", lambda job: job.options["kind"])
+        specs = [
+            JobSpec(i, f"job{i}", "ping-test", {"kind": IO_BOUND if i % 2 else CPU_BOUND})
+            for i in range(20)
+        ]
+
+        start = time.monotonic()
+        summary = run_jobs(specs, io_workers=5, cpu_workers=2)
+
+        assert summary.ok == 20
+        assert peak == {IO_BOUND: 5, CPU_BOUND: 2}
+        # 10 CPU jobs two at a time bound the run; serially it would take 1s.
+        assert time.monotonic() - start < 0.6
+
+    def test_timeout_reported_and_cancelled(self, monkeypatch):
+        """Test that a slow job is reported at its deadline and told to stop."""
+        cancelled = threading.Event()
+
+        def fake_execute(job, collector, cancel, profiler=None, directory=None, notifier=None):
+            if job.name == "slow":
+                if cancel.wait(5):
+                    cancelled.set()
+                    raise OperationCancelled("stopped")
+
+        monkeypatch.setattr(jobs, "_execute", fake_execute)
+        specs = [
+            JobSpec(1, "slow", "ping-test", {}, timeout=0.2),
+            JobSpec(2, "fast", "ping-test", {}),
+        ]
+        results = []
+
+        start = time.monotonic()
+        summary = run_jobs(specs, on_result=results.append)
+
+        assert time.monotonic() - start < 2
+        assert [(r.job.name, r.status) for r in results] == [("fast", "ok"), ("slow", "timeout")]
+        assert summary.timeout == 1
+        assert cancelled.wait(1)
+
+    def test_failures_do_not_stop_other_jobs(self, tmp_path):
+        """Test that a failing job is reported while the others still run."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("one\ntwo\n")
+        specs = [
+            JobSpec(1, "missing", "log-dump", {"path": str(tmp_path / "missing.log")}),
+            JobSpec(2, "present", "log-dump", {"path": str(log_path)}),
+        ]
+        results = {}
+        summary = run_jobs(specs, on_result=lambda r: results.__setitem__(r.job.name, r))
+
+        assert summary.ok == 1 and summary.failed == 1
+        assert "File not found" in results["missing"].error
+        assert [r["text"] for r in results["present"].records if r["type"] == "line"] == [
+            "one",
+            "two",
+        ]
+
+
+class TestLogDumpCancel:
+    """Test cooperative cancellation of log reads."""
+
+    def test_cancelled_read(self, tmp_path):
+        """Test that a set cancel event stops log_dump with OperationCancelled."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("line\n" * 10)
+        cancel = threading.Event()
+        cancel.set()
+        with pytest.raises(OperationCancelled):
+            log_dump(str(log_path), emitter=RecordCollector(), cancel=cancel)
+
+
+class TestRunCommand:
+    """Test the fixit run command."""
+
+    def test_ndjson_stream(self, tmp_path):
+        """Test that job records and the run summary are emitted."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("INFO ok\nERROR INC-42 failed\n")
+        manifest = _write_manifest(
+            tmp_path,
+            [
+                {"command": "log-dump", "path": str(log_path), "grep": "inc-42"},
+                {"command": "reset-user", "username": "alice"},
+            ],
+        )
+        runner = CliRunner()
+        result = runner.invoke(cli, ["--format", "ndjson", "run", manifest, "--force"])
+
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        lines = [r for r in records if r["type"] == "line"]
+        assert lines == [
+            {
+                "job": f"log-dump {log_path}",
+                "type": "line",
+                "file": str(log_path),
+                "line": 2,
+                "text": "ERROR INC-42 failed",
+            }
+        ]
+        assert sorted(r["status"] for r in records if r["type"] == "job") == ["ok", "ok"]
+        assert records[-1]["type"] == "run"
+        assert records[-1]["ok"] == 2
+
+    def test_reset_jobs_need_confirmation(self, tmp_path):
+        """Test that declining the confirmation runs nothing."""
+        manifest = _write_manifest(tmp_path, [{"command": "reset-user", "username": "alice"}])
+        runner = CliRunner()
+        result = runner.invoke(cli, ["run", manifest], input="n\n")
+        assert "Run cancelled" in result.output
+        assert "New Password" not in result.output
+        assert result.exit_code == 1
+
+    def test_failed_job_sets_exit_code(self, tmp_path):
+        """Test that any failed job makes the run exit non-zero."""
+        manifest = _write_manifest(tmp_path, [{"command": "log-dump", "path": "/nonexistent.log"}])
+        runner = CliRunner()
+        result = runner.invoke(cli, ["run", manifest])
+        assert result.exit_code == 1
+        assert "File not found" in result.output
+        assert "0/1 jobs succeeded" in result.output
+
+    def test_reset_jobs_use_directory(self, tmp_path):
+        """Test that reset-user jobs write through FIXIT_DIRECTORY and fail for missing accounts."""
+        db_path = tmp_path / "accounts.db"
+        directory = SQLiteDirectory(str(db_path))
+        directory.add_accounts(["alice"])
+        manifest = _write_manifest(
+            tmp_path,
+            [
+                {"command": "reset-user", "username": "alice"},
+                {"command": "reset-user", "username": "nobody"},
+            ],
+        )
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["--format", "ndjson", "run", manifest, "--force"],
+            env={"FIXIT_DIRECTORY": str(db_path)},
+        )
+
+        assert result.exit_code == 1
+        jobs_by_name = {
+            r["job"]: r for r in map(json.loads, result.stdout.splitlines()) if r["type"] == "job"
+        }
+        assert jobs_by_name["reset-user alice"]["status"] == "ok"
+        assert jobs_by_name["reset-user nobody"]["status"] == "failed"
+        assert "not found" in jobs_by_name["reset-user nobody"]["error"]
+        assert directory.get_password_hash("alice") is not None
+        assert directory.get_password_hash("nobody") is None
+        directory.close()
@@ -1,6 +1,8 @@
 """Tests for log_dump command."""
 
 import gzip
+import io
+import json
 import tempfile
 from pathlib import Path
 
@@ -8,7 +10,7 @@ import pytest
 from click.testing import CliRunner
 
 from commands.exceptions import LogFileError, UserInputError
-from commands.log_dump import is_gzipped, log_dump
+from commands.log_dump import is_gzipped, log_dump, select_lines
 from fixit import cli
 
 
@@ -33,6 +35,24 @@ class TestIsGzipped:
             path.unlink()
 
 
+class TestSelectLines:
+    """Test select_lines function."""
+
+    def test_select_head(self):
+        """Test head selection keeps source line numbers."""
+        handle = io.StringIO("a\nb\nc\n")
+        selected, total, matched = select_lines(handle, 2)
+        assert selected == [(1, "a\n"), (2, "b\n")]
+        assert (total, matched) == (3, 3)
+
+    def test_select_tail_with_grep(self):
+        """Test tail selection after filtering."""
+        handle = io.StringIO("ERROR 1\nINFO\nerror 2\nERROR 3\n")
+        selected, total, matched = select_lines(handle, 2, tail=True, grep="error")
+        assert selected == [(3, "error 2\n"), (4, "ERROR 3\n")]
+        assert (total, matched) == (4, 3)
+
+
 class TestLogDump:
     """Test log_dump function."""
 
@@ -172,3 +192,26 @@ class TestLogDumpCLI:
         result = runner.invoke(cli, ["log-dump", ""])
         assert result.exit_code == 1
         assert "Log path cannot be empty" in result.output
+
+    def test_log_dump_command_ndjson(self):
+        """Test log dump command with newline-delimited JSON output."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".log") as f:
+            f.write("INFO: Message\nERROR: Error message\nWARN: Warning\n")
+            log_path = f.name
+
+        try:
+            runner = CliRunner()
+            result = runner.invoke(cli, ["--format", "ndjson", "log-dump", log_path, "-g", "error"])
+            assert result.exit_code == 0
+            records = [json.loads(line) for line in result.output.splitlines()]
+            assert records[0] == {
+                "type": "line",
+                "file": log_path,
+                "line": 2,
+                "text": "ERROR: Error message",
+            }
+            assert records[-1]["type"] == "log_dump"
+            assert records[-1]["matched_lines"] == 1
+            assert "Log Dump" not in result.output
+        finally:
+            Path(log_path).unlink()
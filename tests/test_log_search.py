@@ -0,0 +1,204 @@
+"""Tests for recursive log search."""
+
+import gzip
+
+import pytest
+from click.testing import CliRunner
+
+import commands.log_search as log_search
+from commands.exceptions import UserInputError
+from commands.log_search import find_logs, search_file, search_logs
+from commands.output import RecordCollector
+from fixit import cli
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a small log tree with plain, gzipped, binary and excluded files."""
+    (tmp_path / "api").mkdir()
+    (tmp_path / "api" / "app.log").write_text("start\nERROR trace-42 failed\nend\n")
+    (tmp_path / "api" / "big.log").write_text("INFO ok\n" * 1000 + "TRACE-42 late\n")
+    with gzip.open(tmp_path / "api" / "old.log.gz", "wt") as f:
+        f.write("trace-42 archived\n")
+    (tmp_path / "core.bin").write_bytes(b"\x00\x01trace-42")
+    (tmp_path / "archive").mkdir()
+    (tmp_path / "archive" / "skip.log").write_text("trace-42\n")
+    return tmp_path
+
+
+class TestFindLogs:
+    """Test directory walking."""
+
+    def test_include_and_exclude(self, tree):
+        """Test that globs filter files and excluded directories are pruned."""
+        names = [path for path, _ in find_logs(tree, include=["*.log"], exclude=["archive"])]
+        assert names == [str(tree / "api" / "app.log"), str(tree / "api" / "big.log")]
+
+    def test_relative_path_patterns(self, tree):
+        """Test that patterns can match paths relative to the root."""
+        names = [path for path, _ in find_logs(tree, include=["api/*.gz"])]
+        assert names == [str(tree / "api" / "old.log.gz")]
+
+
+class TestSearchFile:
+    """Test searching a single file."""
+
+    def test_line_numbers_across_chunks(self, tmp_path, monkeypatch):
+        """Test that line numbers stay correct when a file is read in many chunks."""
+        monkeypatch.setattr(log_search, "CHUNK_CHARS", 64)
+        path = tmp_path / "app.log"
+        path.write_text("".join(f"line {i}{' HIT' if i % 7 == 0 else ''}\n" for i in range(1, 101)))
+        result = search_file(str(path), "hit", lines=100)
+
+        assert result.scanned_lines == 100
+        assert [number for number, _ in result.matches] == list(range(7, 101, 7))
+        assert result.matches[0] == (7, "line 7 HIT")
+
+    def test_tail_and_limit(self, tmp_path):
+        """Test that the last matching lines are kept in tail mode."""
+        path = tmp_path / "app.log"
+        path.write_text("hit 1\nhit 2\nmiss\nhit 4\n")
+        result = search_file(str(path), "hit", lines=2, tail=True)
+        assert result.matches == [(2, "hit 2"), (4, "hit 4")]
+        assert result.matched_lines == 3
+
+    def test_case_folding_that_changes_length(self, tmp_path):
+        """Test that characters whose lower case is longer do not shift lines."""
+        path = tmp_path / "app.log"
+        path.write_text("İİİİ\nİ trace-42\nnone\n")
+        result = search_file(str(path), "trace-42")
+        assert result.matches == [(2, "İ trace-42")]
+
+    def test_last_line_without_newline(self, tmp_path):
+        """Test that a final unterminated line is searched and counted."""
+        path = tmp_path / "app.log"
+        path.write_text("one\ntwo trace-42")
+        result = search_file(str(path), "trace-42")
+        assert result.matches == [(2, "two trace-42")]
+        assert result.scanned_lines == 2
+
+    def test_first_only_stops_reading(self, tmp_path, monkeypatch):
+        """Test that files-with-matches mode stops at the first hit."""
+        monkeypatch.setattr(log_search, "CHUNK_CHARS", 1024)
+        path = tmp_path / "app.log"
+        path.write_text("trace-42\n" + "filler line\n" * 100_000)
+        result = search_file(str(path), "trace-42", first_only=True)
+        assert result.matched_lines == 1
+        assert result.bytes_read < path.stat().st_size // 10
+
+    def test_binary_and_gzip(self, tree):
+        """Test that binary files are skipped and gzipped files are searched."""
+        assert search_file(str(tree / "core.bin"), "trace-42").binary
+        result = search_file(str(tree / "api" / "old.log.gz"), "trace-42")
+        assert result.gzipped
+        assert result.matches == [(1, "trace-42 archived")]
+
+    def test_unreadable_file_recorded(self, tmp_path):
+        """Test that a corrupt gzip file is reported on the result."""
+        path = tmp_path / "bad.log.gz"
+        path.write_bytes(b"\x1f\x8bnot really gzip")
+        assert search_file(str(path), "x").error is not None
+
+
+class TestSearchLogs:
+    """Test parallel directory search."""
+
+    def test_grouped_records_in_path_order(self, tree):
+        """Test that results are grouped per file, in path order, with line numbers."""
+        collector = RecordCollector()
+        summary = search_logs(str(tree), "TRACE-42", exclude=["archive"], emitter=collector)
+
+        files = [r["file"] for r in collector.records if r["type"] == "file"]
+        assert files == sorted(files)
+        lines = [(r["file"], r["line"]) for r in collector.records if r["type"] == "line"]
+        assert lines == [
+            (str(tree / "api" / "app.log"), 2),
+            (str(tree / "api" / "big.log"), 1001),
+            (str(tree / "api" / "old.log.gz"), 1),
+        ]
+        assert summary.matching_files == 3
+        assert summary.skipped_binary == 1
+        assert collector.records[-1]["type"] == "log_search"
+
+    def test_large_files_first(self, tree, monkeypatch):
+        """Test that files are scheduled largest first."""
+        searched = []
+        real_search = log_search.search_file
+
+        def recording_search(path, *args):
+            searched.append(path)
+            return real_search(path, *args)
+
+        monkeypatch.setattr(log_search, "search_file", recording_search)
+        search_logs(str(tree), "trace-42", include=["*.log"], workers=1, emitter=RecordCollector())
+        assert searched[0] == str(tree / "api" / "big.log")
+
+    def test_process_pool(self, tree):
+        """Test that searching in worker processes gives the same results."""
+        collector = RecordCollector()
+        summary = search_logs(
+            str(tree),
+            "trace-42",
+            files_with_matches=True,
+            workers=2,
+            processes=True,
+            emitter=collector,
+        )
+        assert summary.matching_files == 4
+        assert not [r for r in collector.records if r["type"] == "line"]
+
+    def test_output_file(self, tree):
+        """Test that --output writes grep-style path:line:text lines."""
+        output = tree / "matches.txt"
+        search_logs(
+            str(tree),
+            "trace-42",
+            include=["app.log"],
+            output=str(output),
+            emitter=RecordCollector(),
+        )
+        assert output.read_text() == f"{tree / 'api' / 'app.log'}:2:ERROR trace-42 failed\n"
+
+    def test_requires_grep(self, tree):
+        """Test that a recursive search needs a pattern."""
+        with pytest.raises(UserInputError, match="--grep"):
+            search_logs(str(tree), None)
+
+
+class TestLogDumpRecursiveCommand:
+    """Test log-dump --recursive on the command line."""
+
+    def test_text_output(self, tree):
+        """Test grouped text output with source line numbers."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["log-dump", str(tree), "-r", "-g", "trace-42", "--exclude", "archive"]
+        )
+        assert result.exit_code == 0
+        assert f"📄 {tree / 'api' / 'big.log'}" in result.output
+        assert "  1001 │ TRACE-42 late" in result.output
+        assert "3 of 4 files (1 binary skipped)" in result.output
+
+    def test_files_with_matches(self, tree):
+        """Test that -l lists only the matching files."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["log-dump", str(tree), "-r", "-g", "trace-42", "-l", "--include", "*.log"]
+        )
+        assert result.exit_code == 0
+        assert f"\n{tree / 'archive' / 'skip.log'}\n" in result.output
+        assert "│" not in result.output
+
+    def test_directory_without_recursive(self, tree):
+        """Test that a directory without --recursive points at the option."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["log-dump", str(tree)])
+        assert result.exit_code == 1
+        assert "--recursive" in result.output
+
+    def test_search_options_need_recursive(self, tree):
+        """Test that search-only options are rejected without --recursive."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["log-dump", str(tree / "api" / "app.log"), "-l"])
+        assert result.exit_code == 1
+        assert "need --recursive" in result.output
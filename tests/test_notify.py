@@ -0,0 +1,239 @@
+"""Tests for SMTP notifications."""
+
+import socket
+import socketserver
+import ssl
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner
+
+import commands.notify as notify
+from commands.notify import NotificationQueue, SmtpSettings, build_reset_notice
+from commands.reset_user import ResetRequest, reset_user, reset_users
+from fixit import cli
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages from smtplib."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.sessions += 1
+        self.reply("220 localhost test SMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command.startswith("MAIL"):
+                self.reply("250 OK")
+            elif command.startswith("RCPT"):
+                with server.lock:
+                    reject = server.transient_failures > 0
+                    server.transient_failures -= reject
+                if reject:
+                    self.reply("451 Try again later")
+                    return
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                body = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    body.append(data)
+                with server.lock:
+                    server.messages.append(b"".join(body).decode())
+                self.reply("250 Queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.sessions = 0
+        self.messages = []
+        self.transient_failures = 0
+
+
+@pytest.fixture
+def smtp_server():
+    """Local SMTP stand-in running on a background thread."""
+    server = _SMTPServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _settings(server, **kwargs):
+    return SmtpSettings("127.0.0.1", server.server_address[1], local_hostname="localhost", **kwargs)
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestBuildResetNotice:
+    """Test build_reset_notice function."""
+
+    def test_notice_addresses_account(self):
+        """Test that the notice is addressed to the account's owner."""
+        message = build_reset_notice("alice", "alice@example.com", "it@example.com")
+        assert message["To"] == "alice@example.com"
+        assert "alice" in message["Subject"]
+        assert "password" in message.get_content().lower()
+
+
+class TestNotificationQueue:
+    """Test NotificationQueue delivery."""
+
+    def test_reuses_session(self, smtp_server):
+        """Test that many messages share one SMTP session."""
+        notifier = NotificationQueue(_settings(smtp_server), workers=1)
+        for i in range(20):
+            notifier.notify_reset(f"user{i}", f"user{i}@example.com")
+        stats = notifier.close(timeout=10)
+
+        assert stats.sent == 20
+        assert stats.sessions == 1
+        assert smtp_server.sessions == 1
+        assert len(smtp_server.messages) == 20
+
+    def test_recycles_session(self, smtp_server):
+        """Test that sessions are replaced after max_per_session messages."""
+        notifier = NotificationQueue(_settings(smtp_server), workers=1, max_per_session=5)
+        for i in range(12):
+            notifier.notify_reset(f"user{i}", f"user{i}@example.com")
+        stats = notifier.close(timeout=10)
+
+        assert stats.sent == 12
+        assert stats.sessions == 3
+
+    def test_retries_transient_failure(self, smtp_server):
+        """Test that a temporary rejection is retried with a new session."""
+        smtp_server.transient_failures = 2
+        notifier = NotificationQueue(_settings(smtp_server), workers=1, backoff=0.01)
+        notifier.notify_reset("alice", "alice@example.com")
+        stats = notifier.close(timeout=10)
+
+        assert stats.sent == 1
+        assert stats.failed == 0
+        assert len(smtp_server.messages) == 1
+
+    def test_close_respects_deadline(self):
+        """Test that an unreachable server cannot stall close past its deadline."""
+        settings = SmtpSettings("127.0.0.1", _unused_port(), local_hostname="localhost")
+        notifier = NotificationQueue(settings, workers=1, retries=10, backoff=5.0)
+        for i in range(5):
+            notifier.notify_reset(f"user{i}", f"user{i}@example.com")
+
+        start = time.monotonic()
+        stats = notifier.close(timeout=0.5)
+
+        assert time.monotonic() - start < 3
+        assert stats.sent == 0
+        assert stats.failed + stats.dropped == 5
+
+    def test_bad_notice_does_not_stop_sender(self, smtp_server):
+        """Test that a notice that cannot be built is counted and later ones still go out."""
+        notifier = NotificationQueue(_settings(smtp_server), workers=1)
+        notifier.notify_reset("bad\nname", "bad@example.com")
+        notifier.notify_reset("alice", "alice@example.com")
+        stats = notifier.close(timeout=10)
+
+        assert stats.failed == 1
+        assert stats.sent == 1
+        assert stats.dropped == 0
+
+    def test_starttls_verifies_certificate(self, monkeypatch):
+        """Test that STARTTLS checks the server certificate and host name."""
+        contexts = []
+
+        class FakeSMTP:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def starttls(self, context=None):
+                contexts.append(context)
+
+            def login(self, user, password):
+                pass
+
+        monkeypatch.setattr(notify.smtplib, "SMTP", FakeSMTP)
+        notify._connect(SmtpSettings("mail.example.com", starttls=True, username="u"))
+
+        assert contexts[0].verify_mode == ssl.CERT_REQUIRED
+        assert contexts[0].check_hostname
+
+    def test_send_after_close(self, smtp_server):
+        """Test that a closed queue rejects new messages."""
+        notifier = NotificationQueue(_settings(smtp_server))
+        notifier.close()
+        with pytest.raises(RuntimeError):
+            notifier.notify_reset("alice", "alice@example.com")
+
+
+class TestResetNotifications:
+    """Test notifications from password resets."""
+
+    def test_reset_user_queues_notice(self, smtp_server):
+        """Test that a single reset queues its notice."""
+        notifier = NotificationQueue(_settings(smtp_server))
+        reset_user("alice", force=True, email="alice@example.com", notifier=notifier)
+        notifier.close(timeout=10)
+        assert "alice@example.com" in smtp_server.messages[0]
+
+    def test_bulk_reset_notifies_accounts_with_email(self, smtp_server, tmp_path):
+        """Test that bulk resets notify every account that has an email."""
+        notifier = NotificationQueue(_settings(smtp_server), workers=2)
+        requests = [
+            ResetRequest(f"user{i}", f"user{i}@example.com" if i % 2 else None) for i in range(40)
+        ]
+        reset_users(requests, str(tmp_path / "results.csv"), force=True, notifier=notifier)
+        stats = notifier.close(timeout=10)
+
+        assert stats.sent == 20
+        assert stats.sessions <= 2
+
+    def test_reset_user_command_smtp(self, smtp_server):
+        """Test reset user command delivering through SMTP."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            [
+                "reset-user",
+                "testuser",
+                "--force",
+                "--email",
+                "test@example.com",
+                "--smtp-host",
+                "127.0.0.1",
+                "--smtp-port",
+                str(smtp_server.server_address[1]),
+            ],
+        )
+        assert result.exit_code == 0
+        assert "Notification queued for" in result.output
+        assert "Delivered 1 notification" in result.output
+        assert len(smtp_server.messages) == 1
@@ -0,0 +1,64 @@
+"""Tests for machine-readable output."""
+
+import io
+import json
+
+import pytest
+
+from commands.output import RecordEmitter, get_emitter
+
+
+class TestRecordEmitter:
+    """Test RecordEmitter serialisation."""
+
+    def test_ndjson_one_record_per_line(self):
+        """Test that ndjson writes one compact object per line."""
+        stream = io.StringIO()
+        emitter = RecordEmitter("ndjson", stream=stream)
+        emitter.emit({"type": "line", "line": 1, "text": "héllo"})
+        emitter.emit({"type": "line", "line": 2, "text": "world"})
+        emitter.close()
+
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line)["line"] for line in lines] == [1, 2]
+        assert "héllo" in lines[0]
+        assert emitter.count == 2
+
+    def test_json_array(self):
+        """Test that json writes a single array document."""
+        stream = io.StringIO()
+        emitter = RecordEmitter("json", stream=stream)
+        emitter.emit({"a": 1})
+        emitter.emit({"b": 2})
+        emitter.close()
+
+        assert json.loads(stream.getvalue()) == [{"a": 1}, {"b": 2}]
+
+    def test_json_empty_array(self):
+        """Test that json with no records is still a valid document."""
+        stream = io.StringIO()
+        emitter = RecordEmitter("json", stream=stream)
+        emitter.close()
+        emitter.close()
+
+        assert json.loads(stream.getvalue()) == []
+
+    def test_buffers_until_threshold(self):
+        """Test that records are buffered until the buffer size is reached."""
+        stream = io.StringIO()
+        emitter = RecordEmitter("ndjson", stream=stream, buffer_size=1024)
+        emitter.emit({"x": 1})
+        assert stream.getvalue() == ""
+
+        emitter.emit({"x": "y" * 2048})
+        assert stream.getvalue().count("\n") == 2
+
+    def test_unsupported_format(self):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError):
+            RecordEmitter("xml")
+
+    def test_get_emitter_text(self):
+        """Test that text format needs no emitter."""
+        assert get_emitter("text") is None
+        assert isinstance(get_emitter("ndjson"), RecordEmitter)
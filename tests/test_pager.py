@@ -0,0 +1,109 @@
+"""Tests for streaming output into a pager."""
+
+import os
+import sys
+
+from click.testing import CliRunner
+
+import commands.pager as pager
+from commands.log_dump import _paged_lines, log_dump
+from commands.pager import page
+from commands.profiling import Profiler
+from fixit import cli
+
+
+def _use_pager(monkeypatch, script):
+    """Make page() run a Python one-liner as the pager."""
+    command = ([sys.executable, "-c", script], dict(os.environ))
+    monkeypatch.setattr(pager, "_pager_command", lambda: command)
+
+
+class TestPage:
+    """Test the pager pump."""
+
+    def test_all_text_reaches_pager(self, monkeypatch, tmp_path):
+        """Test that every chunk is delivered when the pager reads to the end."""
+        target = tmp_path / "paged.txt"
+        _use_pager(
+            monkeypatch, f"import sys; open({str(target)!r}, 'wb').write(sys.stdin.buffer.read())"
+        )
+        assert page(f"line {i}\n" for i in range(10_000)) is True
+        assert target.read_text().splitlines() == [f"line {i}" for i in range(10_000)]
+
+    def test_quitting_pager_stops_producer(self, monkeypatch):
+        """Test that the generator is closed as soon as the pager exits."""
+        _use_pager(monkeypatch, "import sys; sys.stdin.buffer.read(10)")
+        produced = []
+        closed = []
+
+        def lines():
+            try:
+                for i in range(10_000_000):
+                    produced.append(i)
+                    yield f"line {i}\n"
+            finally:
+                closed.append(True)
+
+        assert page(lines()) is False
+        assert closed == [True]
+        assert len(produced) < 1_000_000
+
+    def test_quit_noticed_between_lines(self, monkeypatch):
+        """Test that empty heartbeat chunks let a quiet producer notice a quit."""
+        _use_pager(monkeypatch, "pass")
+
+        def quiet():
+            yield "header\n"
+            while True:
+                yield ""
+
+        assert page(quiet()) is False
+
+    def test_plain_output_without_terminal(self, capsys):
+        """Test that output is written directly when stdout is not a terminal."""
+        assert page(iter(["one\n", "", "two\n"])) is True
+        assert capsys.readouterr().out == "one\ntwo\n"
+
+
+class TestLogDumpPager:
+    """Test log_dump --pager."""
+
+    def test_read_stops_when_pager_quits(self, monkeypatch, tmp_path):
+        """Test that quitting the pager stops reading a large log."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("INFO request served\n" * 500_000)
+        _use_pager(monkeypatch, "import sys; sys.stdin.buffer.read(100)")
+        profiler = Profiler("log-dump")
+        log_dump(str(log_path), lines=1_000_000, pager=True, profiler=profiler)
+        assert profiler.counters["lines_scanned"] < 100_000
+
+    def test_tail_scan_stops_when_pager_quits(self, tmp_path):
+        """Test that a tail scan yields between chunks and stops once closed."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("INFO request served\n" * 100_000)
+        profiler = Profiler("log-dump")
+        chunks = _paged_lines(log_path, False, 10, True, None, None, profiler, heartbeat_lines=1000)
+        while next(chunks):
+            pass
+        # The pump closes the generator when it sees the pager has exited.
+        chunks.close()
+        assert profiler.counters["lines_scanned"] == 1000
+
+    def test_rendered_lines(self, capsys, tmp_path):
+        """Test that paged output matches the normal rendering."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("INFO a\nERROR b\nERROR c\n")
+        log_dump(str(log_path), lines=1, grep="ERROR", pager=True)
+        out = capsys.readouterr().out
+        assert "   1 │ ERROR b" in out
+        assert "ERROR c" not in out
+        assert "Showed 1 lines from head" in out
+
+    def test_not_with_json(self, tmp_path):
+        """Test that --pager is rejected for machine-readable output."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("x\n")
+        runner = CliRunner()
+        result = runner.invoke(cli, ["--format", "json", "log-dump", str(log_path), "--pager"])
+        assert result.exit_code == 1
+        assert "--pager cannot be combined" in result.output
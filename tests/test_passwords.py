@@ -0,0 +1,92 @@
+"""Tests for batched password generation."""
+
+import string
+from collections import Counter
+from itertools import islice
+
+import pytest
+
+from commands.exceptions import UserInputError
+from commands.passwords import (
+    AMBIGUOUS_CHARACTERS,
+    DEFAULT_SYMBOLS,
+    PasswordPolicy,
+    generate_passwords,
+)
+
+
+class TestGeneratePasswords:
+    """Test generate_passwords function."""
+
+    def test_count_and_length(self):
+        """Test that the requested number of passwords is produced."""
+        passwords = list(generate_passwords(500, 20))
+        assert len(passwords) == 500
+        assert all(len(p) == 20 for p in passwords)
+        assert len(set(passwords)) == 500
+
+    def test_default_alphabet(self):
+        """Test that passwords only use letters, digits and default symbols."""
+        allowed = set(string.ascii_letters + string.digits + DEFAULT_SYMBOLS)
+        assert set("".join(generate_passwords(200))) <= allowed
+
+    def test_is_lazy(self):
+        """Test that passwords are generated on demand."""
+        passwords = generate_passwords(10**12, 8)
+        assert len(list(islice(passwords, 3))) == 3
+
+    def test_zero_count(self):
+        """Test that zero passwords is an empty batch."""
+        assert list(generate_passwords(0)) == []
+
+    def test_policy_minimums(self):
+        """Test that every password satisfies the class minimums."""
+        policy = PasswordPolicy(min_lowercase=2, min_uppercase=3, min_digits=1, min_symbols=2)
+        for password in generate_passwords(1000, 8, policy):
+            assert len(password) == 8
+            assert sum(c in string.ascii_lowercase for c in password) >= 2
+            assert sum(c in string.ascii_uppercase for c in password) >= 3
+            assert sum(c in string.digits for c in password) >= 1
+            assert sum(c in DEFAULT_SYMBOLS for c in password) >= 2
+
+    def test_policy_exclude_ambiguous(self):
+        """Test that ambiguous characters are never used."""
+        policy = PasswordPolicy(min_digits=4, exclude_ambiguous=True)
+        text = "".join(generate_passwords(500, 16, policy))
+        assert not set(text) & set(AMBIGUOUS_CHARACTERS)
+
+    def test_policy_without_symbols(self):
+        """Test that an empty symbol set disables symbols."""
+        policy = PasswordPolicy(symbols="")
+        assert "".join(generate_passwords(200, 16, policy)).isalnum()
+
+    def test_characters_are_uniform(self):
+        """Test that no character is noticeably over- or under-represented."""
+        alphabet = string.ascii_letters + string.digits + DEFAULT_SYMBOLS
+        counts = Counter("".join(generate_passwords(5000, 70)))
+        expected = 5000 * 70 / len(alphabet)
+        assert set(counts) == set(alphabet)
+        assert all(abs(n - expected) < expected * 0.1 for n in counts.values())
+
+    def test_required_characters_are_spread(self):
+        """Test that required characters are not stuck in fixed positions."""
+        policy = PasswordPolicy(min_digits=1, symbols="")
+        positions = Counter()
+        for password in generate_passwords(3000, 6, policy):
+            positions.update(i for i, c in enumerate(password) if c.isdigit())
+        assert set(positions) == set(range(6))
+
+    @pytest.mark.parametrize(
+        "count,length,policy,message",
+        [
+            (-1, 12, PasswordPolicy(), "cannot be negative"),
+            (1, 0, PasswordPolicy(), "at least 1"),
+            (1, 4, PasswordPolicy(min_digits=3, min_symbols=2), "more characters than the length"),
+            (1, 12, PasswordPolicy(min_symbols=1, symbols=""), "character class that is empty"),
+            (1, 12, PasswordPolicy(symbols="é"), "must be ASCII"),
+        ],
+    )
+    def test_invalid_arguments(self, count, length, policy, message):
+        """Test that impossible requests are rejected up front."""
+        with pytest.raises(UserInputError, match=message):
+            generate_passwords(count, length, policy)
@@ -1,5 +1,6 @@
 """Tests for ping_test command."""
 
+import json
 import subprocess
 from unittest.mock import MagicMock, patch
 
@@ -107,3 +108,19 @@ class TestPingTestCLI:
         result = runner.invoke(cli, ["ping-test", ""])
         assert result.exit_code == 1
         assert "Host cannot be empty" in result.output
+
+    @patch("commands.ping_test.subprocess.run")
+    def test_ping_test_command_json(self, mock_subprocess):
+        """Test ping test command with JSON output."""
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = "4 packets transmitted, 4 received"
+        mock_subprocess.return_value = mock_result
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["--format", "json", "ping-test", "example.com"])
+        assert result.exit_code == 0
+        (record,) = json.loads(result.output)
+        assert record["type"] == "ping"
+        assert record["reachable"] is True
+        assert record["stats"] == "4 packets transmitted, 4 received"
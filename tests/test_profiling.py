@@ -0,0 +1,167 @@
+"""Tests for --profile phase timers and reports."""
+
+import gzip
+import json
+from unittest.mock import MagicMock, patch
+
+from click.testing import CliRunner
+
+from commands.log_dump import log_dump
+from commands.output import RecordCollector
+from commands.ping_test import ping_test
+from commands.profiling import Profiler, write_report
+from fixit import cli
+
+
+def _write_log(path, count=100):
+    lines = "".join(f"INFO line {i}\n" if i % 10 else f"ERROR line {i}\n" for i in range(count))
+    if str(path).endswith(".gz"):
+        with gzip.open(path, "wt") as f:
+            f.write(lines)
+    else:
+        path.write_text(lines)
+    return len(lines)
+
+
+class TestCommandCounters:
+    """Test that commands record phases and counters."""
+
+    def test_plain_log(self, tmp_path):
+        """Test read, scan and render phases and line counters for a plain log."""
+        log_path = tmp_path / "app.log"
+        size = _write_log(log_path)
+        profiler = Profiler("log-dump")
+        log_dump(str(log_path), lines=5, grep="error", emitter=RecordCollector(), profiler=profiler)
+
+        assert {"read", "scan", "render"} <= set(profiler.phases)
+        assert "decompress" not in profiler.phases
+        assert profiler.counters == {
+            "bytes_read": size,
+            "lines_scanned": 100,
+            "lines_matched": 10,
+            "lines_shown": 5,
+        }
+
+    def test_gzip_log(self, tmp_path):
+        """Test that decompression is timed and counted separately."""
+        log_path = tmp_path / "app.log.gz"
+        size = _write_log(log_path)
+        profiler = Profiler("log-dump")
+        collector = RecordCollector()
+        log_dump(str(log_path), lines=3, tail=True, emitter=collector, profiler=profiler)
+
+        assert "decompress" in profiler.phases
+        assert profiler.counters["bytes_decompressed"] == size
+        assert profiler.counters["bytes_read"] == log_path.stat().st_size
+        assert [r["line"] for r in collector.records if r["type"] == "line"] == [98, 99, 100]
+
+    @patch("commands.ping_test.subprocess.run")
+    def test_ping_subprocess_wait(self, mock_subprocess):
+        """Test that waiting on ping is recorded."""
+        mock_subprocess.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        profiler = Profiler("ping-test")
+        ping_test("example.com", count=3, emitter=RecordCollector(), profiler=profiler)
+
+        assert "subprocess_wait" in profiler.phases
+        assert profiler.counters["pings_sent"] == 3
+
+
+class TestReports:
+    """Test report rendering."""
+
+    def _profiler(self):
+        profiler = Profiler('log"dump')
+        profiler.start()
+        profiler.add_time("read", 0.25)
+        profiler.count("lines_scanned", 1200)
+        profiler.stop()
+        return profiler
+
+    def test_table(self):
+        """Test the human-readable table."""
+        text = self._profiler().render("table")
+        assert "read" in text
+        assert "1,200" in text
+
+    def test_json(self):
+        """Test the JSON report."""
+        report = json.loads(self._profiler().render("json"))
+        assert report["phases"] == {"read": 0.25}
+        assert report["counters"] == {"lines_scanned": 1200}
+
+    def test_prometheus(self):
+        """Test the Prometheus textfile format, including label escaping."""
+        text = self._profiler().render("prometheus")
+        assert "# TYPE fixit_phase_seconds gauge" in text
+        assert 'fixit_phase_seconds{command="log\\"dump",phase="read"} 0.250000' in text
+        assert 'fixit_counter{command="log\\"dump",counter="lines_scanned"} 1200' in text
+
+    def test_optional_tracers(self):
+        """Test that cProfile and tracemalloc results are included when enabled."""
+        profiler = Profiler("x", python=True, memory=True)
+        profiler.start()
+        [str(i) for i in range(1000)]
+        profiler.stop()
+        report = profiler.as_dict()
+        assert report["functions"]
+        assert report["memory"]["peak_bytes"] > 0
+
+    def test_write_report_replaces_file(self, tmp_path):
+        """Test that reports replace the target file without leaving temp files."""
+        target = tmp_path / "fixit.prom"
+        target.write_text("old\n")
+        write_report("new\n", str(target))
+        assert target.read_text() == "new\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["fixit.prom"]
+
+
+class TestProfileOption:
+    """Test the global --profile options."""
+
+    def test_report_written_to_file(self, tmp_path):
+        """Test that --profile-output receives the report and stdout stays clean."""
+        log_path = tmp_path / "app.log"
+        _write_log(log_path, count=20)
+        report_path = tmp_path / "profile.json"
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            [
+                "--format",
+                "ndjson",
+                "--profile-format",
+                "json",
+                "--profile-output",
+                str(report_path),
+                "log-dump",
+                str(log_path),
+                "--grep",
+                "ERROR",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert all(json.loads(line) for line in result.stdout.splitlines())
+        report = json.loads(report_path.read_text())
+        assert report["command"] == "log-dump"
+        assert report["counters"]["lines_matched"] == 2
+
+    def test_report_on_stderr(self, tmp_path):
+        """Test that the table report goes to stderr by default."""
+        log_path = tmp_path / "app.log"
+        _write_log(log_path, count=5)
+        runner = CliRunner()
+        result = runner.invoke(cli, ["--profile", "log-dump", str(log_path)])
+
+        assert result.exit_code == 0
+        assert "Profile: log-dump" in result.stderr
+        assert "Profile:" not in result.stdout
+
+    def test_no_profiler_without_option(self, tmp_path):
+        """Test that commands get no profiler unless profiling is requested."""
+        log_path = tmp_path / "app.log"
+        _write_log(log_path, count=5)
+        with patch("commands.log_dump.log_dump") as mock_dump:
+            result = CliRunner().invoke(cli, ["log-dump", str(log_path)])
+        assert result.exit_code == 0
+        assert mock_dump.call_args.kwargs["profiler"] is None
@@ -1,10 +1,22 @@
 """Tests for reset_user command."""
 
+import csv
+import json
+import os
+import sys
+
 import pytest
 from click.testing import CliRunner
 
-from commands.exceptions import UserInputError
-from commands.reset_user import generate_password, reset_user
+from commands.directory import SQLiteDirectory
+from commands.exceptions import DirectoryError, UserInputError
+from commands.reset_user import (
+    ResetRequest,
+    generate_password,
+    read_reset_requests,
+    reset_user,
+    reset_users,
+)
 from fixit import cli
 
 
@@ -43,6 +55,120 @@ class TestResetUser:
             reset_user("   ")
 
 
+class TestReadResetRequests:
+    """Test bulk reset input parsing."""
+
+    def test_with_header(self):
+        """Test CSV with a header row and email column."""
+        rows = ["email,username\n", "a@example.com,alice\n", ",bob\n"]
+        assert read_reset_requests(rows) == [
+            ResetRequest("alice", "a@example.com", 2),
+            ResetRequest("bob", None, 3),
+        ]
+
+    def test_plain_list(self):
+        """Test one username per line, skipping blanks and comments."""
+        rows = ["# rotation\n", "alice\n", "\n", "bob,b@example.com\n"]
+        requests = read_reset_requests(rows)
+        assert [r.username for r in requests] == ["alice", "bob"]
+        assert requests[1].email == "b@example.com"
+
+    def test_account_named_like_header(self):
+        """Test that a first row that is not exactly a header is kept as data."""
+        rows = ["username,u@example.com\n", "usernames\n"]
+        assert read_reset_requests(rows) == [
+            ResetRequest("username", "u@example.com", 1),
+            ResetRequest("usernames", None, 2),
+        ]
+
+    def test_reports_all_errors(self):
+        """Test that every invalid row is reported up front."""
+        rows = ["alice\n", " ,x@example.com\n", "alice\n", "carol,not-an-email\n"]
+        with pytest.raises(UserInputError) as excinfo:
+            read_reset_requests(rows, source="users.csv")
+        message = str(excinfo.value)
+        assert "users.csv" in message
+        assert "line 2: username cannot be empty" in message
+        assert "line 3: duplicate username 'alice'" in message
+        assert "line 4: invalid email" in message
+
+    def test_rejects_control_characters(self):
+        """Test that quoted fields with newlines or other control characters are rejected."""
+        rows = ['"bad\nname",a@example.com\n', 'alice,"a@example.com\r\nBcc: x@example.com"\n']
+        with pytest.raises(UserInputError) as excinfo:
+            read_reset_requests(rows)
+        message = str(excinfo.value)
+        assert "line 1: control characters in entry for 'bad\\nname'" in message
+        assert "for 'alice'" in message
+
+    def test_empty_input(self):
+        """Test that an empty batch is rejected."""
+        with pytest.raises(UserInputError, match="No usernames found"):
+            read_reset_requests(["username\n"])
+
+
+class TestResetUsers:
+    """Test reset_users function."""
+
+    def test_writes_private_results_file(self, tmp_path):
+        """Test that results stream to an owner-only CSV file."""
+        results_path = tmp_path / "results.csv"
+        requests = [ResetRequest(f"user{i}", f"user{i}@example.com") for i in range(50)]
+
+        results = reset_users(requests, str(results_path), force=True, workers=4)
+
+        assert len(results) == 50
+        assert all(r.status == "reset" and r.password is None for r in results)
+        with open(results_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert sorted(row["username"] for row in rows) == sorted(r.username for r in requests)
+        assert all(len(row["password"]) == 12 for row in rows)
+        if sys.platform != "win32":
+            assert os.stat(results_path).st_mode & 0o777 == 0o600
+
+    def test_directory_batches(self, tmp_path):
+        """Test that bulk resets write through the directory and report missing accounts."""
+        directory = SQLiteDirectory(str(tmp_path / "accounts.db"), pool_size=2, batch_size=7)
+        directory.add_accounts(f"user{i}" for i in range(30))
+        requests = [ResetRequest(f"user{i}") for i in range(32)]
+
+        results = reset_users(
+            requests, str(tmp_path / "results.csv"), force=True, workers=2, directory=directory
+        )
+
+        failed = {r.username: r.error for r in results if r.status == "failed"}
+        assert failed == {"user30": "not found in directory", "user31": "not found in directory"}
+        assert all(directory.get_password_hash(f"user{i}") for i in range(30))
+        directory.close()
+
+    def test_refuses_existing_results_file(self, tmp_path):
+        """Test that an existing results file is never overwritten."""
+        results_path = tmp_path / "results.csv"
+        results_path.write_text("keep me")
+        with pytest.raises(UserInputError, match="already exists"):
+            reset_users([ResetRequest("alice")], str(results_path), force=True)
+        assert results_path.read_text() == "keep me"
+
+
+class TestResetUserDirectory:
+    """Test single resets against a directory."""
+
+    def test_reset_user_updates_directory(self, tmp_path):
+        """Test that the new password is stored in the directory."""
+        directory = SQLiteDirectory(str(tmp_path / "accounts.db"))
+        directory.add_accounts(["alice"])
+        reset_user("alice", force=True, directory=directory)
+        assert directory.get_password_hash("alice") is not None
+        directory.close()
+
+    def test_reset_user_missing_account(self, tmp_path):
+        """Test that resetting an unknown account raises DirectoryError."""
+        directory = SQLiteDirectory(str(tmp_path / "accounts.db"))
+        with pytest.raises(DirectoryError, match="not found"):
+            reset_user("ghost", force=True, directory=directory)
+        directory.close()
+
+
 class TestResetUserCLI:
     """Test reset-user CLI command."""
 
@@ -90,3 +216,87 @@ class TestResetUserCLI:
         result = runner.invoke(cli, ["reset-user", ""])
         assert result.exit_code == 1
         assert "Username cannot be empty" in result.output
+
+    def test_reset_user_command_ndjson(self):
+        """Test reset user command with newline-delimited JSON output."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["--format", "ndjson", "reset-user", "testuser", "--force"])
+        assert result.exit_code == 0
+        record = json.loads(result.output)
+        assert record["username"] == "testuser"
+        assert record["status"] == "reset"
+        assert len(record["password"]) == 12
+
+    def test_reset_user_command_bulk(self, tmp_path):
+        """Test bulk reset from a CSV file with a single confirmation."""
+        users = tmp_path / "users.csv"
+        users.write_text("username,email\nalice,a@example.com\nbob,\n")
+        results_path = tmp_path / "results.csv"
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["reset-user", "--from-file", str(users), "--results", str(results_path)],
+            input="y\n",
+        )
+        assert result.exit_code == 0
+        assert "Accounts reset: 2" in result.output
+        assert result.output.count("[y/N]") == 1
+        for line in results_path.read_text().splitlines()[1:]:
+            assert line.split(",")[3] not in result.output
+
+    def test_reset_user_command_bulk_stdin_ndjson(self, tmp_path):
+        """Test bulk reset from stdin with a JSON summary."""
+        results_path = tmp_path / "results.csv"
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["--format", "ndjson", "reset-user", "--from-file", "-", "--results", str(results_path), "--force"],
+            input="alice\nbob\ncarol\n",
+        )
+        assert result.exit_code == 0
+        summary = json.loads(result.output)
+        assert summary["type"] == "bulk_reset"
+        assert summary["reset"] == 3
+
+    def test_reset_user_command_bulk_requires_results(self, tmp_path):
+        """Test that bulk mode requires a results file."""
+        users = tmp_path / "users.csv"
+        users.write_text("alice\n")
+        runner = CliRunner()
+        result = runner.invoke(cli, ["reset-user", "--from-file", str(users), "--force"])
+        assert result.exit_code == 1
+        assert "--results is required" in result.output
+
+    def test_reset_user_command_bulk_partial_failure(self, tmp_path):
+        """Test that a batch with accounts that could not be reset exits non-zero."""
+        db_path = tmp_path / "accounts.db"
+        SQLiteDirectory(str(db_path)).add_accounts(["alice", "carol"])
+        users = tmp_path / "users.csv"
+        users.write_text("alice\nghost\ncarol\n")
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["reset-user", "--from-file", str(users), "--results", str(tmp_path / "out.csv"),
+             "--force", "--directory", str(db_path)],
+        )
+        assert result.exit_code == 1
+        assert "Accounts reset: 2" in result.output
+
+    def test_reset_user_command_missing_username(self):
+        """Test that a username or batch file is required."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["reset-user"])
+        assert result.exit_code == 1
+        assert "Provide a USERNAME or --from-file" in result.output
+
+    def test_reset_user_command_directory(self, tmp_path):
+        """Test reset user command against a SQLite directory."""
+        db_path = tmp_path / "accounts.db"
+        SQLiteDirectory(str(db_path)).add_accounts(["testuser"])
+        runner = CliRunner()
+        result = runner.invoke(cli, ["reset-user", "testuser", "--force", "--directory", str(db_path)])
+        assert result.exit_code == 0
+        result = runner.invoke(cli, ["reset-user", "ghost", "--force", "--directory", str(db_path)])
+        assert result.exit_code == 1
+        assert "User not found in directory: ghost" in result.output
@@ -0,0 +1,115 @@
+"""Cold-start tests for the fixit entry point.
+
+These run fresh interpreters with ``-X importtime`` and fail if the entry point
+starts importing command implementations eagerly or its own import cost grows
+past the budget.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must only be loaded once a command that needs them runs.
+DEFERRED_MODULES = {
+    "commands.reset_user",
+    "commands.ping_test",
+    "commands.log_dump",
+    "commands.log_search",
+    "commands.checkpoints",
+    "commands.daemon",
+    "commands.directory",
+    "commands.jobs",
+    "commands.notify",
+    "commands.pager",
+    "commands.passwords",
+    "commands.profiling",
+    "cProfile",
+    "concurrent.futures",
+    "csv",
+    "gzip",
+    "json",
+    "logging",
+    "secrets",
+    "smtplib",
+    "socketserver",
+    "sqlite3",
+    "subprocess",
+    "traceback",
+    "tracemalloc",
+}
+
+# Import time of fixit on top of click itself, in microseconds.
+IMPORT_BUDGET_US = 30_000
+
+
+def _import_times(*args, cwd=REPO_ROOT):
+    """Run Python with -X importtime and return {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        timeout=60,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Test entry point import behaviour."""
+
+    def test_import_defers_command_modules(self):
+        """Test that importing the CLI loads no command implementation."""
+        loaded = set(_import_times("-c", "import fixit"))
+        assert "fixit" in loaded
+        assert not loaded & DEFERRED_MODULES
+
+    def test_help_defers_command_modules(self):
+        """Test that --help does not load command implementations."""
+        loaded = set(_import_times("fixit.py", "--help"))
+        assert not loaded & DEFERRED_MODULES
+
+    def test_command_loads_only_its_module(self, tmp_path):
+        """Test that running log-dump does not load other commands."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("INFO started\n")
+        loaded = set(_import_times(str(REPO_ROOT / "fixit.py"), "log-dump", str(log_path)))
+        assert "commands.log_dump" in loaded
+        assert not loaded & {"commands.reset_user", "commands.ping_test", "gzip", "smtplib"}
+
+    def test_default_level_skips_logging_setup(self, tmp_path):
+        """Test that logging is only configured when --log-level asks for it."""
+        log_path = tmp_path / "app.log"
+        log_path.write_text("INFO started\n")
+        script = (
+            "import logging, sys, fixit; "
+            "fixit.cli.main(sys.argv[1:], standalone_mode=False); "
+            "print(len(logging.getLogger().handlers))"
+        )
+        for args, handlers in (([], "0"), (["--log-level", "INFO"], "1")):
+            result = subprocess.run(
+                [sys.executable, "-c", script, *args, "log-dump", str(log_path)],
+                capture_output=True,
+                text=True,
+                cwd=REPO_ROOT,
+                timeout=60,
+            )
+            assert result.stdout.splitlines()[-1] == handlers
+
+    def test_import_within_budget(self):
+        """Test that the entry point's own import cost stays within budget."""
+        overheads = []
+        for _ in range(3):
+            times = _import_times("-c", "import fixit")
+            overheads.append(times["fixit"] - times.get("click", 0))
+        assert (
+            min(overheads) < IMPORT_BUDGET_US
+        ), f"fixit import took {min(overheads)}us beyond click"